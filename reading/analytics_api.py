@@ -2,7 +2,8 @@
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from django.conf import settings
 from django.db.models import Count, Avg
 from django.utils import timezone
 
@@ -13,6 +14,7 @@ from .models import (
     WordAnalytics,
     UserAnalytics
 )
+from .services.analytics_cache import cache_stats
 from .services.analytics_service import AnalyticsService
 
 
@@ -32,21 +34,11 @@ class StudentWeakWordsAPIView(APIView):
         # Get weak words from analytics service
         weak_words = AnalyticsService.get_user_weak_words(request.user, limit=20)
         
-        # Also get word count from attempts for additional context
-        attempts = PronunciationAttempt.objects.filter(user=request.user)
-        
-        word_counter = {}
-        for attempt in attempts:
-            words = attempt.mispronounced or []
-            for entry in words:
-                if isinstance(entry, dict):
-                    word = entry.get("word", "")
-                elif isinstance(entry, str):
-                    word = entry
-                else:
-                    continue
-                if word:
-                    word_counter[word] = word_counter.get(word, 0) + 1
+        # Also get mistake counts for additional context
+        word_counter = AnalyticsService.get_mistake_counts(
+            [word_data['word'] for word_data in weak_words],
+            user=request.user,
+        )
         
         # Combine data from both sources
         result = []
@@ -109,46 +101,10 @@ class DifficultLessonsAPIView(APIView):
             })
         
         # Otherwise, return global lesson difficulty
-        attempts = PronunciationAttempt.objects.all()
-        
-        lesson_stats = {}
-        lesson_attempts = {}
-        
-        for attempt in attempts:
-            if not attempt.lesson_id:
-                continue
-            lesson_id = attempt.lesson_id
-            score = attempt.score or 0
-            
-            if lesson_id not in lesson_stats:
-                try:
-                    lesson = ReadingLesson.objects.get(id=lesson_id)
-                    lesson_stats[lesson_id] = {
-                        'title': lesson.title,
-                        'total_score': 0,
-                        'count': 0
-                    }
-                except ReadingLesson.DoesNotExist:
-                    continue
-            
-            lesson_stats[lesson_id]['total_score'] += score
-            lesson_stats[lesson_id]['count'] += 1
-        
-        difficulty_list = []
-        for lesson_id, stats in lesson_stats.items():
-            avg_score = stats['total_score'] / stats['count'] if stats['count'] > 0 else 0
-            difficulty_list.append({
-                "lesson_id": lesson_id,
-                "lesson_title": stats['title'],
-                "average_score": round(avg_score, 2),
-                "attempts": stats['count'],
-                "difficulty_level": "hard" if avg_score < 50 else "medium" if avg_score < 75 else "easy"
-            })
-        
-        difficulty_list.sort(key=lambda x: x["average_score"])
+        difficulty_list = AnalyticsService.get_global_difficult_lessons(limit=10)
         
         return Response({
-            "difficult_lessons": difficulty_list[:10],
+            "difficult_lessons": difficulty_list,
             "type": "global"
         })
 
@@ -167,21 +123,10 @@ class GlobalWeakWordsAPIView(APIView):
         # Get global weak words from analytics service
         global_weak = AnalyticsService.get_global_weak_words(limit=30)
         
-        # Also calculate from raw attempts for comparison
-        attempts = PronunciationAttempt.objects.all()
-        
-        word_counter = {}
-        for attempt in attempts:
-            words = attempt.mispronounced or []
-            for entry in words:
-                if isinstance(entry, dict):
-                    word = entry.get("word", "")
-                elif isinstance(entry, str):
-                    word = entry
-                else:
-                    continue
-                if word:
-                    word_counter[word] = word_counter.get(word, 0) + 1
+        # Also get global mistake counts for comparison
+        word_counter = AnalyticsService.get_mistake_counts(
+            [word_data['word'] for word_data in global_weak]
+        )
         
         # Combine and enrich data
         result = []
@@ -196,10 +141,15 @@ class GlobalWeakWordsAPIView(APIView):
                 "unique_users": word_data.get('unique_users', 0)
             })
         
+        last_updated = (
+            AnalyticsService.get_global_word_stats_refreshed_at()
+            or timezone.now()
+        )
+
         return Response({
             "global_problem_words": result,
             "total_words_analyzed": len(result),
-            "last_updated": timezone.now().isoformat()
+            "last_updated": last_updated.isoformat()
         })
 
 
@@ -239,47 +189,16 @@ class DashboardStatsAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        # Get overall stats
-        overall_stats = AnalyticsService.get_user_overall_stats(request.user)
-        
-        # Get recent attempts
-        recent_attempts = PronunciationAttempt.objects.filter(
-            user=request.user
-        ).select_related('lesson').values(
-            'id', 'score', 'feedback', 'created_at', 'lesson__title'
-        )[:10]
-        
-        # Get weak words
-        weak_words = AnalyticsService.get_user_weak_words(request.user, limit=5)
-        
-        # Get strengths
-        strengths = AnalyticsService.get_user_strengths(request.user, limit=5)
-        
-        # Get difficult lessons
-        difficult_lessons = AnalyticsService.get_difficult_lessons(request.user, limit=5)
-        
-        # Calculate trend (improvement over last 5 attempts)
-        last_5_attempts = PronunciationAttempt.objects.filter(
-            user=request.user,
-            score__isnull=False
-        ).order_by('-created_at')[:5]
-        
-        scores = [a.score for a in reversed(last_5_attempts)]
-        trend = "stable"
-        if len(scores) >= 2:
-            if scores[-1] > scores[0]:
-                trend = "improving"
-            elif scores[-1] < scores[0]:
-                trend = "declining"
-        
+        snapshot = AnalyticsService.get_dashboard_snapshot(request.user, limit=5)
+
         return Response({
             "success": True,
-            "stats": overall_stats,
-            "trend": trend,
-            "recent_attempts": list(recent_attempts),
-            "weak_words": weak_words[:5],
-            "strengths": strengths[:5],
-            "difficult_lessons": difficult_lessons[:5]
+            "stats": snapshot["stats"],
+            "trend": snapshot["trend"],
+            "recent_attempts": snapshot["recent_attempts"],
+            "weak_words": snapshot["weak_words"],
+            "strengths": snapshot["strengths"],
+            "difficult_lessons": snapshot["difficult_lessons"]
         })
 
 
@@ -307,28 +226,11 @@ class WordDetailAPIView(APIView):
                 "message": f"No data found for word: {word}"
             }, status=404)
         
-        # Get all attempts containing this word
-        attempts = PronunciationAttempt.objects.filter(
-            user=request.user
+        # Most recent attempts containing this word (whole-word matches only)
+        word_attempts = AnalyticsService.get_word_occurrences(
+            request.user, word, limit=10
         )
         
-        word_attempts = []
-        for attempt in attempts:
-            if word.lower() in attempt.expected.lower():
-                was_mispronounced = False
-                for item in attempt.mispronounced or []:
-                    item_word = item.get("word", "") if isinstance(item, dict) else str(item)
-                    if word.lower() == item_word.lower():
-                        was_mispronounced = True
-                        break
-                
-                word_attempts.append({
-                    "date": attempt.created_at,
-                    "score": attempt.score,
-                    "was_correct": not was_mispronounced,
-                    "context": attempt.expected[:100] if attempt.expected else ""
-                })
-        
         return Response({
             "success": True,
             "word": word,
@@ -343,8 +245,38 @@ class WordDetailAPIView(APIView):
                     "date": a["date"],
                     "score": a["score"],
                     "was_correct": a["was_correct"],
+                    "occurrences": a["occurrences"],
+                    "correct_occurrences": a["correct_occurrences"],
                     "context": a["context"]
                 }
-                for a in word_attempts[-10:]
+                for a in word_attempts
             ]
-        })
\ No newline at end of file
+        })
+
+
+# ---------------------------------------------------
+# ANALYTICS CACHE STATS (STAFF)
+# ---------------------------------------------------
+
+class AnalyticsCacheStatsAPIView(APIView):
+    """
+    Hit and miss counters of the analytics cache, per cached function.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        stats = cache_stats()
+        hits = sum(s["hits"] for s in stats.values())
+        misses = sum(s["misses"] for s in stats.values())
+        total = hits + misses
+
+        return Response({
+            "success": True,
+            "backend": settings.CACHES["default"]["BACKEND"],
+            "ttl": getattr(settings, "ANALYTICS_CACHE_TTL", 300),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total * 100, 1) if total else None,
+            "functions": stats,
+        })
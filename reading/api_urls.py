@@ -4,6 +4,7 @@ from .api_views import (
     ReadingLessonListAPIView,
     ReadingLessonDetailAPIView,
     TextFeedbackAPIView,
+    TextFeedbackBatchAPIView,
     AudioFeedbackAPIView,
 )
 
@@ -21,6 +22,7 @@ from .analytics_api import (
     WeeklyProgressAPIView,
     DashboardStatsAPIView,
     WordDetailAPIView,
+    AnalyticsCacheStatsAPIView,
 )
 
 app_name = "reading_api"
@@ -49,6 +51,11 @@ urlpatterns = [
         TextFeedbackAPIView.as_view(),
         name="feedback"
     ),
+    path(
+        "feedback/batch/",
+        TextFeedbackBatchAPIView.as_view(),
+        name="feedback-batch"
+    ),
     path(
         "audio-feedback/",
         AudioFeedbackAPIView.as_view(),
@@ -115,4 +122,11 @@ urlpatterns = [
         GlobalWeakWordsAPIView.as_view(),
         name="global-weak-words"
     ),
+
+    # Cache monitoring (staff only)
+    path(
+        "analytics/cache-stats/",
+        AnalyticsCacheStatsAPIView.as_view(),
+        name="analytics-cache-stats"
+    ),
 ]
\ No newline at end of file
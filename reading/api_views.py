@@ -3,41 +3,215 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 import json
-
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.db.models import Count, F, Max, Q
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from django.utils import timezone
 
-from reading.services.phonetic_analysis import detect_phonetic_errors
 from reading.services.analytics_service import AnalyticsService
+from reading.services.analytics_jobs import (
+    AnalyticsJobQueue,
+    async_analytics_enabled,
+    defer_analytics,
+)
+from reading.services.audio import InvalidAudio, load_audio
+from reading.services.lesson_cache import compile_expected
+from reading.services.progress_service import ProgressService
+from reading.services.scoring import ScoringService
+from reading.services.transcription import (
+    TranscriptionBusy,
+    TranscriptionUnavailable,
+    UnintelligibleAudio,
+    transcribe,
+)
 
 from .models import (
+    AnalyticsJob,
     ReadingLesson,
     PronunciationAttempt,
     LessonProgress,
+    ScoringSession,
 )
 
+from .etags import lesson_etag, make_etag
 from .serializers import ReadingLessonSerializer
-
-from .services.pronunciation_engine import (
-    word_by_word_comparison,
-    generate_feedback,
-)
+from .signals import bulk_attempts_created
 
 
 # ---------------------------------------------------
 # LESSON LIST
 # ---------------------------------------------------
 
+# Query parameter -> lookup, for ReadingLessonListAPIView
+LESSON_FILTERS = (
+    ("unit", "unit_id"),
+    ("book", "unit__book_id"),
+    ("category", "unit__book__category_id"),
+)
+
+
+def _filter_lessons(params):
+    """
+    Lessons in (unit, order, id) order, narrowed by the unit/book/category
+    query parameters. Raises ValueError for a malformed id.
+    """
+    lessons = ReadingLesson.objects.order_by(
+        F("unit").asc(nulls_first=True), "order", "id"
+    )
+
+    for param, lookup in LESSON_FILTERS:
+        if params.get(param) is None:
+            continue
+        value = _lesson_pk(params[param])
+        if value is None:
+            raise ValueError(f"{param} must be an id.")
+        lessons = lessons.filter(**{lookup: value})
+
+    return lessons
+
+
+def _lesson_list_etag(request):
+    """
+    Newest updated_at and row count of the lessons the query can list, plus
+    the query itself; None for malformed filters, which get a 400.
+    """
+    try:
+        lessons = _filter_lessons(request.GET)
+    except ValueError:
+        return None
+
+    latest = lessons.order_by().aggregate(
+        updated=Max("updated_at"), count=Count("id")
+    )
+    return make_etag(
+        "lesson-list", request.GET.urlencode(), latest["updated"], latest["count"]
+    )
+
+
 class ReadingLessonListAPIView(APIView):
-    """Return a list of all reading lessons."""
+    """
+    Return reading lessons in reading order, one page at a time.
+
+    Query parameters:
+
+        limit      lessons per page (default 50, at most 200)
+        cursor     the "next" value of the previous page
+        fields     comma-separated serializer fields, e.g. id,title,unit
+        unit       only lessons of this unit
+        book       only lessons of this book
+        category   only lessons of books in this category
+
+    Pages are read by keyset on (unit, order, id), so every page costs the
+    same however deep the client is, and lessons added or removed between
+    requests never shift a page. Returns {"results": [...], "next": ...},
+    with "next" null on the last page.
+
+    Responses carry an ETag of the matching lessons' newest updated_at and
+    count; a client revalidating with If-None-Match gets a 304.
+    """
 
+    @method_decorator(cache_control(no_cache=True))
+    @method_decorator(condition(etag_func=_lesson_list_etag))
     def get(self, request):
-        lessons = ReadingLesson.objects.all()
-        serializer = ReadingLessonSerializer(lessons, many=True)
-        return Response(serializer.data)
+        params = request.query_params
+
+        limit = _lesson_pk(params.get("limit", LESSON_PAGE_SIZE))
+        if limit is None or limit < 1:
+            return Response(
+                {"error": "limit must be a positive integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = min(limit, MAX_LESSON_PAGE_SIZE)
+
+        fields = None
+        if params.get("fields"):
+            fields = [name.strip() for name in params["fields"].split(",")]
+            unknown = set(fields) - set(ReadingLessonSerializer.Meta.fields)
+            if unknown:
+                return Response(
+                    {"error": f"Unknown fields: {', '.join(sorted(unknown))}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        try:
+            lessons = _filter_lessons(params)
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if params.get("cursor"):
+            position = _decode_lesson_cursor(params["cursor"])
+            if position is None:
+                return Response(
+                    {"error": "Invalid cursor."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            lessons = lessons.filter(_after_lesson(*position))
+
+        if fields is not None:
+            # Leave unrequested columns (usually content) in the database
+            lessons = lessons.only(*fields, "unit", "order")
+
+        # One extra row tells whether there is a next page
+        page = list(lessons[: limit + 1])
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            last = page[-1]
+            next_cursor = _encode_lesson_cursor(last.unit_id, last.order, last.id)
+
+        serializer = ReadingLessonSerializer(page, many=True, fields=fields)
+        return Response({"results": serializer.data, "next": next_cursor})
+
+
+LESSON_PAGE_SIZE = 50
+MAX_LESSON_PAGE_SIZE = 200
+
+def _encode_lesson_cursor(unit_id, order, lesson_id):
+    raw = json.dumps([unit_id, order, lesson_id], separators=(",", ":"))
+    return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_lesson_cursor(cursor):
+    """(unit_id, order, lesson id) from a cursor, or None if it is invalid."""
+    try:
+        raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        unit_id, order, lesson_id = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+
+    if not (isinstance(order, int) and isinstance(lesson_id, int)):
+        return None
+    if unit_id is not None and not isinstance(unit_id, int):
+        return None
+    return unit_id, order, lesson_id
+
+
+def _after_lesson(unit_id, order, lesson_id):
+    """
+    Lessons after (unit_id, order, lesson_id) in (unit, order, id) order,
+    where lessons without a unit come first.
+    """
+    same_unit = Q(unit__isnull=True) if unit_id is None else Q(unit_id=unit_id)
+    later = (
+        Q(order__gt=order) | Q(order=order, id__gt=lesson_id)
+    ) & same_unit
+
+    if unit_id is None:
+        return later | Q(unit__isnull=False)
+    return later | Q(unit_id__gt=unit_id)
 
 
 # ---------------------------------------------------
@@ -45,8 +219,13 @@ class ReadingLessonListAPIView(APIView):
 # ---------------------------------------------------
 
 class ReadingLessonDetailAPIView(APIView):
-    """Return details of a single lesson."""
+    """
+    Return details of a single lesson. The ETag follows the lesson's
+    updated_at, so revalidating an unchanged lesson costs one lookup.
+    """
 
+    @method_decorator(cache_control(no_cache=True))
+    @method_decorator(condition(etag_func=lesson_etag))
     def get(self, request, pk):
         try:
             lesson = ReadingLesson.objects.get(pk=pk)
@@ -75,11 +254,27 @@ class TextFeedbackAPIView(APIView):
     }
 
     Returns pronunciation score and feedback.
+
+    Sentence mode scores one sentence of a lesson at a time, so a request
+    costs what the sentence costs, not the whole passage:
+
+    {"lesson_id": 3, "sentence_index": 0, "spoken": "..."}
+    {"session": "<id>", "sentence_index": 1, "spoken": "..."}
+    {"session": "<id>", "final": true}
+
+    The first request opens a ScoringSession that keeps every sentence's
+    reading; reading a sentence again replaces it. Responses carry the
+    sentence's feedback and a running score over the sentences read. The
+    final request merges them into one attempt over the whole lesson, in
+    which unread sentences count as missing, and saves it.
     """
 
     def post(self, request):
         data = request.data
 
+        if "sentence_index" in data or "session" in data:
+            return self.post_sentence(request)
+
         expected = data.get("expected", "").strip()
         spoken = data.get("spoken", "").strip()
         lesson_id = data.get("lesson_id")
@@ -100,84 +295,486 @@ class TextFeedbackAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        lesson = None
+        if lesson_id:
+            lesson = ReadingLesson.objects.filter(pk=_lesson_pk(lesson_id)).first()
+
         # ---------------------------
         # RUN PRONUNCIATION ANALYSIS
         # ---------------------------
 
-        problem_words, score = word_by_word_comparison(expected, spoken)
-        phonetic_errors = detect_phonetic_errors(problem_words)
+        result = ScoringService.score(expected, spoken, lesson)
 
-        feedback_text = generate_feedback(problem_words, score)
+        # ---------------------------
+        # SAVE ATTEMPT + UPDATE PROGRESS
+        # ---------------------------
 
-        mispronounced_only = [
-            w for w in problem_words if w["status"] != "correct"
-        ]
+        saved = dict(UNSAVED_ATTEMPT)
+        if request.user.is_authenticated and lesson:
+            saved = _save_attempt(request.user, lesson, expected, spoken, result)
 
-        attempt_id = None
-        best_score = None
-        is_completed = False
-        total_attempts = 0
+        # ---------------------------
+        # RESPONSE
+        # ---------------------------
+
+        return Response(
+            {
+                "score": result.score,
+                "feedback": result.feedback,
+                "mispronounced": result.problem_words,
+                "phonetic_errors": result.phonetic_errors,
+                "attempt_id": saved["attempt_id"],
+                "word_count": result.word_count,
+                "problem_count": result.problem_count,
+                "best_score": saved["best_score"],
+                "is_completed": saved["is_completed"],
+                "total_attempts": saved["total_attempts"],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+    def post_sentence(self, request):
+        data = request.data
+        user = request.user if request.user.is_authenticated else None
+        final = _is_true(data.get("final"))
 
         # ---------------------------
-        # SAVE ATTEMPT + UPDATE PROGRESS
+        # OPEN OR RESUME SESSION
         # ---------------------------
 
-        if request.user.is_authenticated and lesson_id:
-            try:
-                lesson = ReadingLesson.objects.get(pk=lesson_id)
-
-                attempt = PronunciationAttempt.objects.create(
-                    user=request.user,
-                    lesson=lesson,
-                    expected=expected,
-                    spoken=spoken,
-                    score=score,
-                    mispronounced=mispronounced_only,
-                    feedback=feedback_text,
+        if data.get("session"):
+            session = _get_session(data.get("session"), user)
+            if session is None:
+                return Response(
+                    {"error": "Session not found"},
+                    status=status.HTTP_404_NOT_FOUND,
                 )
+        else:
+            lesson = ReadingLesson.objects.filter(
+                pk=_lesson_pk(data.get("lesson_id"))
+            ).first()
+            if lesson is None:
+                return Response(
+                    {"error": "Lesson not found"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            session = None
+
+        if session is not None and session.is_final:
+            return Response(
+                {"error": "Session already finished.", "session": str(session.pk)},
+                status=status.HTTP_409_CONFLICT,
+            )
 
-                attempt_id = attempt.id
+        lesson = session.lesson if session is not None else lesson
+        expected = compile_expected(lesson.content, lesson)
+        sentence_count = len(expected.sentence_bounds)
 
-                # Extract word-level analytics using the service
-                AnalyticsService.extract_word_analytics(attempt)
+        # ---------------------------
+        # SCORE ONE SENTENCE
+        # ---------------------------
 
-                # Update daily analytics
-                AnalyticsService.update_daily_analytics(request.user)
+        result = None
+        if data.get("sentence_index") is not None:
+            index = _lesson_pk(data.get("sentence_index"))
+            spoken = str(data.get("spoken") or "").strip()
 
-                progress, created = LessonProgress.objects.get_or_create(
-                    user=request.user,
-                    lesson=lesson,
+            if index is None or not 0 <= index < sentence_count:
+                return Response(
+                    {"error": f"sentence_index must be 0 to {sentence_count - 1}."},
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
 
-                progress.total_attempts += 1
-                total_attempts = progress.total_attempts
+            if not spoken:
+                return Response(
+                    {"score": 0, "feedback": "No speech text received."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            result = ScoringService.score_sentence(expected, index, spoken)
+
+            if session is None:
+                session = ScoringSession.objects.create(user=user, lesson=lesson)
+            session = _record_sentence(session, index, spoken, result)
+
+        elif not final:
+            return Response(
+                {"error": "Send sentence_index and spoken, or final."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if session is None:
+            return Response(
+                {"error": "Session not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        read = session.sentences.values()
+        words_read = sum(sentence["words"] for sentence in read)
+        correct = sum(sentence["correct"] for sentence in read)
+        running_score = (
+            round(correct / words_read * 100, 2) if words_read else 0
+        )
+
+        if not final:
+            return Response(
+                {
+                    "session": str(session.pk),
+                    "final": False,
+                    "sentence_index": index,
+                    **result.as_dict(),
+                    "sentences_read": len(session.sentences),
+                    "sentence_count": sentence_count,
+                    "running_score": running_score,
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        # ---------------------------
+        # MERGE INTO ONE ATTEMPT
+        # ---------------------------
+
+        if not session.sentences:
+            return Response(
+                {"score": 0, "feedback": "No speech text received."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not _finish_session(session):
+            return Response(
+                {"error": "Session already finished.", "session": str(session.pk)},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        readings = {
+            int(index): sentence["spoken"]
+            for index, sentence in session.sentences.items()
+        }
+        merged = ScoringService.merge_sentences(expected, readings)
+        spoken = " ".join(readings[index] for index in sorted(readings))
+
+        saved = dict(UNSAVED_ATTEMPT)
+        if session.user_id:
+            saved = _save_attempt(
+                session.user, lesson, lesson.content, spoken, merged
+            )
+            if saved["attempt_id"]:
+                ScoringSession.objects.filter(pk=session.pk).update(
+                    attempt_id=saved["attempt_id"]
+                )
+
+        return Response(
+            {
+                "session": str(session.pk),
+                "final": True,
+                **merged.as_dict(),
+                "sentences_read": len(session.sentences),
+                "sentence_count": sentence_count,
+                **saved,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+# Response fields for an attempt that was scored but not saved
+UNSAVED_ATTEMPT = {
+    "attempt_id": None,
+    "best_score": None,
+    "is_completed": False,
+    "total_attempts": 0,
+}
+
+
+def _process_analytics(attempts):
+    """
+    Run word and daily analytics during the request. The attempts are
+    already saved, so a failure is logged rather than failing the request;
+    queued jobs let the same errors through to be retried instead.
+    """
+    try:
+        AnalyticsService.process_attempts(attempts)
+    except Exception as e:
+        print(f"Error saving analytics: {e}")
+
+
+def _save_attempt(user, lesson, expected, spoken, result):
+    """
+    Save a scored attempt, apply progress and analytics, and return the
+    attempt_id/best_score/is_completed/total_attempts response fields.
+    """
+    saved = dict(UNSAVED_ATTEMPT)
+
+    try:
+        with transaction.atomic():
+            attempt = PronunciationAttempt(
+                user=user,
+                lesson=lesson,
+                expected=expected,
+                spoken=spoken,
+                score=result.score,
+                mispronounced=result.problem_words,
+                feedback=result.feedback,
+            )
+
+            if async_analytics_enabled():
+                # Per-word analytics run in process_analytics_jobs
+                defer_analytics(attempt)
+                attempt.save()
+                AnalyticsJobQueue.enqueue(attempt)
+            else:
+                attempt.save()
+
+        saved["attempt_id"] = attempt.id
+
+        if not async_analytics_enabled():
+            # Word-level and daily analytics using the service
+            _process_analytics([attempt])
+
+        # Already applied by the post_save receiver; reuse its result
+        progress = ProgressService.record_attempt(attempt)
+
+        if progress:
+            saved["total_attempts"] = progress["total_attempts"]
+            saved["best_score"] = progress["best_score"]
+            saved["is_completed"] = progress["is_completed"]
+
+    except Exception as e:
+        # Log error but don't fail the request
+        print(f"Analytics error: {e}")
+
+    return saved
+
+
+# ---------------------------------------------------
+# BATCH TEXT FEEDBACK API
+# ---------------------------------------------------
+
+MAX_BATCH_SIZE = 200
+
+CLIENT_ID_MAX_LENGTH = PronunciationAttempt._meta.get_field("client_id").max_length
+
+
+def _insert_attempts(user, attempts):
+    """
+    Bulk insert a user's new attempts and set their ids. Attempts with a
+    client_id go in with ignore_conflicts, which hands back no ids, so theirs
+    are read back by (user, client_id).
+    """
+    keyed = [attempt for attempt in attempts if attempt.client_id is not None]
+
+    PronunciationAttempt.objects.bulk_create(
+        [attempt for attempt in attempts if attempt.client_id is None]
+    )
+    if keyed:
+        PronunciationAttempt.objects.bulk_create(keyed, ignore_conflicts=True)
+        ids = dict(
+            PronunciationAttempt.objects.filter(
+                user=user,
+                client_id__in=[attempt.client_id for attempt in keyed],
+            ).values_list("client_id", "id")
+        )
+        for attempt in keyed:
+            attempt.pk = ids[attempt.client_id]
+
+
+class TextFeedbackBatchAPIView(APIView):
+    """
+    Accepts a batch of attempts, e.g. replayed by the offline queue:
+
+    {
+        "attempts": [
+            {"expected": "...", "spoken": "...", "lesson_id": 3, "client_id": "..."},
+            ...
+        ]
+    }
+
+    Scores every item, saves them with one bulk insert, applies progress and
+    analytics in aggregate and returns one result per item, in order.
+
+    Replays are idempotent per ``client_id``: an item whose id the user has
+    already saved (in an earlier delivery or earlier in the same batch) is
+    scored and answered with the stored attempt's id and ``"duplicate":
+    true``, but not saved again. Items without a ``client_id`` are always
+    saved.
+
+    Per-item errors mark input that will never be accepted. When the batch
+    cannot be saved the whole request fails with 503 and nothing is kept, so
+    the client holds on to the items and sends them again.
+    """
+
+    def post(self, request):
+        items = request.data.get("attempts")
+
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"error": "Expected a non-empty \"attempts\" list."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if len(items) > MAX_BATCH_SIZE:
+            return Response(
+                {"error": f"At most {MAX_BATCH_SIZE} attempts per batch."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-                if progress.best_score is None or score > progress.best_score:
-                    progress.best_score = score
-                    best_score = progress.best_score
-                else:
-                    best_score = progress.best_score
+        user = request.user if request.user.is_authenticated else None
 
-                if score >= 80 and not progress.is_completed:
-                    progress.is_completed = True
-                    is_completed = True
-                else:
-                    is_completed = progress.is_completed
+        lessons = ReadingLesson.objects.in_bulk(
+            {
+                _lesson_pk(item.get("lesson_id"))
+                for item in items
+                if isinstance(item, dict)
+            } - {None}
+        )
 
-                now = timezone.now()
+        results = []
+        attempts = []
+        attempt_results = []
+        # client_id -> attempt saved by this batch, and the results of its
+        # repeats, which get its id once it has one
+        batch_attempts = {}
+        repeats = []
 
-                if not progress.first_attempt_at:
-                    progress.first_attempt_at = now
+        # ---------------------------
+        # SCORE EVERY ITEM
+        # ---------------------------
+
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results.append({"index": index, "error": "Invalid attempt."})
+                continue
+
+            expected = str(item.get("expected") or "").strip()
+            spoken = str(item.get("spoken") or "").strip()
+            client_id = item.get("client_id")
+            result = {"index": index, "client_id": client_id}
+
+            if client_id is not None:
+                client_id = str(client_id)
+                if len(client_id) > CLIENT_ID_MAX_LENGTH:
+                    result.update(score=0, error="Invalid client_id.")
+                    results.append(result)
+                    continue
+
+            if not spoken:
+                result.update(score=0, error="No speech text received.")
+                results.append(result)
+                continue
+
+            if not expected:
+                result.update(score=0, error="No expected text available.")
+                results.append(result)
+                continue
+
+            lesson = lessons.get(_lesson_pk(item.get("lesson_id")))
+
+            scored = ScoringService.score(expected, spoken, lesson)
+
+            result.update(scored.as_dict())
+            result.update(UNSAVED_ATTEMPT)
+            results.append(result)
+
+            if not (user and lesson):
+                continue
+
+            if client_id in batch_attempts:
+                result["duplicate"] = True
+                repeats.append((result, client_id, lesson.pk))
+                continue
+
+            attempt = PronunciationAttempt(
+                user=user,
+                lesson=lesson,
+                expected=expected,
+                spoken=spoken,
+                score=scored.score,
+                mispronounced=scored.problem_words,
+                feedback=scored.feedback,
+                client_id=client_id,
+            )
+            if async_analytics_enabled():
+                defer_analytics(attempt)
+            attempts.append(attempt)
+            attempt_results.append(result)
+            if client_id is not None:
+                batch_attempts[client_id] = attempt
 
-                progress.last_attempt_at = now
+        # ---------------------------
+        # SAVE ATTEMPTS + APPLY DELTAS
+        # ---------------------------
 
-                progress.save()
+        # client_id -> id of items saved by an earlier delivery of this batch
+        saved_ids = {}
+        new_attempts = []
+        progress = {}
 
-            except ReadingLesson.DoesNotExist:
-                pass
-            except Exception as e:
-                # Log error but don't fail the request
-                print(f"Analytics error: {e}")
+        if attempts:
+            try:
+                with transaction.atomic():
+                    # Deliveries of one user's batches take turns from here,
+                    # so each one sees the attempts the previous one saved
+                    get_user_model().objects.select_for_update().filter(pk=user.pk).first()
+
+                    saved_ids = dict(
+                        PronunciationAttempt.objects.filter(
+                            user=user, client_id__in=list(batch_attempts)
+                        ).values_list("client_id", "id")
+                    )
+                    new_attempts = [
+                        attempt for attempt in attempts
+                        if attempt.client_id not in saved_ids
+                    ]
+
+                    _insert_attempts(user, new_attempts)
+                    progress = bulk_attempts_created(new_attempts)
+
+                    if async_analytics_enabled():
+                        AnalyticsJob.objects.bulk_create(
+                            [AnalyticsJob(attempt=attempt) for attempt in new_attempts]
+                        )
+            except DatabaseError:
+                # Nothing was saved; the client keeps the items and retries
+                response = Response(
+                    {"error": "Could not save the attempts. Please send the batch again."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
+                response["Retry-After"] = "5"
+                return response
+
+            if new_attempts and not async_analytics_enabled():
+                _process_analytics(new_attempts)
+
+        for attempt, result in zip(attempts, attempt_results):
+            if attempt.client_id in saved_ids:
+                result["duplicate"] = True
+                repeats.append((result, attempt.client_id, attempt.lesson_id))
+                continue
+
+            result["attempt_id"] = attempt.id
+            lesson_progress = progress.get((user.id, attempt.lesson_id))
+            if lesson_progress:
+                result["best_score"] = lesson_progress["best_score"]
+                result["is_completed"] = lesson_progress["is_completed"]
+                result["total_attempts"] = lesson_progress["total_attempts"]
+
+        if repeats:
+            progress = {
+                row["lesson_id"]: row
+                for row in LessonProgress.objects.filter(
+                    user=user,
+                    lesson_id__in={lesson_id for _, _, lesson_id in repeats},
+                ).values("lesson_id", "best_score", "is_completed", "total_attempts")
+            }
+            for result, client_id, lesson_id in repeats:
+                result["attempt_id"] = (
+                    saved_ids.get(client_id) or batch_attempts[client_id].id
+                )
+                lesson_progress = progress.get(lesson_id)
+                if lesson_progress:
+                    result["best_score"] = lesson_progress["best_score"]
+                    result["is_completed"] = lesson_progress["is_completed"]
+                    result["total_attempts"] = lesson_progress["total_attempts"]
 
         # ---------------------------
         # RESPONSE
@@ -185,21 +782,25 @@ class TextFeedbackAPIView(APIView):
 
         return Response(
             {
-                "score": score,
-                "feedback": feedback_text,
-                "mispronounced": mispronounced_only,
-                "phonetic_errors": phonetic_errors,
-                "attempt_id": attempt_id,
-                "word_count": len(expected.split()),
-                "problem_count": len(mispronounced_only),
-                "best_score": best_score,
-                "is_completed": is_completed,
-                "total_attempts": total_attempts,
+                "results": results,
+                "saved": len(new_attempts),
             },
             status=status.HTTP_200_OK,
         )
 
 
+def _is_true(value):
+    """Flags arrive as JSON booleans or as form strings."""
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def _lesson_pk(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 # ---------------------------------------------------
 # USER PROGRESS API
 # ---------------------------------------------------
@@ -262,28 +863,11 @@ class DashboardStatsAPIView(APIView):
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        # Completed lessons count
-        completed_count = LessonProgress.objects.filter(
-            user=request.user,
-            is_completed=True
-        ).count()
+        summary = ProgressService.get_summary(request.user.pk)
 
         # Total lessons count
         total_lessons = ReadingLesson.objects.count()
 
-        # Average best score across all lessons
-        from django.db.models import Avg
-        avg_score = LessonProgress.objects.filter(
-            user=request.user
-        ).exclude(best_score__isnull=True).aggregate(
-            avg=Avg('best_score')
-        )['avg'] or 0
-
-        # Total attempts
-        total_attempts = PronunciationAttempt.objects.filter(
-            user=request.user
-        ).count()
-
         # Improvement over time (last 5 attempts)
         recent_attempts = PronunciationAttempt.objects.filter(
             user=request.user
@@ -298,10 +882,11 @@ class DashboardStatsAPIView(APIView):
             {
                 "success": True,
                 "stats": {
-                    "completed_lessons": completed_count,
+                    "completed_lessons": summary.completed_lessons,
                     "total_lessons": total_lessons,
-                    "average_score": round(avg_score, 1),
-                    "total_attempts": total_attempts,
+                    # Average best score across the lessons tried
+                    "average_score": round(summary.average_best_score() or 0, 1),
+                    "total_attempts": summary.total_attempts,
                     "improvement_trend": improvement_trend,
                 }
             },
@@ -310,19 +895,274 @@ class DashboardStatsAPIView(APIView):
 
 
 # ---------------------------------------------------
-# AUDIO FEEDBACK (FUTURE)
+# AUDIO FEEDBACK (STREAMED)
 # ---------------------------------------------------
 
 class AudioFeedbackAPIView(APIView):
-    """Audio pronunciation scoring (future implementation)."""
+    """
+    Scores a recording streamed in chunks while the student reads.
+
+    One multipart POST per chunk:
+
+        lesson_id   lesson being read (first chunk, which opens a session)
+        session     session id from the first response (later chunks)
+        seq         0, 1, 2, ... position of the chunk in the recording
+                    (may be left out on the first chunk only)
+        audio       the chunk as a self-contained WAV, AIFF or FLAC clip
+        final       "true" on the last request, with or without audio
+
+    Every chunk is transcribed on arrival and the transcript so far is
+    aligned against the start of the lesson, so each response carries
+    partial feedback. The final request only has to score text that is
+    already there; it saves the attempt like the text feedback API.
+
+    A chunk sent again after a lost response is acknowledged without being
+    transcribed twice; a gap in ``seq`` is refused with 409 and next_seq.
+    """
 
     def post(self, request):
+        data = request.data
+        user = request.user if request.user.is_authenticated else None
+
+        audio_file = request.FILES.get("audio")
+        final = _is_true(data.get("final"))
+
+        # ---------------------------
+        # OPEN OR RESUME SESSION
+        # ---------------------------
+
+        # A new session is only created once its first chunk has passed the
+        # checks below, so a refused request leaves no session behind.
+        if data.get("session"):
+            session = _get_session(data.get("session"), user)
+            if session is None:
+                return Response(
+                    {"error": "Session not found"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            if session.is_final:
+                return Response(
+                    {"error": "Session already finished.", "session": str(session.pk)},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            next_seq = session.chunks_received
+        else:
+            lesson = ReadingLesson.objects.filter(
+                pk=_lesson_pk(data.get("lesson_id"))
+            ).first()
+            if lesson is None:
+                return Response(
+                    {"error": "Lesson not found"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            session = None
+            next_seq = 0
+
+        if audio_file is None and (session is None or not final):
+            return Response(
+                {"error": "No audio chunk provided."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # ---------------------------
+        # CHECK CHUNK
+        # ---------------------------
+
+        audio = None
+        if audio_file is not None:
+            # Only the opening chunk may leave seq out
+            seq = _lesson_pk(
+                data.get("seq", 0) if session is None else data.get("seq")
+            )
+
+            if seq is None or seq < 0 or seq > next_seq:
+                conflict = {"error": f"Expected chunk {next_seq}."}
+                if session is not None:
+                    conflict["session"] = str(session.pk)
+                conflict["next_seq"] = next_seq
+                return Response(conflict, status=status.HTTP_409_CONFLICT)
+
+            # Earlier chunks were already transcribed; answer with the state
+            if seq == next_seq:
+                try:
+                    audio = load_audio(audio_file)
+                except InvalidAudio:
+                    return Response(
+                        {
+                            "error": (
+                                "Unsupported audio format. Please upload "
+                                "a WAV, AIFF or FLAC recording."
+                            )
+                        },
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+
+        if session is None:
+            session = ScoringSession.objects.create(user=user, lesson=lesson)
+
+        # ---------------------------
+        # TRANSCRIBE CHUNK
+        # ---------------------------
+
+        if audio is not None:
+            try:
+                text = transcribe(audio)
+            except UnintelligibleAudio:
+                # A pause between phrases; the chunk still counts
+                text = ""
+            except TranscriptionBusy:
+                response = Response(
+                    {
+                        "error": (
+                            "Speech recognition is busy. "
+                            "Please send the chunk again."
+                        ),
+                        "session": str(session.pk),
+                        "next_seq": session.chunks_received,
+                    },
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
+                response["Retry-After"] = "5"
+                return response
+            except TranscriptionUnavailable:
+                return Response(
+                    {
+                        "error": "Speech service error.",
+                        "session": str(session.pk),
+                        "next_seq": session.chunks_received,
+                    },
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
+            session = _append_chunk(session, seq, text)
+
+        expected = compile_expected(session.lesson.content, session.lesson)
+
+        # ---------------------------
+        # PARTIAL FEEDBACK
+        # ---------------------------
+
+        if not final:
+            partial = ScoringService.score_partial(expected, session.transcript)
+            return Response(
+                {
+                    "session": str(session.pk),
+                    "next_seq": session.chunks_received,
+                    "final": False,
+                    "transcript": session.transcript,
+                    "position": partial.word_count,
+                    "total_words": len(expected.tokens),
+                    **partial.as_dict(),
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        # ---------------------------
+        # FINAL SCORE
+        # ---------------------------
+
+        if not session.transcript:
+            return Response(
+                {
+                    "score": 0,
+                    "feedback": "No speech text received.",
+                    "session": str(session.pk),
+                    "next_seq": session.chunks_received,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not _finish_session(session):
+            return Response(
+                {"error": "Session already finished.", "session": str(session.pk)},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        result = ScoringService.score(expected, session.transcript)
+
+        saved = dict(UNSAVED_ATTEMPT)
+        if session.user_id:
+            saved = _save_attempt(
+                session.user,
+                session.lesson,
+                session.lesson.content,
+                session.transcript,
+                result,
+            )
+            if saved["attempt_id"]:
+                ScoringSession.objects.filter(pk=session.pk).update(
+                    attempt_id=saved["attempt_id"]
+                )
+
         return Response(
             {
-                "error": (
-                    "Audio processing temporarily disabled. "
-                    "Use text feedback for now."
-                )
+                "session": str(session.pk),
+                "final": True,
+                "transcript": session.transcript,
+                **result.as_dict(),
+                **saved,
             },
-            status=status.HTTP_501_NOT_IMPLEMENTED,
-        )
\ No newline at end of file
+            status=status.HTTP_200_OK,
+        )
+
+
+def _get_session(value, user):
+    """The open session ``value`` names, if ``user`` may post to it."""
+    try:
+        session = ScoringSession.objects.select_related(
+            "lesson", "user"
+        ).get(pk=value)
+    except (ScoringSession.DoesNotExist, ValidationError):
+        return None
+
+    if session.user_id and (user is None or session.user_id != user.id):
+        return None
+    return session
+
+
+def _append_chunk(session, seq, text):
+    """
+    Append the transcript of chunk ``seq`` unless a concurrent request got
+    there first, and return the session as stored.
+    """
+    with transaction.atomic():
+        locked = ScoringSession.objects.select_for_update().get(pk=session.pk)
+
+        if locked.chunks_received == seq and not locked.is_final:
+            locked.transcript = " ".join(
+                part for part in (locked.transcript, text) if part
+            )
+            locked.chunks_received = seq + 1
+            locked.save(
+                update_fields=["transcript", "chunks_received", "updated_at"]
+            )
+
+    # The related objects were loaded with the session; keep them
+    locked.lesson = session.lesson
+    locked.user = session.user
+    return locked
+
+
+def _record_sentence(session, index, spoken, result):
+    """Store one sentence's reading in the session and return it as stored."""
+    with transaction.atomic():
+        locked = ScoringSession.objects.select_for_update().get(pk=session.pk)
+        locked.sentences[str(index)] = {
+            "spoken": spoken,
+            "correct": result.correct_count,
+            "words": result.word_count,
+        }
+        locked.save(update_fields=["sentences", "updated_at"])
+
+    locked.lesson = session.lesson
+    locked.user = session.user
+    return locked
+
+
+def _finish_session(session):
+    """Mark the session final; False if another request already did."""
+    return bool(
+        ScoringSession.objects.filter(pk=session.pk, is_final=False).update(
+            is_final=True, updated_at=timezone.now()
+        )
+    )
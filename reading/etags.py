@@ -0,0 +1,111 @@
+# reading/etags.py
+"""
+ETags for conditional GETs on lesson and catalogue pages.
+
+Each function takes the view's arguments and returns the ETag of what the
+view would render, computed from updated_at timestamps (and, for pages
+listing rows, their count so deletions show too) in one indexed query.
+Used with django.views.decorators.http.condition, a matching If-None-Match
+is answered with 304 before the view loads or serializes anything.
+None means "no such object"; the view then produces its usual 404.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max, OuterRef, Subquery
+
+from .models import Book, PronunciationAttempt, ReadingLesson, Unit
+
+
+def make_etag(*parts):
+    """
+    A strong ETag value for the given version markers. ETAG_SALT is mixed
+    in so a release that changes templates or API output invalidates
+    what clients hold.
+    """
+    salt = getattr(settings, "ETAG_SALT", "")
+    raw = "|".join(str(part) for part in (salt, *parts))
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def lesson_etag(request, pk):
+    """The lesson detail API: the lesson row itself."""
+    updated_at = (
+        ReadingLesson.objects.filter(pk=pk)
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+    if updated_at is None:
+        return None
+    return make_etag("lesson", pk, updated_at.isoformat())
+
+
+def lesson_page_etag(request, pk):
+    """
+    The lesson page: the lesson, the unit and book in its breadcrumb, and
+    the reader's latest attempt, which the page lists.
+    """
+    lessons = ReadingLesson.objects.filter(pk=pk)
+
+    user_id = request.user.pk if request.user.is_authenticated else None
+    if user_id is not None:
+        lessons = lessons.annotate(
+            last_attempt=Subquery(
+                PronunciationAttempt.objects.filter(
+                    lesson=OuterRef("pk"), user_id=user_id
+                )
+                .order_by("-created_at", "-id")
+                .values("id")[:1]
+            )
+        )
+        fields = ("updated_at", "unit__updated_at", "unit__book__updated_at",
+                  "last_attempt")
+    else:
+        fields = ("updated_at", "unit__updated_at", "unit__book__updated_at")
+
+    row = lessons.values_list(*fields).first()
+    if row is None:
+        return None
+    return make_etag("lesson-page", pk, user_id, *row)
+
+
+def book_list_etag(request):
+    """The book list: every book."""
+    books = Book.objects.aggregate(updated=Max("updated_at"), count=Count("id"))
+    return make_etag("books", books["updated"], books["count"])
+
+
+def unit_list_etag(request, book_id):
+    """A book's unit list: the book, its units and their lesson counts."""
+    book = (
+        Book.objects.filter(pk=book_id)
+        .annotate(
+            units_updated=Max("units__updated_at"),
+            unit_count=Count("units", distinct=True),
+            lesson_count=Count("units__lessons", distinct=True),
+        )
+        .values_list("updated_at", "units_updated", "unit_count", "lesson_count")
+        .first()
+    )
+    if book is None:
+        return None
+    return make_etag("units", book_id, *book)
+
+
+def lesson_list_etag(request, unit_id):
+    """A unit's lesson list: the unit, its book and its lessons."""
+    unit = (
+        Unit.objects.filter(pk=unit_id)
+        .annotate(
+            lessons_updated=Max("lessons__updated_at"),
+            lesson_count=Count("lessons"),
+        )
+        .values_list(
+            "updated_at", "book__updated_at", "lessons_updated", "lesson_count"
+        )
+        .first()
+    )
+    if unit is None:
+        return None
+    return make_etag("lessons", unit_id, *unit)
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from reading.models import WordOccurrence
+from reading.services.analytics_service import AnalyticsService
+
+
+class Command(BaseCommand):
+    help = (
+        "Index the words of pronunciation attempts that have no "
+        "WordOccurrence rows yet (attempts saved before the index existed)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Attempts processed per query.",
+        )
+        parser.add_argument(
+            "--reindex",
+            action="store_true",
+            help="Drop every WordOccurrence row first and index all attempts "
+                 "again (for rows built by an older tokenizer).",
+        )
+
+    def handle(self, *args, **options):
+        if options["reindex"]:
+            WordOccurrence.objects.all().delete()
+
+        indexed = AnalyticsService.backfill_word_occurrences(
+            batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed words for {indexed} attempt(s)")
+        )
@@ -0,0 +1,108 @@
+import random
+import time
+from difflib import SequenceMatcher
+
+from django.core.management.base import BaseCommand
+
+from reading.management.commands.benchmark_word_analytics import VOCABULARY
+from reading.services.pronunciation_engine import (
+    normalize_text,
+    word_by_word_comparison,
+)
+
+
+def legacy_word_by_word_comparison(expected, spoken):
+    """The previous SequenceMatcher-based comparison (score only)."""
+    expected_words = normalize_text(expected).split()
+    spoken_words = normalize_text(spoken).split()
+
+    matcher = SequenceMatcher(None, expected_words, spoken_words)
+    correct_count = sum(
+        i2 - i1
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag == "equal"
+    )
+
+    total_words = len(expected_words)
+    score = (correct_count / total_words) * 100 if total_words > 0 else 0
+    return round(score, 2)
+
+
+def simulate_reading(words, error_rate, rng):
+    """Read ``words`` aloud with substitutions, skips and extra words."""
+    spoken = []
+    for word in words:
+        roll = rng.random()
+        if roll < error_rate / 3:
+            spoken.append(rng.choice(VOCABULARY))
+        elif roll < 2 * error_rate / 3:
+            continue
+        elif roll < error_rate:
+            spoken.extend([word, rng.choice(VOCABULARY)])
+        else:
+            spoken.append(word)
+    return spoken
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark word alignment: the previous SequenceMatcher path against "
+        "the alignment engine used by word_by_word_comparison, for passages "
+        "of increasing length."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10, 100, 1000, 10000],
+            help="Passage lengths in words.",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0.1,
+            help="Share of words read wrongly, skipped or padded.",
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        repeat = options["repeat"]
+
+        self.stdout.write(
+            f"{'words':>7}  {'legacy ms':>10}  {'engine ms':>10}  "
+            f"{'legacy score':>12}  {'engine score':>12}"
+        )
+
+        for size in options["sizes"]:
+            words = [rng.choice(VOCABULARY) for _ in range(size)]
+            expected = " ".join(words)
+            spoken = " ".join(simulate_reading(words, options["error_rate"], rng))
+
+            legacy_ms, legacy_score = self.measure(
+                lambda: legacy_word_by_word_comparison(expected, spoken),
+                repeat,
+            )
+            engine_ms, (_, engine_score) = self.measure(
+                lambda: word_by_word_comparison(expected, spoken),
+                repeat,
+            )
+
+            self.stdout.write(
+                f"{size:>7}  {legacy_ms:>10.2f}  {engine_ms:>10.2f}  "
+                f"{legacy_score:>12.2f}  {engine_score:>12.2f}"
+            )
+
+    @staticmethod
+    def measure(func, repeat):
+        """Best wall time of ``repeat`` runs, in ms, and the last result."""
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
@@ -0,0 +1,145 @@
+import io
+import math
+import os
+import struct
+import time
+import wave
+
+import speech_recognition as sr
+from django.core.files.uploadedfile import (
+    InMemoryUploadedFile,
+    TemporaryUploadedFile,
+)
+from django.core.management.base import BaseCommand
+
+from reading.services.audio import load_audio
+
+
+def make_wav(seconds, rate=16000):
+    """A mono 16-bit WAV with a quiet tone."""
+    frames = b"".join(
+        struct.pack("<h", int(3000 * math.sin(2 * math.pi * 220 * i / rate)))
+        for i in range(int(seconds * rate))
+    )
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(frames)
+    return buffer.getvalue()
+
+
+def in_memory_upload(data):
+    return InMemoryUploadedFile(
+        io.BytesIO(data), "audio", "recording.wav", "audio/wav", len(data), None
+    )
+
+
+def spooled_upload(data):
+    upload = TemporaryUploadedFile("recording.wav", "audio/wav", len(data), None)
+    upload.write(data)
+    upload.seek(0)
+    return upload
+
+
+def legacy_ingest(upload, user_id=1, lesson_id=1):
+    """The previous path: copy to a fixed /tmp name, read it back, delete."""
+    temp_dir = "/tmp/reading_app"
+    os.makedirs(temp_dir, exist_ok=True)
+
+    temp_path = f"{temp_dir}/recording_{user_id}_{lesson_id}.wav"
+    with open(temp_path, "wb+") as destination:
+        for chunk in upload.chunks():
+            destination.write(chunk)
+
+    recognizer = sr.Recognizer()
+    with sr.AudioFile(temp_path) as source:
+        recognizer.adjust_for_ambient_noise(source, duration=0.5)
+        audio = recognizer.record(source)
+
+    os.remove(temp_path)
+    return audio
+
+
+def io_counters():
+    """(bytes written, bytes read) through syscalls by this process."""
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return int(fields["wchar"]), int(fields["rchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark recording ingestion per request: latency and file I/O of "
+        "the previous copy-to-/tmp path against decoding from the upload "
+        "(in memory, or in place for uploads Django spooled to disk)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seconds",
+            nargs="+",
+            type=float,
+            default=[5, 30, 120],
+            help="Recording lengths to test.",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        if io_counters() is None:
+            self.stdout.write("/proc/self/io unavailable; I/O columns show n/a")
+
+        self.stdout.write(
+            f"{'seconds':>7}  {'upload':>9}  {'path':>14}  {'ms':>8}  "
+            f"{'KiB written':>11}  {'KiB read':>9}"
+        )
+
+        for seconds in options["seconds"]:
+            data = make_wav(seconds)
+            cases = [
+                ("legacy /tmp", in_memory_upload, legacy_ingest),
+                ("in memory", in_memory_upload, load_audio),
+                ("spooled", spooled_upload, load_audio),
+            ]
+            for label, make_upload, ingest in cases:
+                ms, written, read = self.measure(
+                    data, make_upload, ingest, options["repeat"]
+                )
+                self.stdout.write(
+                    f"{seconds:>7.0f}  {len(data) / 1024:>7.0f}Ki  {label:>14}  "
+                    f"{ms:>8.2f}  {self.kib(written):>11}  {self.kib(read):>9}"
+                )
+
+    @staticmethod
+    def measure(data, make_upload, ingest, repeat):
+        """Best latency in ms and mean I/O per request, excluding the upload."""
+        best = None
+        written = read = 0
+        for _ in range(repeat):
+            upload = make_upload(data)
+
+            before = io_counters()
+            start = time.perf_counter()
+            ingest(upload)
+            elapsed = (time.perf_counter() - start) * 1000
+            after = io_counters()
+
+            upload.close()
+            best = elapsed if best is None else min(best, elapsed)
+            if before and after:
+                written += after[0] - before[0]
+                read += after[1] - before[1]
+            else:
+                written = read = None
+
+        if written is None:
+            return best, None, None
+        return best, written / repeat, read / repeat
+
+    @staticmethod
+    def kib(value):
+        return "n/a" if value is None else f"{value / 1024:.1f}"
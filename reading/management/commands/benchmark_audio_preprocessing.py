@@ -0,0 +1,122 @@
+import io
+import time
+import wave
+
+import numpy as np
+import speech_recognition as sr
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+
+from reading.services.audio import load_audio, preprocess
+
+
+# (label, sample rate, channels, leading silence s, speech s, trailing silence s)
+FIXTURES = [
+    ("browser 48k stereo", 48000, 2, 1.5, 8, 2.0),
+    ("browser 44.1k stereo", 44100, 2, 1.0, 30, 3.0),
+    ("mic 16k mono", 16000, 1, 0.5, 10, 0.5),
+    ("long 48k stereo", 48000, 2, 3.0, 120, 5.0),
+]
+
+
+def make_fixture(rate, channels, lead, speech, tail, seed=0):
+    """
+    A WAV with silence around a speech-like signal: noise bursts shaped
+    like syllables, with low background noise throughout.
+    """
+    rng = np.random.default_rng(seed)
+    total = int((lead + speech + tail) * rate)
+    samples = rng.normal(0, 30, total)
+
+    start = int(lead * rate)
+    t = np.arange(int(speech * rate)) / rate
+    envelope = np.clip(np.sin(2 * np.pi * 3 * t), 0, None)
+    voiced = np.sin(2 * np.pi * 140 * t) + 0.3 * rng.normal(0, 1, len(t))
+    samples[start:start + len(t)] += 6000 * envelope * voiced
+
+    pcm = np.clip(samples, -32768, 32767).astype(np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.repeat(pcm, channels).tobytes())
+    return buffer.getvalue()
+
+
+def encode(audio):
+    """What the Google backend uploads: FLAC, or raw PCM without flac."""
+    try:
+        return audio.get_flac_data()
+    except OSError:
+        return audio.get_raw_data()
+
+
+def legacy_pipeline(data):
+    """Decode with speech_recognition and encode the audio unchanged."""
+    with sr.AudioFile(io.BytesIO(data)) as source:
+        audio = sr.Recognizer().record(source)
+    return audio, encode(audio)
+
+
+def preprocessed_pipeline(data, sample_rate):
+    upload = SimpleUploadedFile("recording.wav", data, content_type="audio/wav")
+    audio = preprocess(load_audio(upload), sample_rate)
+    return audio, encode(audio)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark audio preprocessing on synthetic WAV fixtures: time to "
+        "decode and encode a recording for upload to the transcription "
+        "backend, and how much audio is sent, for raw recordings against "
+        "silence-trimmed, downmixed and resampled ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--sample-rate",
+            type=int,
+            default=16000,
+            help="Backend sample rate to resample to.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'fixture':<22}  {'raw ms':>8}  {'prep ms':>8}  "
+            f"{'raw s':>7}  {'prep s':>7}  {'raw KiB':>9}  {'prep KiB':>9}"
+        )
+
+        for label, rate, channels, lead, speech, tail in FIXTURES:
+            data = make_fixture(rate, channels, lead, speech, tail)
+
+            raw_ms, (raw, raw_body) = self.measure(
+                lambda: legacy_pipeline(data), options["repeat"]
+            )
+            prep_ms, (prep, prep_body) = self.measure(
+                lambda: preprocessed_pipeline(data, options["sample_rate"]),
+                options["repeat"],
+            )
+
+            self.stdout.write(
+                f"{label:<22}  {raw_ms:>8.2f}  {prep_ms:>8.2f}  "
+                f"{self.seconds(raw):>7.2f}  {self.seconds(prep):>7.2f}  "
+                f"{len(raw_body) / 1024:>9.0f}  {len(prep_body) / 1024:>9.0f}"
+            )
+
+    @staticmethod
+    def seconds(audio):
+        frames = len(audio.frame_data) / audio.sample_width
+        return frames / audio.sample_rate
+
+    @staticmethod
+    def measure(func, repeat):
+        """Best wall time of ``repeat`` runs in ms, and the last result."""
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
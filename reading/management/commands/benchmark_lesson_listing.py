@@ -0,0 +1,126 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from reading.api_views import ReadingLessonListAPIView
+from reading.management.commands.benchmark_word_analytics import VOCABULARY
+from reading.models import Book, BookCategory, ReadingLesson, Unit
+from reading.serializers import ReadingLessonSerializer
+
+
+class LegacyLessonListView(APIView):
+    """The previous listing: every lesson, content included, in one response."""
+
+    def get(self, request):
+        lessons = ReadingLesson.objects.all()
+        serializer = ReadingLessonSerializer(lessons, many=True)
+        return Response(serializer.data)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the lesson listing API on a generated catalogue: "
+        "response bytes and p50/p95 latency of the old all-in-one list "
+        "against cursor pages with and without content. Runs against the "
+        "configured database and rolls back everything it writes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lessons", type=int, default=10000)
+        parser.add_argument("--words", type=int, default=300,
+                            help="Words of content per lesson.")
+        parser.add_argument("--limit", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Database: {connection.vendor}")
+
+        with transaction.atomic():
+            self.create_catalogue(options)
+
+            legacy = LegacyLessonListView.as_view()
+            paged = ReadingLessonListAPIView.as_view()
+            limit = options["limit"]
+
+            self.stdout.write(
+                f"{'request':<28}  {'requests':>8}  {'KiB/resp':>9}  "
+                f"{'p50 ms':>8}  {'p95 ms':>8}"
+            )
+            self.report("full list (legacy)", self.run(
+                legacy, {}, options["repeat"], walk=False
+            ))
+            self.report(f"pages of {limit}", self.run(
+                paged, {"limit": limit}, 1, walk=True
+            ))
+            self.report(f"pages of {limit}, no content", self.run(
+                paged,
+                {"limit": limit, "fields": "id,title,unit,order"},
+                1,
+                walk=True,
+            ))
+
+            transaction.set_rollback(True)
+
+    def create_catalogue(self, options):
+        rng = random.Random(options["seed"])
+        category = BookCategory.objects.create(name="Benchmark lessons")
+        book = Book.objects.create(title="Benchmark", category=category)
+
+        lessons = []
+        per_unit = 20
+        for u in range((options["lessons"] + per_unit - 1) // per_unit):
+            unit = Unit.objects.create(title=f"Unit {u}", book=book, order=u)
+            for order in range(per_unit):
+                if len(lessons) == options["lessons"]:
+                    break
+                words = [rng.choice(VOCABULARY) for _ in range(options["words"])]
+                lessons.append(ReadingLesson(
+                    title=f"Lesson {u}.{order}",
+                    content=" ".join(words) + ".",
+                    unit=unit,
+                    order=order,
+                ))
+        ReadingLesson.objects.bulk_create(lessons, batch_size=1000)
+
+    def run(self, view, params, repeat, walk):
+        """Latencies in ms and response sizes in bytes, one per request."""
+        factory = APIRequestFactory()
+        timings = []
+        sizes = []
+
+        for _ in range(repeat):
+            cursor = None
+            while True:
+                query = dict(params, **({"cursor": cursor} if cursor else {}))
+                request = factory.get("/api/lessons/", query)
+
+                start = time.perf_counter()
+                response = view(request)
+                response.render()
+                timings.append((time.perf_counter() - start) * 1000)
+                sizes.append(len(response.content))
+
+                cursor = response.data.get("next") if walk else None
+                if cursor is None:
+                    break
+
+        return timings, sizes
+
+    def report(self, label, measured):
+        timings, sizes = measured
+        p95 = (
+            statistics.quantiles(timings, n=20)[-1]
+            if len(timings) > 1 else timings[0]
+        )
+        self.stdout.write(
+            f"{label:<28}  {len(timings):>8}  "
+            f"{statistics.mean(sizes) / 1024:>9.1f}  "
+            f"{statistics.median(timings):>8.2f}  {p95:>8.2f}"
+        )
@@ -0,0 +1,151 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from reading.management.commands.benchmark_word_analytics import VOCABULARY
+from reading.services.phonetic_analysis import (
+    PHONETIC_PATTERNS,
+    PhoneticMatcher,
+)
+
+
+def legacy_detect_phonetic_errors(problem_words, patterns=PHONETIC_PATTERNS):
+    """The previous nested-loop matcher, run over every entry."""
+    phonetic_errors = {}
+
+    for entry in problem_words:
+        expected = entry.get("word", "")
+        heard = entry.get("heard", "")
+
+        for rule in patterns:
+            for expected_sound in rule["expected"]:
+                if expected_sound in expected:
+                    for sub in rule["common_substitutions"]:
+                        if sub in heard and sub != expected_sound:
+                            name = rule["name"]
+                            phonetic_errors[name] = phonetic_errors.get(name, 0) + 1
+
+    return phonetic_errors
+
+
+def synthetic_rules(count, rng):
+    """Extra letter-pair confusion rules to measure scaling with rule count."""
+    letters = string.ascii_lowercase
+    return [
+        {
+            "name": f"Synthetic {i}",
+            "expected": ["".join(rng.choices(letters, k=2))],
+            "common_substitutions": ["".join(rng.choices(letters, k=2))],
+        }
+        for i in range(count)
+    ]
+
+
+def mispronounce(word, rng):
+    """A plausible misreading: swap, drop or double one letter."""
+    i = rng.randrange(len(word))
+    roll = rng.random()
+    if roll < 0.4:
+        return word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+    if roll < 0.7 and len(word) > 1:
+        return word[:i] + word[i + 1:]
+    return word[:i] + word[i] + word[i:]
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark phonetic error detection: the previous nested-loop "
+        "matcher against the compiled PhoneticMatcher, reported per 1k "
+        "problem words and for growing rule sets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--words",
+            type=int,
+            default=10000,
+            help="Entries per run (a mix of correct and mispronounced words).",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0.2,
+            help="Share of entries that are mispronounced.",
+        )
+        parser.add_argument(
+            "--extra-rules",
+            nargs="+",
+            type=int,
+            default=[0, 50, 200, 1000],
+            help="Synthetic rules added on top of PHONETIC_PATTERNS.",
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        entries = []
+        for position in range(options["words"]):
+            word = rng.choice(VOCABULARY)
+            if rng.random() < options["error_rate"]:
+                entries.append({
+                    "word": word,
+                    "heard": mispronounce(word, rng),
+                    "position": position,
+                    "status": "mispronounced",
+                })
+            else:
+                entries.append({
+                    "word": word,
+                    "heard": word,
+                    "position": position,
+                    "status": "correct",
+                })
+
+        problem_count = sum(1 for e in entries if e["status"] != "correct")
+        self.stdout.write(
+            f"{len(entries)} entries, {problem_count} problem words"
+        )
+        self.stdout.write(
+            f"{'rules':>6}  {'legacy ms/1k':>13}  {'compiled ms/1k':>15}  "
+            f"{'speedup':>8}"
+        )
+
+        for extra in options["extra_rules"]:
+            patterns = PHONETIC_PATTERNS + synthetic_rules(extra, rng)
+            matcher = PhoneticMatcher(patterns)
+
+            def compiled():
+                counts = {}
+                for entry in entries:
+                    if entry["status"] == "correct":
+                        continue
+                    matcher.match(entry["word"], entry["heard"], counts)
+                return counts
+
+            legacy_ms = self.measure(
+                lambda: legacy_detect_phonetic_errors(entries, patterns),
+                options["repeat"],
+            )
+            compiled_ms = self.measure(compiled, options["repeat"])
+
+            per_1k = 1000 / max(problem_count, 1)
+            self.stdout.write(
+                f"{len(patterns):>6}  {legacy_ms * per_1k:>13.2f}  "
+                f"{compiled_ms * per_1k:>15.2f}  "
+                f"{legacy_ms / max(compiled_ms, 1e-9):>7.1f}x"
+            )
+
+    @staticmethod
+    def measure(func, repeat):
+        """Best wall time of ``repeat`` runs, in ms."""
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
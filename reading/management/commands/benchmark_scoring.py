@@ -0,0 +1,87 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from reading.management.commands.benchmark_alignment import simulate_reading
+from reading.management.commands.benchmark_word_analytics import VOCABULARY
+from reading.services.lesson_cache import CompiledLesson
+from reading.services.phonetic_analysis import detect_phonetic_errors
+from reading.services.pronunciation_engine import (
+    generate_feedback,
+    word_by_word_comparison,
+)
+from reading.services.scoring import ScoringService
+
+
+def dict_per_word_pipeline(expected, spoken):
+    """The previous feedback path: one dict per word, filtered afterwards."""
+    problem_words, score = word_by_word_comparison(expected, spoken)
+    phonetic_errors = detect_phonetic_errors(problem_words)
+    feedback_text = generate_feedback(problem_words, score)
+    mispronounced_only = [
+        w for w in problem_words if w["status"] != "correct"
+    ]
+    return {
+        "score": score,
+        "feedback": feedback_text,
+        "mispronounced": mispronounced_only,
+        "phonetic_errors": phonetic_errors,
+    }
+
+
+def scoring_service(expected, spoken):
+    return ScoringService.score(expected, spoken).as_dict()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the scoring hot path: wall time of ScoringService "
+        "against the previous dict-per-word pipeline on the same alignment."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10, 100, 1000, 10000],
+            help="Passage lengths in words.",
+        )
+        parser.add_argument("--error-rate", type=float, default=0.1)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        self.stdout.write(f"{'words':>7}  {'dicts ms':>9}  {'service ms':>10}")
+
+        for size in options["sizes"]:
+            words = [rng.choice(VOCABULARY) for _ in range(size)]
+            expected = CompiledLesson(" ".join(words))
+            spoken = " ".join(simulate_reading(words, options["error_rate"], rng))
+
+            dicts_ms = self.measure(
+                lambda: dict_per_word_pipeline(expected, spoken),
+                options["repeat"],
+            )
+            service_ms = self.measure(
+                lambda: scoring_service(expected, spoken),
+                options["repeat"],
+            )
+
+            self.stdout.write(
+                f"{size:>7}  {dicts_ms:>9.2f}  {service_ms:>10.2f}"
+            )
+
+    @staticmethod
+    def measure(func, repeat):
+        """Best wall time of ``repeat`` runs, in ms."""
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
@@ -0,0 +1,127 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reading.models import PronunciationAttempt, ReadingLesson, WordAnalytics
+from reading.services.analytics_service import (
+    AnalyticsService,
+    WORD_PATTERN,
+    _mispronounced_words,
+)
+
+
+VOCABULARY = [
+    "the", "cat", "sat", "on", "mat", "and", "looked", "at", "bright",
+    "morning", "sun", "while", "children", "played", "in", "garden",
+    "rabbit", "jumped", "over", "fence", "three", "throw", "very", "water",
+    "river", "little", "brown", "dog", "barked", "loudly", "near", "house",
+    "teacher", "read", "story", "about", "brave", "knight", "dragon",
+    "castle", "forest", "whispered", "secret", "friend", "yellow", "boat",
+]
+
+
+def legacy_extract_word_analytics(attempt):
+    """The previous per-word get_or_create + save() implementation."""
+    mispronounced_words = _mispronounced_words(attempt.mispronounced)
+
+    for word in WORD_PATTERN.findall(attempt.expected.lower()):
+        if len(word) < 2:
+            continue
+
+        is_correct = word not in mispronounced_words
+
+        word_analytics, created = WordAnalytics.objects.get_or_create(
+            user=attempt.user,
+            word=word,
+            lesson=attempt.lesson,
+            defaults={
+                'total_attempts': 1,
+                'correct_attempts': 1 if is_correct else 0,
+            }
+        )
+
+        if not created:
+            word_analytics.total_attempts += 1
+            if is_correct:
+                word_analytics.correct_attempts += 1
+            word_analytics.save()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark word analytics extraction (query count and wall time) "
+        "for the legacy per-word path and the bulk path. Runs against the "
+        "configured database and rolls back everything it writes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[50, 300, 1000],
+            help="Passage lengths in words.",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        self.stdout.write(f"Database: {connection.vendor}")
+        self.stdout.write(
+            f"{'words':>6} {'path':>7} {'run':>6} {'queries':>8} {'ms':>9}"
+        )
+
+        for size in options["sizes"]:
+            words = [rng.choice(VOCABULARY) for _ in range(size)]
+            mispronounced = [
+                {"word": w} for w in set(words) if rng.random() < 0.1
+            ]
+
+            for label, extract in (
+                ("legacy", legacy_extract_word_analytics),
+                ("bulk", AnalyticsService.extract_word_analytics),
+            ):
+                # "first" inserts every word, "repeat" only updates rows.
+                for run, queries, elapsed in self._measure(
+                    size, " ".join(words), mispronounced, extract
+                ):
+                    self.stdout.write(
+                        f"{size:>6} {label:>7} {run:>6} "
+                        f"{queries:>8} {elapsed * 1000:>9.2f}"
+                    )
+
+    def _measure(self, size, text, mispronounced, extract):
+        results = []
+
+        with transaction.atomic():
+            user = get_user_model().objects.create(
+                username=f"bench-word-analytics-{size}"
+            )
+            lesson = ReadingLesson.objects.create(
+                title=f"Benchmark {size}", content=text
+            )
+            attempt = PronunciationAttempt(
+                user=user,
+                lesson=lesson,
+                expected=text,
+                spoken=text,
+                mispronounced=mispronounced,
+                created_at=timezone.now(),
+            )
+
+            for run in ("first", "repeat"):
+                with CaptureQueriesContext(connection) as ctx:
+                    start = time.perf_counter()
+                    extract(attempt)
+                    elapsed = time.perf_counter() - start
+                results.append((run, len(ctx.captured_queries), elapsed))
+
+            transaction.set_rollback(True)
+
+        return results
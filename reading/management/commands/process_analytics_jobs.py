@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reading.services.analytics_jobs import AnalyticsJobQueue
+
+
+class Command(BaseCommand):
+    help = (
+        "Drain the deferred analytics job queue (word and daily analytics "
+        "for attempts submitted with ASYNC_ANALYTICS enabled)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--max-tries",
+            type=int,
+            default=3,
+            help="Mark a job failed after this many errors.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for new jobs instead of exiting when idle.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed, failed = AnalyticsJobQueue.process_pending(
+                batch_size=options["batch_size"],
+                max_tries=options["max_tries"],
+            )
+
+            if processed or failed:
+                self.stdout.write(
+                    f"Processed {processed} job(s), {failed} failure(s)"
+                )
+                continue
+
+            if not options["loop"]:
+                break
+            time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS("Analytics job queue drained"))
@@ -0,0 +1,70 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from reading.models import PronunciationAttempt, UserAnalytics
+from reading.services.analytics_service import AnalyticsService
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild UserAnalytics rows for a day from raw pronunciation "
+        "attempts, reconciling the incremental daily rollup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            help="Day to rebuild (YYYY-MM-DD). Defaults to today.",
+        )
+        parser.add_argument(
+            "--user",
+            help="Username to rebuild. Defaults to every user active that day.",
+        )
+
+    def handle(self, *args, **options):
+        if options["date"]:
+            try:
+                day = date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['date']}")
+        else:
+            day = timezone.now().date()
+
+        User = get_user_model()
+
+        if options["user"]:
+            try:
+                users = [User.objects.get(username=options["user"])]
+            except User.DoesNotExist:
+                raise CommandError(f"Unknown user: {options['user']}")
+        else:
+            # Users with attempts that day, plus users whose existing row
+            # may need to be reset.
+            user_ids = set(
+                PronunciationAttempt.objects.filter(
+                    user__isnull=False,
+                    created_at__date=day,
+                ).values_list("user_id", flat=True)
+            )
+            user_ids.update(
+                UserAnalytics.objects.filter(date=day).values_list(
+                    "user_id", flat=True
+                )
+            )
+            users = User.objects.filter(id__in=user_ids).order_by("id")
+
+        rebuilt = 0
+        for user in users:
+            analytics = AnalyticsService.rebuild_daily_analytics(user, day)
+            rebuilt += 1
+            self.stdout.write(
+                f"{user.username}: {analytics.total_attempts} attempts, "
+                f"avg {analytics.avg_score:.1f}"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {rebuilt} row(s) for {day.isoformat()}")
+        )
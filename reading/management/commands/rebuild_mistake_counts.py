@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from reading.services.analytics_service import AnalyticsService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the per-user and global word mistake tables from every "
+        "stored pronunciation attempt (backfill or reconciliation)."
+    )
+
+    def handle(self, *args, **options):
+        words = AnalyticsService.rebuild_mistake_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt mistake counts for {words} word(s)")
+        )
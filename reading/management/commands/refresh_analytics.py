@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reading.services.analytics_service import AnalyticsService
+
+
+# Materialized analytics tables, in refresh order
+REFRESHERS = {
+    "global-words": AnalyticsService.refresh_global_word_stats,
+    "lesson-difficulty": AnalyticsService.refresh_lesson_difficulty,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the materialized analytics tables served by the global "
+        "endpoints. Intended to run periodically (cron or a scheduler)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            nargs="+",
+            choices=sorted(REFRESHERS),
+            help="Refresh only these tables.",
+        )
+
+    def handle(self, *args, **options):
+        for name in options["only"] or REFRESHERS:
+            start = time.perf_counter()
+            count = REFRESHERS[name]()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{name}: {count} row(s) in {elapsed * 1000:.1f} ms"
+                )
+            )
@@ -0,0 +1,258 @@
+import json
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from reading.models import PronunciationAttempt, UserSummary
+from reading.services.analytics_cache import invalidate_all
+
+
+UPDATE_FIELDS = ["score", "mispronounced", "feedback"]
+
+# Pages read ahead of the one being written back
+PAGES_IN_FLIGHT = 2
+
+
+def _init_worker():
+    """Workers started with "spawn" need Django configured first."""
+    import django
+
+    django.setup()
+
+
+@lru_cache(maxsize=256)
+def _compiled(expected):
+    # Attempts of one lesson share their expected text; compile it once
+    from reading.services.lesson_cache import CompiledLesson
+
+    return CompiledLesson(expected)
+
+
+def rescore_rows(rows):
+    """
+    Score (id, expected, spoken, score, mispronounced, feedback) rows and
+    return (changed rows, rows scored, seconds spent, worker pid). Only rows
+    whose stored values differ from the new ones are returned.
+    """
+    from reading.services.scoring import ScoringService
+
+    start = time.perf_counter()
+    changed = []
+    for attempt_id, expected, spoken, score, mispronounced, feedback in rows:
+        result = ScoringService.score(_compiled(expected), spoken)
+        values = (result.score, result.problem_words, result.feedback)
+        if values != (score, mispronounced, feedback):
+            changed.append((attempt_id, *values))
+    return changed, len(rows), time.perf_counter() - start, os.getpid()
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute score, mispronounced and feedback for stored "
+        "pronunciation attempts with the current scoring rules, using a "
+        "pool of worker processes. Progress is checkpointed so an "
+        "interrupted run can continue with --resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Attempts read per keyset page.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=250,
+            help="Attempts handed to a worker per task.",
+        )
+        parser.add_argument(
+            "--update-batch-size",
+            type=int,
+            default=500,
+            help="Rows per bulk_update statement.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes; 0 scores in this process.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default="rescore_attempts.checkpoint.json",
+            help="File recording the last attempt id written back.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue after the id stored in the checkpoint file.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Score and report without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        checkpoint = options["checkpoint"]
+
+        last_id = 0
+        self.scored = self.updated = 0
+        if options["resume"]:
+            if not os.path.exists(checkpoint):
+                raise CommandError(f"No checkpoint at {checkpoint}")
+            with open(checkpoint) as f:
+                state = json.load(f)
+            # Totals carry over, so rows changed before the interruption
+            # still trigger the summary reset below
+            last_id = state["last_id"]
+            self.scored = state.get("scored", 0)
+            self.updated = state.get("updated", 0)
+            self.stdout.write(f"Resuming after attempt {last_id}")
+
+        self.resumed_scored = self.scored
+        self.worker_stats = defaultdict(lambda: [0, 0.0])
+        started = time.perf_counter()
+
+        if options["workers"] > 0:
+            # Workers must not inherit open database connections
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options["workers"],
+                initializer=_init_worker,
+            ) as executor:
+                self.run(executor.submit, last_id)
+        else:
+            self.run(_run_inline, last_id)
+
+        elapsed = time.perf_counter() - started
+        self.report(elapsed)
+
+        if self.updated and not options["dry_run"]:
+            # bulk_update sends no signals; cached dashboards and the score
+            # sums in user summaries still hold old scores. Summaries are
+            # rebuilt on next read.
+            UserSummary.objects.all().delete()
+            invalidate_all()
+
+        if not options["dry_run"] and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+    def run(self, submit, last_id):
+        """Read pages, score them in the pool and write them back in order."""
+        in_flight = deque()
+
+        while True:
+            page = list(
+                PronunciationAttempt.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list(
+                    "id", "expected", "spoken",
+                    "score", "mispronounced", "feedback",
+                )[: self.options["batch_size"]]
+            )
+            if page:
+                last_id = page[-1][0]
+                size = self.options["chunk_size"]
+                futures = [
+                    submit(rescore_rows, page[i:i + size])
+                    for i in range(0, len(page), size)
+                ]
+                in_flight.append((last_id, futures))
+
+            if in_flight and (not page or len(in_flight) >= PAGES_IN_FLIGHT):
+                self.write_page(*in_flight.popleft())
+
+            if not page and not in_flight:
+                break
+
+    def write_page(self, page_last_id, futures):
+        changed = []
+        for future in futures:
+            rows, scored, seconds, pid = future.result()
+            changed.extend(rows)
+            self.scored += scored
+            self.worker_stats[pid][0] += scored
+            self.worker_stats[pid][1] += seconds
+
+        if changed and not self.options["dry_run"]:
+            PronunciationAttempt.objects.bulk_update(
+                [
+                    PronunciationAttempt(
+                        id=attempt_id,
+                        score=score,
+                        mispronounced=mispronounced,
+                        feedback=feedback,
+                    )
+                    for attempt_id, score, mispronounced, feedback in changed
+                ],
+                UPDATE_FIELDS,
+                batch_size=self.options["update_batch_size"],
+            )
+        self.updated += len(changed)
+
+        if not self.options["dry_run"]:
+            self.save_checkpoint(page_last_id)
+
+        self.stdout.write(
+            f"  up to attempt {page_last_id}: {self.scored} scored, "
+            f"{self.updated} changed"
+        )
+
+    def save_checkpoint(self, last_id):
+        path = self.options["checkpoint"]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"last_id": last_id, "scored": self.scored, "updated": self.updated},
+                f,
+            )
+        # Atomic swap, so an interrupted write never corrupts the checkpoint
+        os.replace(tmp_path, path)
+
+    def report(self, elapsed):
+        rate = (self.scored - self.resumed_scored) / elapsed if elapsed else 0
+        verb = "would change" if self.options["dry_run"] else "changed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rescored {self.scored} attempt(s), {verb} {self.updated}, "
+                f"in {elapsed:.1f}s ({rate:.0f} attempts/s)"
+            )
+        )
+        for pid, (count, seconds) in sorted(self.worker_stats.items()):
+            worker_rate = count / seconds if seconds else 0
+            self.stdout.write(
+                f"  worker {pid}: {count} attempts, {seconds:.1f}s busy, "
+                f"{worker_rate:.0f} attempts/s"
+            )
+        if self.updated and not self.options["dry_run"]:
+            self.stdout.write(
+                "Still built from the old scores: LessonProgress best_score "
+                "and is_completed, WordAnalytics and WordOccurrence.was_correct "
+                "(backfill_word_occurrences --reindex), mistake counters "
+                "(rebuild_mistake_counts), daily analytics "
+                "(rebuild_daily_analytics) and the global tables "
+                "(refresh_analytics)."
+            )
+
+
+class _Done:
+    """Already-computed stand-in for a Future when running inline."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
+
+
+def _run_inline(func, *args):
+    return _Done(func(*args))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.11 on 2026-10-17 22:38
+
+import reading.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0003_useranalytics_wordanalytics'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='useranalytics',
+            name='date',
+            field=models.DateField(default=reading.models.current_date),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.11 on 2026-10-17 22:39
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+import django.db.models.functions.math
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0004_useranalytics_date_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wordanalytics',
+            name='success_pct',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Cast(django.db.models.functions.math.Round(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('correct_attempts'), '*', models.Value(100.0)), '/', django.db.models.functions.comparison.NullIf(models.F('total_attempts'), 0)), 1), models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddIndex(
+            model_name='wordanalytics',
+            index=models.Index(fields=['user', 'success_pct'], name='reading_wor_user_id_e58343_idx'),
+        ),
+    ]
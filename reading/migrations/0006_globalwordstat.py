@@ -0,0 +1,29 @@
+# Generated by Django 5.2.11 on 2026-10-17 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0005_wordanalytics_success_pct'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GlobalWordStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=255, unique=True)),
+                ('total_attempts', models.PositiveIntegerField(default=0)),
+                ('correct_attempts', models.PositiveIntegerField(default=0)),
+                ('unique_users', models.PositiveIntegerField(default=0)),
+                ('success_rate', models.FloatField(default=0)),
+                ('failure_rate', models.FloatField(db_index=True, default=0)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-failure_rate'],
+            },
+        ),
+    ]
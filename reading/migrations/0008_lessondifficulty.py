@@ -0,0 +1,28 @@
+# Generated by Django 5.2.11 on 2026-10-17 22:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0007_wordmistakecount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LessonDifficulty',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('average_score', models.FloatField(db_index=True, default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField()),
+                ('lesson', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='difficulty', to='reading.readinglesson')),
+            ],
+            options={
+                'verbose_name_plural': 'Lesson difficulties',
+                'ordering': ['average_score'],
+            },
+        ),
+    ]
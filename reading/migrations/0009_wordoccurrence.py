@@ -0,0 +1,32 @@
+# Generated by Django 5.2.11 on 2026-10-17 22:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0008_lessondifficulty'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WordOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=255)),
+                ('position', models.PositiveIntegerField()),
+                ('was_correct', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField()),
+                ('attempt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='word_occurrences', to='reading.pronunciationattempt')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='word_occurrences', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['user', 'word', '-created_at'], name='reading_wor_user_id_5f7040_idx')],
+            },
+        ),
+    ]
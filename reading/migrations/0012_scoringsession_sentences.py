@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-17 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0011_scoringsession'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scoringsession',
+            name='sentences',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.11 on 2026-10-17 23:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('reading', '0013_catalogue_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='reading_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_attempts', models.PositiveIntegerField(default=0)),
+                ('scored_attempts', models.PositiveIntegerField(default=0)),
+                ('score_total', models.FloatField(default=0)),
+                ('lesson_attempts', models.PositiveIntegerField(default=0)),
+                ('completed_lessons', models.PositiveIntegerField(default=0)),
+                ('best_scored_lessons', models.PositiveIntegerField(default=0)),
+                ('best_score_total', models.FloatField(default=0)),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.11 on 2026-10-17 23:19
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def count_scored_attempts(apps, schema_editor):
+    """Fill scored_attempts of existing rows from the attempts of their day."""
+    PronunciationAttempt = apps.get_model('reading', 'PronunciationAttempt')
+    UserAnalytics = apps.get_model('reading', 'UserAnalytics')
+
+    counts = PronunciationAttempt.objects.filter(
+        user__isnull=False,
+        score__isnull=False,
+    ).order_by().values(
+        'user_id', day=TruncDate('created_at'),
+    ).annotate(scored=Count('id'))
+
+    for row in counts.iterator():
+        UserAnalytics.objects.filter(
+            user_id=row['user_id'], date=row['day']
+        ).update(scored_attempts=row['scored'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0014_usersummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='useranalytics',
+            name='scored_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_scored_attempts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.11 on 2026-10-17 23:20
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def merge_duplicates(apps, schema_editor):
+    """Fold duplicated lesson-less rows into the oldest one of each word."""
+    WordAnalytics = apps.get_model('reading', 'WordAnalytics')
+
+    duplicated = WordAnalytics.objects.filter(
+        lesson__isnull=True
+    ).order_by().values('user_id', 'word').annotate(
+        rows=Count('id'),
+        keep=Min('id'),
+        total=Sum('total_attempts'),
+        correct=Sum('correct_attempts'),
+        last=Max('last_attempt_at'),
+    ).filter(rows__gt=1)
+
+    for row in list(duplicated):
+        rows = WordAnalytics.objects.filter(
+            user_id=row['user_id'], word=row['word'], lesson__isnull=True
+        )
+        rows.exclude(id=row['keep']).delete()
+        rows.update(
+            total_attempts=row['total'],
+            correct_attempts=row['correct'],
+            last_attempt_at=row['last'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0015_useranalytics_scored_attempts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='wordanalytics',
+            constraint=models.UniqueConstraint(condition=models.Q(('lesson__isnull', True)), fields=('user', 'word'), name='unique_word_analytics_without_lesson'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.11 on 2026-10-17 23:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading', '0016_word_analytics_without_lesson'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pronunciationattempt',
+            name='client_id',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='pronunciationattempt',
+            constraint=models.UniqueConstraint(condition=models.Q(('client_id__isnull', False)), fields=('user', 'client_id'), name='unique_attempt_client_id_per_user'),
+        ),
+    ]
@@ -1,8 +1,28 @@
 # reading/models.py
+import uuid
+from decimal import ROUND_HALF_UP, Decimal
+
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from django.db.models import F, Avg
+from django.db.models.functions import Cast, NullIf, Round
+
+
+def current_date():
+    """Default for date fields that must stay settable (unlike auto_now_add)."""
+    return timezone.now().date()
+
+
+def success_rate_expression():
+    """SQL counterpart of WordAnalytics.success_rate() (NULL with no attempts)."""
+    return Cast(
+        Round(
+            F('correct_attempts') * 100.0 / NullIf(F('total_attempts'), 0),
+            1,
+        ),
+        models.FloatField(),
+    )
 
 
 class BookCategory(models.Model):
@@ -24,6 +44,7 @@ class Book(models.Model):
         related_name="books",
     )
     order = models.PositiveIntegerField(default=0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["order", "title"]
@@ -46,6 +67,7 @@ class Unit(models.Model):
         related_name="units",
     )
     order = models.PositiveIntegerField(default=0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["order", "title"]
@@ -73,7 +95,8 @@ class ReadingLesson(models.Model):
     order = models.PositiveIntegerField(default=0, db_index=True)
 
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Indexed for the ETags of lesson lists (see reading.etags)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["order", "title"]
@@ -112,6 +135,9 @@ class PronunciationAttempt(models.Model):
     score = models.FloatField(null=True, blank=True)
     mispronounced = models.JSONField(default=list, blank=True)
     feedback = models.TextField(blank=True)
+    # Id the offline queue gives an attempt, so a replayed batch is not
+    # saved twice
+    client_id = models.CharField(max_length=100, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
@@ -120,6 +146,13 @@ class PronunciationAttempt(models.Model):
             models.Index(fields=["lesson", "created_at"]),
             models.Index(fields=["user", "created_at"]),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "client_id"],
+                condition=models.Q(client_id__isnull=False),
+                name="unique_attempt_client_id_per_user",
+            )
+        ]
 
     def __str__(self):
         return f"Attempt {self.id} lesson={self.lesson_id} score={self.score}"
@@ -163,6 +196,48 @@ class LessonProgress(models.Model):
         return f"{self.user} - {self.lesson}"
 
 
+class UserSummary(models.Model):
+    """
+    A student's running totals for the progress and dashboard endpoints,
+    kept current by ProgressService alongside LessonProgress so those
+    endpoints read one row instead of aggregating attempts and progress.
+    Averages are stored as sums and counts. A missing row is rebuilt from
+    the raw tables on first read.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="reading_summary",
+    )
+    # Every attempt, with or without a lesson
+    total_attempts = models.PositiveIntegerField(default=0)
+    scored_attempts = models.PositiveIntegerField(default=0)
+    score_total = models.FloatField(default=0)
+    # From the user's LessonProgress rows
+    lesson_attempts = models.PositiveIntegerField(default=0)
+    completed_lessons = models.PositiveIntegerField(default=0)
+    best_scored_lessons = models.PositiveIntegerField(default=0)
+    best_score_total = models.FloatField(default=0)
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Summary of {self.user}: {self.total_attempts} attempts"
+
+    def average_score(self):
+        """Mean score over scored attempts, None before the first one"""
+        if not self.scored_attempts:
+            return None
+        return self.score_total / self.scored_attempts
+
+    def average_best_score(self):
+        """Mean best score over lessons with one, None before the first"""
+        if not self.best_scored_lessons:
+            return None
+        return self.best_score_total / self.best_scored_lessons
+
+
 class WordAnalytics(models.Model):
     """Track performance on individual words"""
     user = models.ForeignKey(
@@ -180,25 +255,46 @@ class WordAnalytics(models.Model):
     )
     total_attempts = models.PositiveIntegerField(default=0)
     correct_attempts = models.PositiveIntegerField(default=0)
+    # Stored by the database so weak/strong rankings can filter, order and
+    # slice on an index instead of calling success_rate() per row
+    success_pct = models.GeneratedField(
+        expression=success_rate_expression(),
+        output_field=models.FloatField(),
+        db_persist=True,
+    )
     last_attempt_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ['user', 'word', 'lesson']
+        constraints = [
+            # NULLs never compare equal, so unique_together alone lets
+            # concurrent inserts duplicate a word recorded without a lesson
+            models.UniqueConstraint(
+                fields=['user', 'word'],
+                condition=models.Q(lesson__isnull=True),
+                name='unique_word_analytics_without_lesson',
+            ),
+        ]
         ordering = ['-total_attempts']
         indexes = [
             models.Index(fields=['user', 'word']),
             models.Index(fields=['user', '-total_attempts']),
+            models.Index(fields=['user', 'success_pct']),
         ]
 
     def __str__(self):
         return f"{self.user.username} - {self.word}: {self.correct_attempts}/{self.total_attempts}"
 
     def success_rate(self):
-        """Calculate success rate percentage"""
+        """
+        Calculate success rate percentage, rounding halves away from zero
+        like SQL ROUND() in success_pct (round() would turn 6.25 into 6.2)
+        """
         if self.total_attempts == 0:
             return 0
-        return round((self.correct_attempts / self.total_attempts) * 100, 1)
+        rate = Decimal(self.correct_attempts * 100) / self.total_attempts
+        return float(rate.quantize(Decimal('0.1'), rounding=ROUND_HALF_UP))
 
 
 class UserAnalytics(models.Model):
@@ -208,8 +304,10 @@ class UserAnalytics(models.Model):
         on_delete=models.CASCADE,
         related_name='analytics'
     )
-    date = models.DateField(auto_now_add=True)
+    date = models.DateField(default=current_date)
     total_attempts = models.PositiveIntegerField(default=0)
+    # Attempts with a score; the weight of avg_score in the running mean
+    scored_attempts = models.PositiveIntegerField(default=0)
     avg_score = models.FloatField(default=0)
     lessons_completed = models.PositiveIntegerField(default=0)
     total_practice_time = models.PositiveIntegerField(default=0)
@@ -223,4 +321,200 @@ class UserAnalytics(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.user.username} - {self.date}"
\ No newline at end of file
+        return f"{self.user.username} - {self.date}"
+
+
+class GlobalWordStat(models.Model):
+    """
+    Materialized per-word totals across all users, rebuilt periodically by
+    the refresh_analytics command so global endpoints never scan live rows.
+    """
+    word = models.CharField(max_length=255, unique=True)
+    total_attempts = models.PositiveIntegerField(default=0)
+    correct_attempts = models.PositiveIntegerField(default=0)
+    unique_users = models.PositiveIntegerField(default=0)
+    success_rate = models.FloatField(default=0)
+    failure_rate = models.FloatField(default=0, db_index=True)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-failure_rate']
+
+    def __str__(self):
+        return f"{self.word}: {self.failure_rate}% failure"
+
+
+
+class WordMistakeCount(models.Model):
+    """How many times a user has mispronounced a word, maintained on write"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='word_mistakes'
+    )
+    word = models.CharField(max_length=255)
+    mistakes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'word'],
+                name='unique_mistake_count_per_user_word',
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.word}: {self.mistakes}"
+
+
+class GlobalWordMistakeCount(models.Model):
+    """How many times a word has been mispronounced across all attempts"""
+    word = models.CharField(max_length=255, unique=True)
+    mistakes = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.word}: {self.mistakes}"
+
+
+
+class LessonDifficulty(models.Model):
+    """
+    Materialized per-lesson score averages across all students, rebuilt
+    periodically by the refresh_analytics command.
+    """
+    lesson = models.OneToOneField(
+        ReadingLesson,
+        on_delete=models.CASCADE,
+        related_name='difficulty'
+    )
+    average_score = models.FloatField(default=0, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "Lesson difficulties"
+        ordering = ['average_score']
+
+    def __str__(self):
+        return f"{self.lesson}: {self.average_score}"
+
+
+
+class WordOccurrence(models.Model):
+    """
+    One word of an attempt's expected text, so per-word history can be
+    looked up by index instead of scanning attempts.
+    """
+    attempt = models.ForeignKey(
+        PronunciationAttempt,
+        on_delete=models.CASCADE,
+        related_name='word_occurrences'
+    )
+    # Copied from the attempt so lookups never need the join
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='word_occurrences',
+        null=True,
+        blank=True
+    )
+    word = models.CharField(max_length=255)
+    position = models.PositiveIntegerField()
+    was_correct = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['user', 'word', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.word} @{self.position} in attempt {self.attempt_id}"
+
+
+
+class AnalyticsJob(models.Model):
+    """
+    Deferred word and daily analytics for one attempt, drained by the
+    process_analytics_jobs command. One job per attempt keeps processing
+    idempotent.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    attempt = models.OneToOneField(
+        PronunciationAttempt,
+        on_delete=models.CASCADE,
+        related_name='analytics_job'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING
+    )
+    tries = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
+
+    def __str__(self):
+        return f"Analytics job for attempt {self.attempt_id} ({self.status})"
+
+
+
+class ScoringSession(models.Model):
+    """
+    An attempt scored piece by piece: a recording streamed to the audio
+    feedback API in chunks, or a lesson read sentence by sentence through
+    the text feedback API. Chunk transcripts are appended to ``transcript``;
+    sentence readings are kept per sentence index in ``sentences``. Either
+    way the final score only has to combine what is already there. The
+    random id is what the client presents with every request.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='scoring_sessions',
+        null=True,
+        blank=True
+    )
+    lesson = models.ForeignKey(
+        ReadingLesson,
+        on_delete=models.CASCADE,
+        related_name='scoring_sessions'
+    )
+    transcript = models.TextField(blank=True)
+    # Also the sequence number the next chunk must carry
+    chunks_received = models.PositiveIntegerField(default=0)
+    # {"<sentence index>": {"spoken": ..., "correct": n, "words": n}}
+    sentences = models.JSONField(default=dict, blank=True)
+    attempt = models.OneToOneField(
+        PronunciationAttempt,
+        on_delete=models.SET_NULL,
+        related_name='scoring_session',
+        null=True,
+        blank=True
+    )
+    is_final = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Scoring session {self.id} on {self.lesson} ({self.chunks_received} chunks)"
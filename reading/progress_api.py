@@ -4,9 +4,8 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
-from django.db.models import Avg
-
 from .models import LessonProgress, ReadingLesson
+from .services.progress_service import ProgressService
 
 
 # ---------------------------------------------------
@@ -24,19 +23,11 @@ class StudentProgressAPIView(APIView):
 
         user = request.user
 
-        progress_records = LessonProgress.objects.filter(user=user)
+        summary = ProgressService.get_summary(user.pk)
 
         total_lessons = ReadingLesson.objects.count()
 
-        completed_lessons = progress_records.filter(
-            is_completed=True
-        ).count()
-
-        total_attempts = sum(p.total_attempts for p in progress_records)
-
-        best_average = progress_records.aggregate(
-            Avg("best_score")
-        )["best_score__avg"]
+        completed_lessons = summary.completed_lessons
 
         completion_percentage = 0
 
@@ -51,8 +42,8 @@ class StudentProgressAPIView(APIView):
             "total_lessons": total_lessons,
             "completed_lessons": completed_lessons,
             "completion_percentage": completion_percentage,
-            "total_attempts": total_attempts,
-            "average_best_score": best_average,
+            "total_attempts": summary.lesson_attempts,
+            "average_best_score": summary.average_best_score(),
         }
 
         return Response(data)
@@ -12,8 +12,17 @@ class ReadingLessonSerializer(serializers.ModelSerializer):
     """
     Serializer for ReadingLesson model.
     Provides lesson metadata and plain text content.
+
+    Pass ``fields`` to serialize only some of the fields, e.g. list pages
+    that leave out ``content``.
     """
 
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         model = ReadingLesson
         fields = [
@@ -0,0 +1,291 @@
+# reading/services/alignment.py
+"""
+Word alignment between an expected passage and what the student said.
+
+Tokens are interned to integer ids and aligned with Myers' O(ND) diff, so a
+reading with few mistakes costs roughly one pass over the passage however
+long it is. Each Myers run is capped at MAX_EDIT_DISTANCE edits; when a
+segment needs more than that, it is split on tokens that occur exactly once
+in both sides (patience anchors) and the pieces are aligned separately.
+Segments with no anchor are cut into proportional windows small enough to
+diff exactly. That keeps
+whole-chapter passages in bounded time without difflib's autojunk
+heuristic, which drops frequent words on inputs over 200 tokens.
+
+The result uses SequenceMatcher's opcode format.
+"""
+
+from bisect import bisect_left
+
+
+# Largest edit distance a single Myers run may explore before the segment
+# is split on anchors instead
+MAX_EDIT_DISTANCE = 128
+
+# Anchor lengths tried in turn; longer n-grams stay unique in passages with
+# a small vocabulary, where single words repeat too often to anchor on
+ANCHOR_SIZES = (1, 2, 3, 4)
+
+
+def intern_tokens(*sequences, vocab=None):
+    """
+    Map tokens to integer ids shared across ``sequences``.
+    Returns one list of ids per sequence.
+    """
+    if vocab is None:
+        vocab = {}
+    return [
+        [vocab.setdefault(token, len(vocab)) for token in tokens]
+        for tokens in sequences
+    ]
+
+
+def align(expected, spoken, max_edit_distance=MAX_EDIT_DISTANCE):
+    """
+    Align two token sequences and return SequenceMatcher-style opcodes:
+    a list of (tag, i1, i2, j1, j2) with tag in
+    'equal', 'replace', 'delete', 'insert'.
+    """
+    a, b = intern_tokens(expected, spoken)
+    return opcodes_from_blocks(
+        matching_blocks(a, b, max_edit_distance), len(a), len(b)
+    )
+
+
+def matching_blocks(a, b, max_edit_distance=MAX_EDIT_DISTANCE):
+    """
+    Return the matching blocks (i, j, size) of two id sequences in order,
+    with adjacent blocks merged.
+    """
+    blocks = []
+    _align(a, 0, len(a), b, 0, len(b), max_edit_distance, blocks)
+    return _merge_blocks(blocks)
+
+
+def opcodes_from_blocks(blocks, n, m):
+    """Turn matching blocks into SequenceMatcher-style opcodes."""
+    opcodes = []
+    i = j = 0
+    for bi, bj, size in blocks + [(n, m, 0)]:
+        if i < bi and j < bj:
+            opcodes.append(('replace', i, bi, j, bj))
+        elif i < bi:
+            opcodes.append(('delete', i, bi, j, bj))
+        elif j < bj:
+            opcodes.append(('insert', i, bi, j, bj))
+        if size:
+            opcodes.append(('equal', bi, bi + size, bj, bj + size))
+        i, j = bi + size, bj + size
+    return opcodes
+
+
+def _align(a, alo, ahi, b, blo, bhi, max_d, blocks):
+    """Append the matching blocks of a[alo:ahi] and b[blo:bhi] to blocks."""
+
+    # Common prefix and suffix never need the diff
+    prefix = 0
+    while alo + prefix < ahi and blo + prefix < bhi and a[alo + prefix] == b[blo + prefix]:
+        prefix += 1
+    if prefix:
+        blocks.append((alo, blo, prefix))
+        alo += prefix
+        blo += prefix
+
+    suffix = 0
+    while alo < ahi - suffix and blo < bhi - suffix and a[ahi - suffix - 1] == b[bhi - suffix - 1]:
+        suffix += 1
+    ahi -= suffix
+    bhi -= suffix
+
+    if alo < ahi and blo < bhi:
+        found = _myers(a, alo, ahi, b, blo, bhi, max_d)
+        if found is not None:
+            blocks.extend(found)
+        elif not _align_on_anchors(a, alo, ahi, b, blo, bhi, max_d, blocks):
+            _align_in_windows(a, alo, ahi, b, blo, bhi, max_d, blocks)
+
+    if suffix:
+        blocks.append((ahi, bhi, suffix))
+
+
+def _myers(a, alo, ahi, b, blo, bhi, max_d):
+    """
+    Myers' greedy diff of a[alo:ahi] against b[blo:bhi].
+    Returns the matching blocks in order, or None when the segments differ
+    by more than ``max_d`` edits.
+    """
+    n = ahi - alo
+    m = bhi - blo
+    if abs(n - m) > max_d:
+        # Needs at least |n - m| insertions or deletions
+        return None
+    max_d = min(max_d, n + m)
+
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+
+    for d in range(max_d + 1):
+        trace.append(v[:])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, offset, n, m, alo, blo)
+
+    return None
+
+
+def _backtrack(trace, offset, x, y, alo, blo):
+    """Recover the snakes of a finished Myers run as matching blocks."""
+    blocks = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if d == 0:
+            prev_x = prev_y = 0
+        else:
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                prev_k = k + 1
+            else:
+                prev_k = k - 1
+            prev_x = v[offset + prev_k]
+            prev_y = prev_x - prev_k
+
+        # The snake runs diagonally back to the point just after the edit
+        snake = min(x - prev_x, y - prev_y)
+        if snake:
+            blocks.append((alo + x - snake, blo + y - snake, snake))
+        x, y = prev_x, prev_y
+
+    blocks.reverse()
+    return blocks
+
+
+def _align_on_anchors(a, alo, ahi, b, blo, bhi, max_d, blocks):
+    """
+    Split the segments on n-grams unique to both sides, aligned as their
+    longest increasing run, and align the gaps between them.
+    Returns False when there is no anchor to split on.
+    """
+    size, anchors = max(
+        (
+            (size, _find_anchors(a, alo, ahi, b, blo, bhi, size))
+            for size in ANCHOR_SIZES
+        ),
+        key=lambda found: len(found[1]),
+    )
+    if not anchors:
+        return False
+
+    i, j = alo, blo
+    for ai, bj in anchors:
+        _align(a, i, ai, b, j, bj, max_d, blocks)
+        blocks.append((ai, bj, size))
+        i, j = ai + size, bj + size
+    _align(a, i, ahi, b, j, bhi, max_d, blocks)
+    return True
+
+
+def _find_anchors(a, alo, ahi, b, blo, bhi, size):
+    """Non-overlapping (i, j) starts of n-grams unique to both segments."""
+    a_positions = _unique_positions(a, alo, ahi, size)
+    b_positions = _unique_positions(b, blo, bhi, size)
+
+    pairs = [
+        (i, b_positions[gram])
+        for gram, i in a_positions.items()
+        if gram in b_positions
+    ]
+    if not pairs:
+        return []
+
+    pairs.sort()
+    anchors = []
+    next_i, next_j = alo, blo
+    for i, j in _longest_increasing_run(pairs):
+        if i >= next_i and j >= next_j:
+            anchors.append((i, j))
+            next_i, next_j = i + size, j + size
+    return anchors
+
+
+def _align_in_windows(a, alo, ahi, b, blo, bhi, max_d, blocks):
+    """
+    Cut both segments into windows of about 2 * max_d tokens, proportional
+    to their lengths, and align each window on its own. A segment already
+    that small is diffed exactly, which costs at most window ** 2 steps.
+    """
+    n = ahi - alo
+    m = bhi - blo
+    window = 2 * max(max_d, 1)
+
+    if max(n, m) <= window:
+        blocks.extend(_myers(a, alo, ahi, b, blo, bhi, n + m))
+        return
+
+    count = -(-max(n, m) // window)
+    i, j = alo, blo
+    for step in range(1, count + 1):
+        next_i = alo + n * step // count
+        next_j = blo + m * step // count
+        _align(a, i, next_i, b, j, next_j, max_d, blocks)
+        i, j = next_i, next_j
+
+
+def _unique_positions(tokens, lo, hi, size):
+    positions = {}
+    repeated = set()
+    for i in range(lo, hi - size + 1):
+        gram = tokens[i] if size == 1 else tuple(tokens[i:i + size])
+        if gram in positions:
+            repeated.add(gram)
+        else:
+            positions[gram] = i
+    for gram in repeated:
+        del positions[gram]
+    return positions
+
+
+def _longest_increasing_run(pairs):
+    """Longest subsequence of (i, j) pairs, sorted by i, increasing in j."""
+    tails = []
+    tail_index = []
+    previous = [None] * len(pairs)
+
+    for index, (_, j) in enumerate(pairs):
+        pos = bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[pos] = j
+            tail_index[pos] = index
+        previous[index] = tail_index[pos - 1] if pos else None
+
+    run = []
+    index = tail_index[-1]
+    while index is not None:
+        run.append(pairs[index])
+        index = previous[index]
+    run.reverse()
+    return run
+
+
+def _merge_blocks(blocks):
+    merged = []
+    for i, j, size in blocks:
+        if merged:
+            pi, pj, psize = merged[-1]
+            if pi + psize == i and pj + psize == j:
+                merged[-1] = (pi, pj, psize + size)
+                continue
+        merged.append((i, j, size))
+    return merged
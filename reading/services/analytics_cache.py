@@ -0,0 +1,164 @@
+# reading/services/analytics_cache.py
+"""
+Shared cache for the read-heavy dashboard analytics.
+
+AnalyticsService read methods wrapped with cached_analytics() keep their
+results in Django's default cache for ANALYTICS_CACHE_TTL seconds. Keys
+carry a version per user (or one "global" version for figures across all
+users) and an epoch common to every key. Invalidating bumps a version, so
+all of a user's entries go stale at once without enumerating keys, on any
+cache backend:
+
+- invalidate_user(): an attempt was saved or its analytics were applied
+- invalidate_global(): the cross-user tables were refreshed
+- invalidate_all(): stored scores were rewritten in bulk
+
+Inside a transaction the bump waits for the commit. A read made before it
+would otherwise cache the old figures under the new version.
+
+Versions only reach every worker through a shared backend; see
+ANALYTICS_CACHE_TTL in settings for the local-memory cache.
+
+Hits and misses are counted per function in the cache itself, so with a
+shared backend the figures cover every worker.
+"""
+
+import functools
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+KEY_PREFIX = "analytics"
+GLOBAL_SCOPE = "global"
+EPOCH_KEY = f"{KEY_PREFIX}:epoch"
+
+# Names of the cached functions, for cache_stats()
+CACHED_FUNCTIONS = []
+
+_MISSING = object()
+
+
+def _version_key(scope):
+    return f"{KEY_PREFIX}:version:{scope}"
+
+
+def _versions(scope):
+    """(epoch, scope version), creating whichever is missing."""
+    keys = [EPOCH_KEY, _version_key(scope)]
+    found = cache.get_many(keys)
+
+    versions = []
+    for key in keys:
+        if key not in found:
+            # A clock value, so a version lost to eviction comes back
+            # larger than any it replaces and never revives old entries
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+        versions.append(found[key])
+    return versions
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def _bump_on_commit(key):
+    # Runs at once outside a transaction. A cache outage after the commit
+    # is logged rather than failing the already committed request.
+    transaction.on_commit(lambda: _bump(key), robust=True)
+
+
+def invalidate_user(user_id):
+    """Drop every cached analytics result of one user."""
+    if user_id is not None:
+        _bump_on_commit(_version_key(user_id))
+
+
+def invalidate_global():
+    """Drop cached results that aggregate across users."""
+    _bump_on_commit(_version_key(GLOBAL_SCOPE))
+
+
+def invalidate_all():
+    """Drop every cached analytics result."""
+    _bump_on_commit(EPOCH_KEY)
+
+
+def _count(name, outcome):
+    key = f"{KEY_PREFIX}:stats:{name}:{outcome}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def cache_stats():
+    """Hits, misses and hit rate per cached function."""
+    keys = [
+        f"{KEY_PREFIX}:stats:{name}:{outcome}"
+        for name in CACHED_FUNCTIONS
+        for outcome in ("hits", "misses")
+    ]
+    counts = cache.get_many(keys)
+
+    stats = {}
+    for name in CACHED_FUNCTIONS:
+        hits = counts.get(f"{KEY_PREFIX}:stats:{name}:hits", 0)
+        misses = counts.get(f"{KEY_PREFIX}:stats:{name}:misses", 0)
+        total = hits + misses
+        stats[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total * 100, 1) if total else None,
+        }
+    return stats
+
+
+def cached_analytics(per_user=True):
+    """
+    Cache a function's result per arguments. With ``per_user`` the first
+    argument is the user, whose version is part of the key; otherwise the
+    result is filed under the global version.
+    """
+    def decorator(func):
+        name = func.__name__
+        CACHED_FUNCTIONS.append(name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            ttl = getattr(settings, "ANALYTICS_CACHE_TTL", 300)
+            if not ttl:
+                return func(*args, **kwargs)
+
+            if per_user:
+                scope, key_args = args[0].pk, args[1:]
+            else:
+                scope, key_args = GLOBAL_SCOPE, args
+
+            epoch, version = _versions(scope)
+            key = ":".join([
+                KEY_PREFIX, str(scope), f"{epoch}.{version}", name,
+                *(str(arg) for arg in key_args),
+                *(f"{k}={v}" for k, v in sorted(kwargs.items())),
+            ])
+
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                _count(name, "hits")
+                return value
+
+            _count(name, "misses")
+            value = func(*args, **kwargs)
+            cache.set(key, value, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
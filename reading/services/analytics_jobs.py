@@ -0,0 +1,98 @@
+# reading/services/analytics_jobs.py
+"""
+Database-backed queue that moves per-word analytics off the feedback
+request path: mistake counters, word occurrences and word and daily
+analytics. Views mark an attempt with defer_analytics() before saving it and
+enqueue a job for it; the process_analytics_jobs management command drains
+the queue, so no external broker is needed.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from reading.models import AnalyticsJob
+from reading.services.analytics_service import AnalyticsService
+
+
+def async_analytics_enabled():
+    """Whether analytics should be deferred to the job queue."""
+    return getattr(settings, 'ASYNC_ANALYTICS', False)
+
+
+def defer_analytics(attempt):
+    """
+    Mark an unsaved attempt so the post_save receivers leave its mistake
+    counters and word occurrences to its AnalyticsJob.
+    """
+    attempt._analytics_queued = True
+    return attempt
+
+
+def analytics_deferred(attempt):
+    """Whether an attempt's per-word writes wait for its AnalyticsJob."""
+    return getattr(attempt, '_analytics_queued', False)
+
+
+class AnalyticsJobQueue:
+    """Enqueue and drain deferred analytics jobs"""
+
+    @staticmethod
+    def enqueue(attempt):
+        """Queue analytics for an attempt; enqueueing twice is a no-op"""
+        job, created = AnalyticsJob.objects.get_or_create(attempt=attempt)
+        return job
+
+    @staticmethod
+    def process_pending(batch_size=100, max_tries=3):
+        """
+        Process up to ``batch_size`` pending jobs.
+
+        Each job's analytics writes commit together with its status change,
+        so a job is applied exactly once even if several workers run or a
+        worker dies mid-batch. Returns (processed, failed).
+        """
+        job_ids = list(
+            AnalyticsJob.objects.filter(
+                status=AnalyticsJob.STATUS_PENDING
+            ).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+
+        processed = failed = 0
+        for job_id in job_ids:
+            try:
+                with transaction.atomic():
+                    job = AnalyticsJob.objects.select_for_update(
+                        skip_locked=True
+                    ).select_related(
+                        'attempt__user', 'attempt__lesson'
+                    ).filter(
+                        pk=job_id,
+                        status=AnalyticsJob.STATUS_PENDING,
+                    ).first()
+
+                    if job is None:
+                        # Taken by another worker in the meantime
+                        continue
+
+                    AnalyticsService.process_queued_attempt(job.attempt)
+
+                    job.status = AnalyticsJob.STATUS_DONE
+                    job.tries += 1
+                    job.processed_at = timezone.now()
+                    job.save(update_fields=['status', 'tries', 'processed_at'])
+                processed += 1
+            except Exception as e:
+                AnalyticsJobQueue._record_failure(job_id, e, max_tries)
+                failed += 1
+
+        return processed, failed
+
+    @staticmethod
+    def _record_failure(job_id, error, max_tries):
+        job = AnalyticsJob.objects.get(pk=job_id)
+        job.tries += 1
+        job.last_error = str(error)
+        if job.tries >= max_tries:
+            job.status = AnalyticsJob.STATUS_FAILED
+        job.save(update_fields=['tries', 'last_error', 'status'])
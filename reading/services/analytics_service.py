@@ -1,191 +1,676 @@
 # reading/services/analytics_service.py
+from django.conf import settings
 from django.utils import timezone
-from django.db.models import Count, Avg, Q, F, Value, FloatField
-from django.db.models.functions import Coalesce
+from django.db import transaction
+from django.db.models import (
+    Avg, Count, F, FloatField, Max, Q, Sum, Value,
+)
+from django.db.models.functions import Coalesce, Substr
 from reading.models import (
+    GlobalWordMistakeCount,
+    GlobalWordStat,
+    LessonDifficulty,
     UserAnalytics, 
     WordAnalytics, 
+    WordMistakeCount,
+    WordOccurrence,
     PronunciationAttempt, 
     LessonProgress,
     ReadingLesson
 )
+from collections import defaultdict
 from datetime import timedelta
 import re
 
+from .analytics_cache import (
+    cached_analytics,
+    invalidate_global,
+    invalidate_user,
+)
+from .progress_service import ProgressService
+from .pronunciation_engine import normalize_text
+
+
+WORD_PATTERN = re.compile(r"\b[\w']+\b")
+
+# Maximum number of words kept in UserAnalytics.words_practiced
+DAILY_WORDS_LIMIT = 50
+
+# Scored attempts compared for the dashboard trend
+TREND_ATTEMPTS = 5
+
+
+def _iter_mispronounced(items):
+    """Yield the words of a mispronounced list in order, as stored."""
+    for item in items or []:
+        if isinstance(item, dict):
+            word = item.get('word', '')
+        elif isinstance(item, str):
+            word = item
+        else:
+            continue
+        if word:
+            yield word
+
+
+def _mispronounced_words(items):
+    """Return the lower-cased set of words flagged in a mispronounced list."""
+    return {word.lower().strip() for word in _iter_mispronounced(items)}
+
+
+def _word_deltas(attempt):
+    """Collapse an attempt into {word: (total_delta, correct_delta)}."""
+    mispronounced = _mispronounced_words(attempt.mispronounced)
+
+    deltas = {}
+    for word in WORD_PATTERN.findall(attempt.expected.lower()):
+        if len(word) < 2:  # Skip short words
+            continue
+        total, correct = deltas.get(word, (0, 0))
+        deltas[word] = (
+            total + 1,
+            correct + (0 if word in mispronounced else 1),
+        )
+    return deltas
+
+
+def _bulk_increment(model, scope, deltas, fields, **extra):
+    """
+    Add per-word deltas to counter rows of ``model`` with a constant number
+    of queries: one lookup, one bulk insert for unseen words and one F()
+    increment per distinct delta (almost always a handful).
+
+    ``scope`` holds the fixed lookup values (e.g. user and lesson), ``deltas``
+    maps word -> tuple of increments aligned with ``fields``, and ``extra``
+    values are written to every touched row.
+    """
+    if not deltas:
+        return
+
+    rows = model.objects.filter(**scope)
+
+    with transaction.atomic():
+        existing = set(
+            rows.filter(word__in=deltas).values_list('word', flat=True)
+        )
+        missing = [
+            model(word=word, **scope)
+            for word in deltas
+            if word not in existing
+        ]
+        if missing:
+            # Zero rows; a concurrent insert of the same word is harmless
+            # because the increments below are applied atomically. Rows
+            # scoped to a NULL lesson rely on the partial unique constraint
+            # on WordAnalytics to conflict at all.
+            model.objects.bulk_create(missing, ignore_conflicts=True)
+
+        words_by_delta = defaultdict(list)
+        for word, delta in deltas.items():
+            words_by_delta[delta].append(word)
+
+        for delta, words in words_by_delta.items():
+            increments = {
+                field: F(field) + amount
+                for field, amount in zip(fields, delta)
+            }
+            rows.filter(word__in=words).update(**increments, **extra)
+
+
+def _apply_word_deltas(user_id, lesson_id, deltas, timestamp):
+    """Apply {word: (total, correct)} deltas to the user's WordAnalytics."""
+    _bulk_increment(
+        WordAnalytics,
+        {'user_id': user_id, 'lesson_id': lesson_id},
+        deltas,
+        ('total_attempts', 'correct_attempts'),
+        last_attempt_at=timestamp,
+    )
+
+
+def _mispronounced_positions(items, tokens):
+    """
+    Token positions flagged in a mispronounced list. Entries saved by the
+    scoring service carry their position; for older entries without one,
+    every occurrence of the word counts as flagged.
+    """
+    positions = set()
+    words = set()
+    for item in items or []:
+        position = item.get('position') if isinstance(item, dict) else None
+        if isinstance(position, int) and 0 <= position < len(tokens):
+            positions.add(position)
+        else:
+            words.update(normalize_text(word) for word in _iter_mispronounced([item]))
+
+    if words:
+        positions.update(i for i, token in enumerate(tokens) if token in words)
+    return positions
+
+
+def _word_occurrences(attempt):
+    """
+    Build the WordOccurrence rows for an attempt's expected text, one per
+    scoring token so positions match those in ``mispronounced``.
+    """
+    if not attempt.expected:
+        return []
+
+    tokens = normalize_text(attempt.expected).split()
+    flagged = _mispronounced_positions(attempt.mispronounced, tokens)
+
+    return [
+        WordOccurrence(
+            attempt=attempt,
+            user_id=attempt.user_id,
+            word=word[:255],
+            position=position,
+            was_correct=position not in flagged,
+            created_at=attempt.created_at,
+        )
+        for position, word in enumerate(tokens)
+        if len(word) >= 2  # Skip short words, as word analytics does
+    ]
+
+
+def _mistake_deltas(items):
+    """Count mispronounced entries per word, as stored, into 1-tuples."""
+    counts = defaultdict(int)
+    for word in _iter_mispronounced(items):
+        counts[word[:255]] += 1
+    return {word: (count,) for word, count in counts.items()}
+
+
+def _word_summary(word):
+    """Serialize a WordAnalytics row for the weak/strong word lists."""
+    return {
+        'word': word.word,
+        'total_attempts': word.total_attempts,
+        'correct_attempts': word.correct_attempts,
+        # The stored value the lists are ranked by
+        'success_rate': word.success_pct,
+        'last_attempt_at': word.last_attempt_at
+    }
+
+
+def _weak_words(user):
+    """Words below 80% success, weakest first"""
+    return WordAnalytics.objects.filter(
+        user=user,
+        total_attempts__gte=3,  # Minimum attempts to consider
+        success_pct__lt=80,
+    ).order_by('success_pct', '-total_attempts', 'id')
+
+
+def _strong_words(user):
+    """Words at 80% success or above, strongest first"""
+    return WordAnalytics.objects.filter(
+        user=user,
+        total_attempts__gte=2,  # Minimum attempts to consider
+        success_pct__gte=80,
+    ).order_by('-success_pct', '-total_attempts', 'id')
+
+
+def _difficult_lessons(user):
+    """Lessons tried at least twice whose best score is still under 80"""
+    return LessonProgress.objects.filter(
+        user=user,
+        total_attempts__gte=2,
+        best_score__gt=0,
+        best_score__lt=80,
+    ).select_related('lesson').only(
+        'total_attempts', 'best_score', 'is_completed', 'lesson__title'
+    ).order_by('best_score', 'id')
+
+
+def _difficult_lesson_summary(progress):
+    return {
+        'lesson_id': progress.lesson.id,
+        'lesson_title': progress.lesson.title,
+        'best_score': round(progress.best_score, 1),
+        'total_attempts': progress.total_attempts,
+        'is_completed': progress.is_completed
+    }
+
+
+def _overall_stats(user):
+    """
+    A user's headline figures: attempt and lesson totals from the user's
+    UserSummary row, plus the catalogue size and one aggregate over words.
+    """
+    summary = ProgressService.get_summary(user.pk)
+    total_lessons = ReadingLesson.objects.count()
+
+    words = WordAnalytics.objects.filter(
+        user=user,
+        total_attempts__gte=2
+    ).order_by().aggregate(
+        # Words mastered: at least 3 attempts
+        mastered=Count('id', filter=Q(total_attempts__gte=3)),
+        # Words needing practice: success rate < 60% with at least 2 attempts
+        practice=Count('id', filter=Q(success_pct__lt=60)),
+    )
+
+    completed_lessons = summary.completed_lessons
+    return {
+        'total_attempts': summary.total_attempts,
+        'average_score': round(summary.average_score() or 0, 1),
+        'completed_lessons': completed_lessons,
+        'total_lessons': total_lessons,
+        'mastered_words': words['mastered'],
+        'words_to_practice': words['practice'],
+        'completion_rate': round((completed_lessons / total_lessons * 100), 1) if total_lessons > 0 else 0
+    }
+
+
+def _trend(scores):
+    """Direction of the most recent scores, given newest first"""
+    if len(scores) >= 2:
+        if scores[0] > scores[-1]:
+            return "improving"
+        if scores[0] < scores[-1]:
+            return "declining"
+    return "stable"
+
+
+def _difficulty_level(average_score):
+    return "hard" if average_score < 50 else "medium" if average_score < 75 else "easy"
+
 
 class AnalyticsService:
     """Service for tracking and retrieving user analytics"""
     
+    @staticmethod
+    def process_attempt(attempt):
+        """Run the word and daily analytics for a newly saved attempt"""
+        AnalyticsService.process_attempts([attempt])
+
+    @staticmethod
+    def process_queued_attempt(attempt):
+        """
+        Everything a queued attempt skipped when it was saved: mistake
+        counters and word occurrences, then word and daily analytics.
+        """
+        AnalyticsService.record_mistakes(attempt)
+        AnalyticsService.record_word_occurrences(attempt)
+        AnalyticsService.process_attempt(attempt)
+
+    @staticmethod
+    def process_attempts(attempts):
+        """
+        Run the word and daily analytics for several attempts at once.
+        Errors propagate, so a queued job can be retried; request-time
+        callers decide themselves whether to swallow them.
+        """
+        AnalyticsService.extract_word_analytics_many(attempts)
+
+        if getattr(settings, 'DAILY_ANALYTICS_INCREMENTAL', True):
+            AnalyticsService.apply_attempts_to_daily_analytics(attempts)
+        else:
+            # The attempt's own day, which is not today for a job processed
+            # after midnight
+            days = {
+                (attempt.user_id, (attempt.created_at or timezone.now()).date()): attempt.user
+                for attempt in attempts
+                if attempt.user_id
+            }
+            for (user_id, day), user in days.items():
+                AnalyticsService.rebuild_daily_analytics(user, day)
+
+        for user_id in {attempt.user_id for attempt in attempts}:
+            invalidate_user(user_id)
+
     @staticmethod
     def extract_word_analytics(attempt):
-        """Extract and save word-level analytics from a pronunciation attempt"""
-        if not attempt.user or not attempt.expected:
-            return
-        
-        # Words that were mispronounced (from mispronounced list)
-        mispronounced_words = []
-        for item in attempt.mispronounced or []:
-            if isinstance(item, dict):
-                word = item.get('word', '')
-            elif isinstance(item, str):
-                word = item
-            else:
+        """
+        Extract and save word-level analytics from a pronunciation attempt.
+
+        The expected text is tokenized once and repeated words are collapsed
+        into a single (total, correct) delta, so the write cost depends on the
+        number of distinct words rather than the passage length.
+        """
+        AnalyticsService.extract_word_analytics_many([attempt])
+
+    @staticmethod
+    def extract_word_analytics_many(attempts):
+        """
+        Extract word-level analytics for several attempts, merging the deltas
+        of attempts by the same user on the same lesson before writing.
+        """
+        deltas_by_scope = defaultdict(dict)
+        timestamps = {}
+
+        for attempt in attempts:
+            if not attempt.user_id or not attempt.expected:
                 continue
-            if word:
-                mispronounced_words.append(word.lower().strip())
-        
-        # Split expected text into words (clean punctuation)
-        expected_words = re.findall(r'\b[\w\']+\b', attempt.expected.lower())
-        
-        # Track word performance
-        for word in expected_words:
-            if not word or len(word) < 2:  # Skip short words
+
+            scope = (attempt.user_id, attempt.lesson_id)
+            merged = deltas_by_scope[scope]
+            for word, (total, correct) in _word_deltas(attempt).items():
+                old_total, old_correct = merged.get(word, (0, 0))
+                merged[word] = (old_total + total, old_correct + correct)
+
+            timestamp = attempt.created_at or timezone.now()
+            timestamps[scope] = max(timestamps.get(scope, timestamp), timestamp)
+
+        for (user_id, lesson_id), deltas in deltas_by_scope.items():
+            _apply_word_deltas(
+                user_id,
+                lesson_id,
+                deltas,
+                timestamps[(user_id, lesson_id)],
+            )
+
+    @staticmethod
+    def record_mistakes(attempt):
+        """Add an attempt's mispronounced words to the mistake counters"""
+        AnalyticsService.record_mistakes_many([attempt])
+
+    @staticmethod
+    def record_mistakes_many(attempts):
+        """Add several attempts' mispronounced words to the mistake counters"""
+        user_counts = defaultdict(lambda: defaultdict(int))
+        global_counts = defaultdict(int)
+
+        for attempt in attempts:
+            for word, (count,) in _mistake_deltas(attempt.mispronounced).items():
+                global_counts[word] += count
+                if attempt.user_id:
+                    user_counts[attempt.user_id][word] += count
+
+        for user_id, counts in user_counts.items():
+            _bulk_increment(
+                WordMistakeCount,
+                {'user_id': user_id},
+                {word: (count,) for word, count in counts.items()},
+                ('mistakes',),
+            )
+        _bulk_increment(
+            GlobalWordMistakeCount,
+            {},
+            {word: (count,) for word, count in global_counts.items()},
+            ('mistakes',),
+        )
+
+    @staticmethod
+    def rebuild_mistake_counts():
+        """Recount both mistake tables from every stored attempt"""
+        user_counts = defaultdict(lambda: defaultdict(int))
+        global_counts = defaultdict(int)
+
+        attempts = PronunciationAttempt.objects.order_by().values_list(
+            'user_id', 'mispronounced'
+        )
+        for user_id, mispronounced in attempts.iterator(chunk_size=2000):
+            for word, (count,) in _mistake_deltas(mispronounced).items():
+                global_counts[word] += count
+                if user_id:
+                    user_counts[user_id][word] += count
+
+        with transaction.atomic():
+            WordMistakeCount.objects.all().delete()
+            GlobalWordMistakeCount.objects.all().delete()
+            WordMistakeCount.objects.bulk_create(
+                [
+                    WordMistakeCount(user_id=user_id, word=word, mistakes=count)
+                    for user_id, words in user_counts.items()
+                    for word, count in words.items()
+                ],
+                batch_size=1000,
+            )
+            GlobalWordMistakeCount.objects.bulk_create(
+                [
+                    GlobalWordMistakeCount(word=word, mistakes=count)
+                    for word, count in global_counts.items()
+                ],
+                batch_size=1000,
+            )
+
+        return len(global_counts)
+
+    @staticmethod
+    def get_mistake_counts(words, user=None):
+        """Map words to their mistake counts, for a user or across everyone"""
+        if user is not None:
+            counts = WordMistakeCount.objects.filter(user=user)
+        else:
+            counts = GlobalWordMistakeCount.objects.all()
+
+        return dict(
+            counts.filter(word__in=words).values_list('word', 'mistakes')
+        )
+
+    @staticmethod
+    def record_word_occurrences(attempt):
+        """Index every word of an attempt's expected text"""
+        AnalyticsService.record_word_occurrences_many([attempt])
+
+    @staticmethod
+    def record_word_occurrences_many(attempts):
+        """Index every word of several attempts with one bulk insert"""
+        rows = []
+        for attempt in attempts:
+            rows.extend(_word_occurrences(attempt))
+        WordOccurrence.objects.bulk_create(rows, batch_size=1000)
+
+    @staticmethod
+    def backfill_word_occurrences(batch_size=500):
+        """
+        Index attempts saved before word occurrences existed. Walks attempts
+        by primary key so it can be interrupted and re-run safely.
+        """
+        attempts = PronunciationAttempt.objects.filter(
+            word_occurrences__isnull=True
+        ).order_by('id').only(
+            'id', 'user_id', 'expected', 'mispronounced', 'created_at'
+        )
+
+        indexed = 0
+        last_id = 0
+        while True:
+            batch = list(attempts.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                return indexed
+
+            AnalyticsService.record_word_occurrences_many(batch)
+
+            indexed += len(batch)
+            last_id = batch[-1].id
+
+    @staticmethod
+    def get_word_occurrences(user, word, limit=10):
+        """
+        The user's most recent attempts containing a word, one entry per
+        attempt: ``was_correct`` only when every occurrence was read right
+        """
+        rows = WordOccurrence.objects.filter(
+            user=user,
+            word=normalize_text(word)
+        ).order_by().values('attempt_id').annotate(
+            date=Max('created_at'),
+            score=Max('attempt__score'),
+            context=Substr(Max('attempt__expected'), 1, 100),
+            occurrences=Count('id'),
+            correct_occurrences=Count('id', filter=Q(was_correct=True)),
+        ).order_by('-date', '-attempt_id')[:limit]
+
+        return [
+            dict(row, was_correct=row['correct_occurrences'] == row['occurrences'])
+            for row in rows
+        ]
+
+    @staticmethod
+    def update_daily_analytics(user, attempt=None):
+        """
+        Update daily analytics for a user.
+
+        When the attempt that triggered the update is given (and incremental
+        mode is enabled) only its delta is applied; otherwise the whole day
+        is recomputed from raw attempts.
+        """
+        if attempt is not None and getattr(
+            settings, 'DAILY_ANALYTICS_INCREMENTAL', True
+        ):
+            return AnalyticsService.apply_attempt_to_daily_analytics(attempt)
+
+        return AnalyticsService.rebuild_daily_analytics(user)
+
+    @staticmethod
+    def apply_attempt_to_daily_analytics(attempt):
+        """Fold a single attempt into the user's UserAnalytics row for its day"""
+        rows = AnalyticsService.apply_attempts_to_daily_analytics([attempt])
+        return rows[0] if rows else None
+
+    @staticmethod
+    def apply_attempts_to_daily_analytics(attempts):
+        """
+        Fold attempts into their users' UserAnalytics rows, one locked update
+        per (user, day) regardless of how many attempts it covers.
+        """
+        deltas = {}
+        for attempt in attempts:
+            if not attempt.user_id:
                 continue
-            
-            is_correct = word not in mispronounced_words
-            
-            # Get or create WordAnalytics record
-            try:
-                word_analytics, created = WordAnalytics.objects.get_or_create(
-                    user=attempt.user,
-                    word=word,
-                    lesson=attempt.lesson,
-                    defaults={
-                        'total_attempts': 1,
-                        'correct_attempts': 1 if is_correct else 0,
-                        'last_attempt_at': attempt.created_at or timezone.now()
-                    }
+
+            day = (attempt.created_at or timezone.now()).date()
+            delta = deltas.setdefault((attempt.user_id, day), {
+                'attempts': 0,
+                'score_total': 0,
+                'scored': 0,
+                'practice_time': 0,
+                'words': [],
+            })
+
+            delta['attempts'] += 1
+            if attempt.score is not None:
+                delta['score_total'] += attempt.score
+                delta['scored'] += 1
+            # Approximate practice time from the number of words read
+            delta['practice_time'] += (
+                len(attempt.spoken.split()) * 5 if attempt.spoken else 0
+            )
+            delta['words'].extend(_iter_mispronounced(attempt.mispronounced))
+
+        updated = []
+        for (user_id, day), delta in deltas.items():
+            with transaction.atomic():
+                analytics, created = UserAnalytics.objects.select_for_update().get_or_create(
+                    user_id=user_id,
+                    date=day,
                 )
-                
-                if not created:
-                    # Update existing record
-                    word_analytics.total_attempts += 1
-                    if is_correct:
-                        word_analytics.correct_attempts += 1
-                    word_analytics.last_attempt_at = attempt.created_at or timezone.now()
-                    word_analytics.save()
-                    
-            except Exception as e:
-                print(f"Error saving word analytics for '{word}': {e}")
-                continue
-    
+
+                # Running mean over scored attempts, as rebuilt from raw
+                # attempts; unscored ones leave it untouched
+                if delta['scored']:
+                    analytics.avg_score = (
+                        analytics.avg_score * analytics.scored_attempts
+                        + delta['score_total']
+                    ) / (analytics.scored_attempts + delta['scored'])
+                analytics.scored_attempts += delta['scored']
+                analytics.total_attempts += delta['attempts']
+                analytics.total_practice_time += delta['practice_time']
+
+                words_practiced = list(analytics.words_practiced or [])
+                for word in delta['words']:
+                    if len(words_practiced) >= DAILY_WORDS_LIMIT:
+                        break
+                    if word not in words_practiced:
+                        words_practiced.append(word)
+                analytics.words_practiced = words_practiced
+
+                # Bounded by the number of lessons, not of attempts
+                analytics.lessons_completed = LessonProgress.objects.filter(
+                    user_id=user_id,
+                    is_completed=True,
+                    updated_at__date=day
+                ).count()
+
+                analytics.save(update_fields=[
+                    'total_attempts',
+                    'scored_attempts',
+                    'avg_score',
+                    'lessons_completed',
+                    'total_practice_time',
+                    'words_practiced',
+                ])
+
+            updated.append(analytics)
+
+        return updated
+
     @staticmethod
-    def update_daily_analytics(user):
-        """Update daily analytics for a user"""
-        today = timezone.now().date()
-        
-        # Get today's attempts
-        today_attempts = PronunciationAttempt.objects.filter(
+    def rebuild_daily_analytics(user, day=None):
+        """Recompute a user's UserAnalytics row for a day from raw attempts"""
+        day = day or timezone.now().date()
+
+        day_attempts = PronunciationAttempt.objects.filter(
             user=user,
-            created_at__date=today
+            created_at__date=day
         )
-        
-        # Calculate stats
-        total_attempts = today_attempts.count()
-        avg_score = today_attempts.aggregate(avg=Avg('score'))['avg'] or 0
-        
-        # Get completed lessons today
+
+        total_attempts = 0
+        score_total = 0
+        scored_attempts = 0
+        total_time = 0
+        words_practiced = []
+
+        # Single pass over the day's attempts
+        for score, spoken, mispronounced in day_attempts.values_list(
+            'score', 'spoken', 'mispronounced'
+        ):
+            total_attempts += 1
+            if score is not None:
+                score_total += score
+                scored_attempts += 1
+
+            # Approximate practice time from the number of words read
+            total_time += len(spoken.split()) * 5 if spoken else 0
+
+            for word in _iter_mispronounced(mispronounced):
+                if len(words_practiced) < DAILY_WORDS_LIMIT and word not in words_practiced:
+                    words_practiced.append(word)
+
+        avg_score = score_total / scored_attempts if scored_attempts else 0
+
+        # Get lessons completed that day
         completed_today = LessonProgress.objects.filter(
             user=user,
             is_completed=True,
-            updated_at__date=today
+            updated_at__date=day
         ).count()
-        
-        # Calculate total practice time (approximate from attempts)
-        total_time = 0
-        for attempt in today_attempts:
-            word_count = len(attempt.spoken.split()) if attempt.spoken else 0
-            total_time += word_count * 5
-        
-        # Get words practiced today (from mispronounced words)
-        words_practiced = set()
-        for attempt in today_attempts:
-            for item in attempt.mispronounced or []:
-                if isinstance(item, dict):
-                    word = item.get('word', '')
-                elif isinstance(item, str):
-                    word = item
-                else:
-                    continue
-                if word:
-                    words_practiced.add(word)
-        
-        # Use get_or_create to avoid F() expression issues
-        analytics, created = UserAnalytics.objects.get_or_create(
+
+        analytics, created = UserAnalytics.objects.update_or_create(
             user=user,
-            date=today,
+            date=day,
             defaults={
                 'total_attempts': total_attempts,
-                'avg_score': round(avg_score, 1),
+                'scored_attempts': scored_attempts,
+                'avg_score': avg_score,
                 'lessons_completed': completed_today,
                 'total_practice_time': total_time,
-                'words_practiced': list(words_practiced)[:50]
+                'words_practiced': words_practiced,
             }
         )
-        
-        if not created:
-            # Update existing record
-            analytics.total_attempts = total_attempts
-            analytics.avg_score = round(avg_score, 1)
-            analytics.lessons_completed = completed_today
-            analytics.total_practice_time = total_time
-            analytics.words_practiced = list(words_practiced)[:50]
-            analytics.save()
-        
+
+        invalidate_user(user.pk)
         return analytics
     
     @staticmethod
+    @cached_analytics()
     def get_user_weak_words(user, limit=10):
         """Get user's weakest words"""
-        words = WordAnalytics.objects.filter(
-            user=user,
-            total_attempts__gte=3  # Minimum attempts to consider
-        )
-        
-        # Calculate success rate and filter words that need practice
-        weak_words = []
-        for word in words:
-            success_rate = word.success_rate()
-            if success_rate < 80:  # Words with less than 80% success rate
-                weak_words.append({
-                    'word': word.word,
-                    'total_attempts': word.total_attempts,
-                    'correct_attempts': word.correct_attempts,
-                    'success_rate': success_rate,
-                    'last_attempt_at': word.last_attempt_at
-                })
-        
-        # Sort by success rate (lowest first)
-        weak_words.sort(key=lambda x: x['success_rate'])
-        
-        return weak_words[:limit]
+        # Words with less than 80% success rate, ranked in the database
+        return [_word_summary(word) for word in _weak_words(user)[:limit]]
     
     @staticmethod
+    @cached_analytics()
     def get_user_strengths(user, limit=10):
         """Get user's strongest words"""
-        words = WordAnalytics.objects.filter(
-            user=user,
-            total_attempts__gte=2  # Minimum attempts to consider
-        )
-        
-        strengths = []
-        for word in words:
-            success_rate = word.success_rate()
-            if success_rate >= 80:  # Words with 80% or higher success rate
-                strengths.append({
-                    'word': word.word,
-                    'total_attempts': word.total_attempts,
-                    'correct_attempts': word.correct_attempts,
-                    'success_rate': success_rate,
-                    'last_attempt_at': word.last_attempt_at
-                })
-        
-        # Sort by success rate (highest first)
-        strengths.sort(key=lambda x: x['success_rate'], reverse=True)
-        
-        return strengths[:limit]
+        # Words with 80% or higher success rate, ranked in the database
+        return [_word_summary(word) for word in _strong_words(user)[:limit]]
     
     @staticmethod
+    @cached_analytics()
     def get_weekly_progress(user):
         """Get weekly progress data for charts"""
         last_7_days = timezone.now() - timedelta(days=7)
@@ -229,98 +714,202 @@ class AnalyticsService:
         }
     
     @staticmethod
+    def compute_global_word_stats(min_attempts=5):
+        """
+        Aggregate WordAnalytics per word across all users and lessons in a
+        single grouped query.
+        """
+        rows = WordAnalytics.objects.order_by().values('word').annotate(
+            total=Sum('total_attempts'),
+            correct=Sum('correct_attempts'),
+            unique_users=Count('user', distinct=True),
+        ).filter(
+            total__gte=min_attempts  # Minimum attempts to consider
+        )
+
+        stats = []
+        for row in rows:
+            success_rate = round((row['correct'] / row['total']) * 100, 1)
+            stats.append({
+                'word': row['word'],
+                'total_attempts': row['total'],
+                'correct_attempts': row['correct'],
+                'success_rate': success_rate,
+                'failure_rate': round(100 - success_rate, 1),
+                'unique_users': row['unique_users'],
+            })
+        return stats
+
+    @staticmethod
+    def refresh_global_word_stats():
+        """Rebuild the GlobalWordStat cache table from live word analytics"""
+        now = timezone.now()
+        stats = [
+            GlobalWordStat(refreshed_at=now, **row)
+            for row in AnalyticsService.compute_global_word_stats()
+        ]
+
+        with transaction.atomic():
+            GlobalWordStat.objects.all().delete()
+            GlobalWordStat.objects.bulk_create(stats, batch_size=1000)
+
+        invalidate_global()
+        return len(stats)
+
+    @staticmethod
+    @cached_analytics(per_user=False)
     def get_global_weak_words(limit=20):
         """Get most commonly mispronounced words across all users"""
-        words = WordAnalytics.objects.filter(
-            total_attempts__gte=5
-        )
-        
-        global_weak = []
-        for word in words:
-            failure_rate = 100 - word.success_rate()
-            if failure_rate > 30:  # Only include words with >30% failure rate
-                global_weak.append({
-                    'word': word.word,
-                    'total_attempts': word.total_attempts,
-                    'correct_attempts': word.correct_attempts,
-                    'success_rate': word.success_rate(),
-                    'failure_rate': round(failure_rate, 1),
-                    'unique_users': WordAnalytics.objects.filter(
-                        word=word.word
-                    ).values('user').distinct().count()
-                })
-        
-        # Sort by failure rate (highest first)
-        global_weak.sort(key=lambda x: x['failure_rate'], reverse=True)
-        
+        cached = GlobalWordStat.objects.filter(
+            failure_rate__gt=30  # Only include words with >30% failure rate
+        ).order_by('-failure_rate', 'word')
+
+        if GlobalWordStat.objects.exists():
+            return list(cached.values(
+                'word',
+                'total_attempts',
+                'correct_attempts',
+                'success_rate',
+                'failure_rate',
+                'unique_users',
+            )[:limit])
+
+        # Cache not built yet: fall back to the live grouped aggregate
+        global_weak = [
+            row for row in AnalyticsService.compute_global_word_stats()
+            if row['failure_rate'] > 30
+        ]
+        global_weak.sort(key=lambda x: (-x['failure_rate'], x['word']))
+
         return global_weak[:limit]
+
+    @staticmethod
+    def get_global_word_stats_refreshed_at():
+        """When the GlobalWordStat cache was last rebuilt (None if never)"""
+        return GlobalWordStat.objects.aggregate(
+            refreshed=Max('refreshed_at')
+        )['refreshed']
     
     @staticmethod
+    @cached_analytics()
     def get_user_overall_stats(user):
         """Get overall statistics for a user"""
-        # Total attempts
-        total_attempts = PronunciationAttempt.objects.filter(user=user).count()
-        
-        # Average score
-        avg_score = PronunciationAttempt.objects.filter(
-            user=user,
-            score__isnull=False
-        ).aggregate(avg=Avg('score'))['avg'] or 0
-        
-        # Completed lessons
-        completed_lessons = LessonProgress.objects.filter(
-            user=user,
-            is_completed=True
-        ).count()
-        
-        # Total lessons
-        total_lessons = ReadingLesson.objects.count()
-        
-        # Words mastered (success rate >= 80% with at least 3 attempts)
-        mastered_words = WordAnalytics.objects.filter(
-            user=user,
-            total_attempts__gte=3
-        ).count()
-        
-        # Words needing practice (success rate < 60% with at least 2 attempts)
-        words_to_practice = WordAnalytics.objects.filter(
-            user=user,
-            total_attempts__gte=2
-        ).count()
-        
-        # Calculate actual practice words count based on success rate
-        practice_words = 0
-        for word in WordAnalytics.objects.filter(user=user, total_attempts__gte=2):
-            if word.success_rate() < 60:
-                practice_words += 1
-        
-        return {
-            'total_attempts': total_attempts,
-            'average_score': round(avg_score, 1),
-            'completed_lessons': completed_lessons,
-            'total_lessons': total_lessons,
-            'mastered_words': mastered_words,
-            'words_to_practice': practice_words,
-            'completion_rate': round((completed_lessons / total_lessons * 100), 1) if total_lessons > 0 else 0
-        }
-    
+        return _overall_stats(user)
+
     @staticmethod
+    @cached_analytics()
     def get_difficult_lessons(user, limit=10):
         """Get lessons where user struggles most"""
-        progress_records = LessonProgress.objects.filter(
-            user=user,
-            total_attempts__gte=2
-        ).select_related('lesson').order_by('best_score')
-        
-        difficult = []
-        for progress in progress_records:
-            if progress.best_score and progress.best_score < 80:
-                difficult.append({
-                    'lesson_id': progress.lesson.id,
-                    'lesson_title': progress.lesson.title,
-                    'best_score': round(progress.best_score, 1),
-                    'total_attempts': progress.total_attempts,
-                    'is_completed': progress.is_completed
-                })
-        
-        return difficult[:limit]
\ No newline at end of file
+        return [
+            _difficult_lesson_summary(progress)
+            for progress in _difficult_lessons(user)[:limit]
+        ]
+
+    @staticmethod
+    @cached_analytics()
+    def get_dashboard_snapshot(user, limit=5, recent=10):
+        """
+        Everything the analytics dashboard shows, in a fixed number of
+        queries whatever the user's history: the overall stats, the most
+        recent attempts (which also give the trend), and the top ``limit``
+        weak words, strengths and difficult lessons, each ranked and cut
+        in the database.
+        """
+        stats = _overall_stats(user)
+
+        recent_attempts = list(
+            PronunciationAttempt.objects.filter(user=user).values(
+                'id', 'score', 'feedback', 'created_at', 'lesson__title'
+            )[:recent]
+        )
+
+        scores = [a['score'] for a in recent_attempts if a['score'] is not None]
+        if len(scores) < TREND_ATTEMPTS and len(recent_attempts) < stats['total_attempts']:
+            # Too few scored attempts among the recent ones; look further back
+            scores = list(
+                PronunciationAttempt.objects.filter(
+                    user=user,
+                    score__isnull=False
+                ).values_list('score', flat=True)[:TREND_ATTEMPTS]
+            )
+
+        return {
+            'stats': stats,
+            'trend': _trend(scores[:TREND_ATTEMPTS]),
+            'recent_attempts': recent_attempts,
+            'weak_words': [_word_summary(w) for w in _weak_words(user)[:limit]],
+            'strengths': [_word_summary(w) for w in _strong_words(user)[:limit]],
+            'difficult_lessons': [
+                _difficult_lesson_summary(progress)
+                for progress in _difficult_lessons(user)[:limit]
+            ],
+        }
+
+    @staticmethod
+    def compute_lesson_difficulty():
+        """Average score and attempt count per lesson in one grouped query"""
+        return PronunciationAttempt.objects.filter(
+            lesson__isnull=False
+        ).order_by().values(
+            'lesson_id',
+            'lesson__title',
+        ).annotate(
+            average_score=Avg(Coalesce('score', Value(0.0))),
+            attempts=Count('id'),
+        )
+
+    @staticmethod
+    def refresh_lesson_difficulty():
+        """Rebuild the LessonDifficulty cache table from live attempts"""
+        now = timezone.now()
+        rows = [
+            LessonDifficulty(
+                lesson_id=row['lesson_id'],
+                average_score=row['average_score'],
+                attempts=row['attempts'],
+                refreshed_at=now,
+            )
+            for row in AnalyticsService.compute_lesson_difficulty()
+        ]
+
+        with transaction.atomic():
+            LessonDifficulty.objects.all().delete()
+            LessonDifficulty.objects.bulk_create(rows, batch_size=1000)
+
+        invalidate_global()
+        return len(rows)
+
+    @staticmethod
+    @cached_analytics(per_user=False)
+    def get_global_difficult_lessons(limit=10):
+        """Get lessons with the lowest average score across all students"""
+        if LessonDifficulty.objects.exists():
+            rows = LessonDifficulty.objects.order_by(
+                'average_score', 'lesson_id'
+            ).values(
+                'lesson_id',
+                'average_score',
+                'attempts',
+                lesson_title=F('lesson__title'),
+            )[:limit]
+        else:
+            # Cache not built yet: fall back to the live grouped aggregate
+            rows = AnalyticsService.compute_lesson_difficulty().order_by(
+                'average_score', 'lesson_id'
+            ).values(
+                'lesson_id',
+                'average_score',
+                'attempts',
+                lesson_title=F('lesson__title'),
+            )[:limit]
+
+        return [
+            {
+                "lesson_id": row['lesson_id'],
+                "lesson_title": row['lesson_title'],
+                "average_score": round(row['average_score'], 2),
+                "attempts": row['attempts'],
+                "difficulty_level": _difficulty_level(row['average_score'])
+            }
+            for row in rows
+        ]
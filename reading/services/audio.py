@@ -0,0 +1,181 @@
+# reading/services/audio.py
+"""
+Decoding and preprocessing of uploaded recordings.
+
+Uploads are decoded straight from Django's UploadedFile into PCM frames
+(speech_recognition AudioData). Small uploads never touch the disk: they
+are read from the in-memory buffer. Uploads above FILE_UPLOAD_MAX_MEMORY_SIZE
+are already spooled by Django to a uniquely named temporary file, which is
+read in place rather than copied.
+
+Before transcription, preprocess() cuts leading and trailing silence and
+resamples to the backend's native rate, so less audio reaches the engine.
+Both WAV decoding and preprocessing work on whole NumPy arrays rather than
+sample by sample.
+"""
+
+import wave
+
+import numpy as np
+import speech_recognition as sr
+
+
+# Analysis frame for silence detection
+FRAME_SECONDS = 0.02
+
+# Kept either side of the speech so word onsets and endings survive
+PAD_SECONDS = 0.2
+
+# A frame is silent below this RMS (16-bit full scale is 32768) or more
+# than SILENCE_RELATIVE_DB below the loudest frame of the recording
+SILENCE_FLOOR = 200
+SILENCE_RELATIVE_DB = 35
+
+# NumPy dtypes of little-endian WAV samples by sample width; 8-bit WAV is
+# unsigned. 24-bit samples go through speech_recognition instead.
+WAV_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+
+class InvalidAudio(ValueError):
+    """The upload is not audio speech_recognition can decode."""
+
+
+def upload_source(uploaded_file):
+    """
+    What to hand to the decoder for an upload: the spooled temporary file's
+    path for large uploads, otherwise the in-memory file object itself.
+    """
+    if hasattr(uploaded_file, "temporary_file_path"):
+        return uploaded_file.temporary_file_path()
+
+    uploaded_file.seek(0)
+    return uploaded_file
+
+
+def load_audio(uploaded_file):
+    """Decode a WAV, AIFF or FLAC upload into mono AudioData."""
+    source = upload_source(uploaded_file)
+
+    try:
+        return _load_wav(source)
+    except (wave.Error, EOFError, KeyError):
+        # Not a plain PCM WAV; let speech_recognition try AIFF and FLAC
+        if not isinstance(source, str):
+            source.seek(0)
+
+    try:
+        with sr.AudioFile(source) as audio_file:
+            return sr.Recognizer().record(audio_file)
+    except (ValueError, EOFError) as e:
+        raise InvalidAudio(str(e))
+
+
+def _load_wav(source):
+    with wave.open(source, "rb") as wav:
+        width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        dtype = WAV_DTYPES[width]
+        frames = wav.readframes(wav.getnframes())
+
+    samples = np.frombuffer(frames, dtype=dtype)
+    if channels > 1:
+        # Downmix by averaging channels, summed in a wider type
+        mixed = samples[0::channels].astype(np.int64 if width == 4 else np.int32)
+        for channel in range(1, channels):
+            mixed += samples[channel::channels]
+        samples = (mixed // channels).astype(dtype)
+    return sr.AudioData(samples.tobytes(), rate, width)
+
+
+def to_samples(audio):
+    """AudioData as float32 samples scaled to the 16-bit range."""
+    width = audio.sample_width
+    if width not in WAV_DTYPES:
+        audio = sr.AudioData(
+            audio.get_raw_data(convert_width=2), audio.sample_rate, 2
+        )
+        width = 2
+
+    samples = np.frombuffer(audio.frame_data, dtype=WAV_DTYPES[width])
+    samples = samples.astype(np.float32)
+    if width == 1:
+        return (samples - 128) * 256
+    return samples / (1 << (8 * width - 16))
+
+
+def from_samples(samples, rate):
+    """16-bit AudioData from float samples in the 16-bit range."""
+    pcm = np.clip(np.round(samples), -32768, 32767).astype(np.int16)
+    return sr.AudioData(pcm.tobytes(), rate, 2)
+
+
+def trim_silence(samples, rate):
+    """
+    Drop leading and trailing frames whose energy is below the silence
+    threshold, keeping PAD_SECONDS of context. Returns an empty array when
+    the whole recording is silent.
+    """
+    frame = max(1, int(rate * FRAME_SECONDS))
+    count = len(samples) // frame
+    if not count:
+        return samples[:0]
+
+    frames = samples[: count * frame].reshape(count, frame)
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame)
+
+    threshold = max(
+        SILENCE_FLOOR, rms.max() * 10 ** (-SILENCE_RELATIVE_DB / 20)
+    )
+    loud = np.flatnonzero(rms >= threshold)
+    if not len(loud):
+        return samples[:0]
+
+    pad = int(rate * PAD_SECONDS)
+    start = max(0, loud[0] * frame - pad)
+    end = min(len(samples), (loud[-1] + 1) * frame + pad)
+    return samples[start:end]
+
+
+def resample(samples, rate, target_rate):
+    """
+    Resample by linear interpolation. When downsampling, samples are first
+    averaged over one period of the target rate, which keeps content above
+    the new Nyquist frequency from folding back into the speech band.
+    Integer ratios (48 kHz to 16 kHz) reduce to averaging each group.
+    """
+    if rate == target_rate or not len(samples):
+        return samples
+
+    ratio = rate / target_rate
+    if ratio > 1 and rate % target_rate == 0:
+        step = rate // target_rate
+        count = len(samples) // step
+        averaged = samples[0:count * step:step].copy()
+        for offset in range(1, step):
+            averaged += samples[offset:count * step:step]
+        return averaged / step
+
+    if ratio > 1:
+        width = int(np.ceil(ratio))
+        samples = np.convolve(
+            samples, np.full(width, 1 / width, dtype=np.float32), mode="valid"
+        )
+
+    # Interpolate between the two source samples around each output sample
+    count = int(len(samples) / ratio)
+    positions = np.arange(count) * ratio
+    left = np.minimum(positions.astype(np.intp), len(samples) - 2)
+    fraction = (positions - left).astype(np.float32)
+    return samples[left] + (samples[left + 1] - samples[left]) * fraction
+
+
+def preprocess(audio, sample_rate=None):
+    """
+    Trim silence from ``audio`` and resample it to ``sample_rate`` (kept as
+    is when None). Returns 16-bit AudioData, with no frames when the
+    recording held nothing above the silence threshold.
+    """
+    samples = trim_silence(to_samples(audio), audio.sample_rate)
+    rate = sample_rate or audio.sample_rate
+    return from_samples(resample(samples, audio.sample_rate, rate), rate)
@@ -0,0 +1,156 @@
+# reading/services/lesson_cache.py
+"""
+Precompiled lesson text for the scoring path.
+
+Feedback requests nearly always score against an unchanged
+ReadingLesson.content, so the expected side is normalized, tokenized and
+interned once per lesson and kept in a per-process LRU cache. Entries are
+keyed by lesson id and dropped as soon as the lesson's ``updated_at`` moves,
+so every worker picks up edits without any cross-process signalling.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+
+from django.conf import settings
+
+from .pronunciation_engine import normalize_text
+
+
+# Token ids shared by every cached lesson. Only lesson content adds entries,
+# so the table grows with the catalogue, never with what students send.
+_VOCAB = {}
+_VOCAB_LOCK = threading.Lock()
+
+# Id for spoken tokens that appear in no lesson; it never equals a lesson id
+UNKNOWN_TOKEN = -1
+
+SENTENCE_END = re.compile(r"[.!?][\"')\]]*$")
+
+
+class CompiledLesson:
+    """
+    Lesson text prepared for scoring: normalized tokens, their interned ids
+    and sentence boundaries as (start, end) token ranges.
+
+    Ids come from ``vocab``; one-off texts get a private table by default.
+    """
+
+    __slots__ = (
+        'lesson_id',
+        'updated_at',
+        'text',
+        'tokens',
+        'ids',
+        'vocab',
+        'sentence_bounds',
+    )
+
+    def __init__(self, text, lesson_id=None, updated_at=None, vocab=None):
+        tokens = []
+        sentence_bounds = []
+        start = 0
+
+        # Normalizing whitespace-separated chunks one at a time yields the
+        # same tokens as normalize_text() on the whole text, and lets the
+        # sentence ends be read off the raw punctuation on the way.
+        for chunk in text.split():
+            token = normalize_text(chunk)
+            if token:
+                tokens.append(token)
+            if SENTENCE_END.search(chunk) and len(tokens) > start:
+                sentence_bounds.append((start, len(tokens)))
+                start = len(tokens)
+        if len(tokens) > start:
+            sentence_bounds.append((start, len(tokens)))
+
+        self.lesson_id = lesson_id
+        self.updated_at = updated_at
+        self.text = text
+        self.tokens = tokens
+        self.vocab = {} if vocab is None else vocab
+        with _VOCAB_LOCK if self.vocab is _VOCAB else nullcontext():
+            self.ids = [
+                self.vocab.setdefault(token, len(self.vocab))
+                for token in tokens
+            ]
+        self.sentence_bounds = sentence_bounds
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def encode(self, tokens):
+        """Map spoken tokens onto the lesson vocabulary."""
+        get = self.vocab.get
+        return [get(token, UNKNOWN_TOKEN) for token in tokens]
+
+    def matches(self, text):
+        """Whether ``text`` is the text this lesson was compiled from."""
+        return text == self.text or text.strip() == self.text.strip()
+
+
+class LessonCache:
+    """Thread-safe LRU of CompiledLesson keyed by lesson id"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, lesson):
+        """
+        Return the compiled form of ``lesson``, compiling it when it is
+        missing or older than the lesson's ``updated_at``.
+        """
+        with self._lock:
+            compiled = self._entries.get(lesson.pk)
+            if compiled is not None and compiled.updated_at == lesson.updated_at:
+                self._entries.move_to_end(lesson.pk)
+                return compiled
+
+        compiled = CompiledLesson(
+            lesson.content,
+            lesson_id=lesson.pk,
+            updated_at=lesson.updated_at,
+            vocab=_VOCAB,
+        )
+
+        with self._lock:
+            self._entries[lesson.pk] = compiled
+            self._entries.move_to_end(lesson.pk)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def evict(self, lesson_id):
+        with self._lock:
+            self._entries.pop(lesson_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+lesson_cache = LessonCache(getattr(settings, 'LESSON_CACHE_SIZE', 256))
+
+
+def get_compiled_lesson(lesson):
+    """Cached CompiledLesson for a ReadingLesson."""
+    return lesson_cache.get(lesson)
+
+
+def compile_expected(expected, lesson=None):
+    """
+    Compiled form of the expected text for scoring: the cached lesson when
+    ``expected`` is that lesson's content, otherwise a one-off compilation.
+    """
+    if lesson is not None:
+        compiled = get_compiled_lesson(lesson)
+        if compiled.matches(expected):
+            return compiled
+    return CompiledLesson(expected)
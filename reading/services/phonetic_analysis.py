@@ -8,8 +8,21 @@ TH → T
 R → L
 V → W
 B ↔ P
+plus digraph and vowel confusions and dropped final consonants.
+
+A rule lists the sounds it expects in the target word and the substitutions
+heard instead. A substitution counts when the heard word contains it but not
+the expected sound. Rules may be tied to a position ("initial" or "final"),
+in which case the rest of the word must match, so "" as a substitution
+describes a dropped sound (walked → walk).
+
+PHONETIC_PATTERNS is compiled once into a PhoneticMatcher that indexes rules
+by sound. Each expected word is resolved once into the few rules that can
+apply to it, so the cost per word does not grow with the size of the rule
+set.
 """
 
+
 PHONETIC_PATTERNS = [
     {
         "name": "TH sound",
@@ -31,33 +44,178 @@ PHONETIC_PATTERNS = [
         "expected": ["b"],
         "common_substitutions": ["p"],
     },
+    {
+        "name": "CH/SH confusion",
+        "expected": ["ch"],
+        "common_substitutions": ["sh"],
+    },
+    {
+        "name": "SH/S confusion",
+        "expected": ["sh"],
+        "common_substitutions": ["s"],
+    },
+    {
+        "name": "WH/W sound",
+        "expected": ["wh"],
+        "common_substitutions": ["w"],
+    },
+    {
+        "name": "PH/F sound",
+        "expected": ["ph"],
+        "common_substitutions": ["p"],
+    },
+    {
+        "name": "Long/short vowel",
+        "expected": ["ee", "ea"],
+        "common_substitutions": ["i"],
+    },
+    {
+        "name": "OO/U confusion",
+        "expected": ["oo"],
+        "common_substitutions": ["u"],
+    },
+    {
+        "name": "Final consonant drop",
+        "expected": ["d", "t", "s", "k", "p", "g"],
+        "common_substitutions": [""],
+        "position": "final",
+    },
+    {
+        "name": "Final -ed drop",
+        "expected": ["ed"],
+        "common_substitutions": [""],
+        "position": "final",
+    },
+    {
+        "name": "Initial H drop",
+        "expected": ["h"],
+        "common_substitutions": [""],
+        "position": "initial",
+    },
 ]
 
 
+class PhoneticMatcher:
+    """PHONETIC_PATTERNS compiled for matching many words at once"""
+
+    # Expected words whose match plans are kept before the cache is reset
+    PLAN_CACHE_SIZE = 20000
+
+    def __init__(self, patterns):
+        # sound -> [(rule name, substitutions)], one table per position
+        self.anywhere = {}
+        self.initial = {}
+        self.final = {}
+
+        # Rule name -> definition order, for stable feature listings
+        self.order = {}
+
+        for rule in patterns:
+            self.order.setdefault(rule["name"], len(self.order))
+            position = rule.get("position")
+            table = {
+                "initial": self.initial,
+                "final": self.final,
+            }.get(position, self.anywhere)
+
+            for sound in rule["expected"]:
+                rule_subs = tuple(
+                    sub for sub in rule["common_substitutions"]
+                    if sub != sound and (sub or position)
+                )
+                table.setdefault(sound, []).append((rule["name"], rule_subs))
+
+        self.sound_lengths = sorted({len(s) for s in self.anywhere})
+        self.initial_lengths = sorted({len(s) for s in self.initial})
+        self.final_lengths = sorted({len(s) for s in self.final})
+        self._plans = {}
+
+    def _plan(self, word):
+        """
+        The rules that apply to an expected word, resolved once per word:
+        (anywhere checks, heard word -> positional rule names, rule names).
+        """
+        plan = self._plans.get(word)
+        if plan is not None:
+            return plan
+
+        anywhere = []
+        for length in self.sound_lengths:
+            pieces = {word[i:i + length] for i in range(len(word) - length + 1)}
+            for sound in sorted(pieces & self.anywhere.keys()):
+                for name, rule_subs in self.anywhere[sound]:
+                    anywhere.append((name, sound, rule_subs))
+
+        positional = {}
+        names = [name for name, _, _ in anywhere]
+        for lengths, table, build in (
+            (self.initial_lengths, self.initial,
+             lambda sub, length: sub + word[length:]),
+            (self.final_lengths, self.final,
+             lambda sub, length: word[:-length] + sub),
+        ):
+            for length in lengths:
+                if len(word) < length:
+                    continue
+                sound = word[:length] if table is self.initial else word[-length:]
+                for name, rule_subs in table.get(sound, ()):
+                    names.append(name)
+                    for sub in rule_subs:
+                        positional.setdefault(build(sub, length), []).append(name)
+
+        plan = (
+            tuple(anywhere),
+            positional,
+            tuple(sorted(set(names), key=self.order.get)),
+        )
+        if len(self._plans) >= self.PLAN_CACHE_SIZE:
+            self._plans.clear()
+        self._plans[word] = plan
+        return plan
+
+    def features(self, word):
+        """Names of the rules ``word`` can trigger."""
+        return self._plan(word)[2]
+
+    def match(self, word, heard, counts):
+        """Add the rule hits for one expected/heard pair to ``counts``."""
+        anywhere, positional, _ = self._plan(word)
+
+        for name, sound, rule_subs in anywhere:
+            if sound in heard:
+                continue
+            hits = sum(1 for sub in rule_subs if sub in heard)
+            if hits:
+                counts[name] = counts.get(name, 0) + hits
+
+        for name in positional.get(heard, ()):
+            counts[name] = counts.get(name, 0) + 1
+
+
+PHONETIC_MATCHER = PhoneticMatcher(PHONETIC_PATTERNS)
+
+
 def detect_phonetic_errors(problem_words):
     """
     Analyze mispronounced words and detect phonetic patterns.
+    Correct and missing words are skipped, and a substitution is not
+    counted when the heard word still contains the expected sound
+    (thirty → thirdy is no TH error).
     """
 
     phonetic_errors = {}
 
     for entry in problem_words:
 
+        if entry.get("status") == "correct":
+            continue
+
         expected = entry.get("word", "")
         heard = entry.get("heard", "")
 
-        for rule in PHONETIC_PATTERNS:
-
-            for expected_sound in rule["expected"]:
-
-                if expected_sound in expected:
-
-                    for sub in rule["common_substitutions"]:
-
-                        if sub in heard and sub != expected_sound:
-
-                            name = rule["name"]
+        if not expected or not heard or heard == "[missing]":
+            continue
 
-                            phonetic_errors[name] = phonetic_errors.get(name, 0) + 1
+        PHONETIC_MATCHER.match(expected, heard, phonetic_errors)
 
-    return phonetic_errors
\ No newline at end of file
+    return phonetic_errors
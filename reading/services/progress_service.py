@@ -0,0 +1,232 @@
+# reading/services/progress_service.py
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from reading.models import LessonProgress, PronunciationAttempt, UserSummary
+
+
+# Best score at which a lesson counts as completed
+COMPLETION_SCORE = 80
+
+# Columns handed back to callers after every progress update
+PROGRESS_FIELDS = (
+    'total_attempts',
+    'best_score',
+    'is_completed',
+    'first_attempt_at',
+    'last_attempt_at',
+)
+
+
+# UserSummary columns recomputed from the user's LessonProgress rows
+SUMMARY_PROGRESS_TOTALS = {
+    'lesson_attempts': Sum('total_attempts'),
+    'completed_lessons': Count('id', filter=Q(is_completed=True)),
+    'best_scored_lessons': Count('best_score'),
+    'best_score_total': Sum('best_score'),
+}
+
+
+def _progress_totals(user_id):
+    """SUMMARY_PROGRESS_TOTALS as subqueries, for use in an UPDATE."""
+    rows = LessonProgress.objects.filter(user_id=user_id).order_by().values('user_id')
+    return {
+        name: Coalesce(
+            Subquery(rows.annotate(total=aggregate).values('total')),
+            Value(0),
+            output_field=UserSummary._meta.get_field(name),
+        )
+        for name, aggregate in SUMMARY_PROGRESS_TOTALS.items()
+    }
+
+
+def _attempt_totals(attempts):
+    """{user_id: (attempts, scored attempts, score total)} of new attempts."""
+    totals = {}
+    for attempt in attempts:
+        if not attempt.user_id:
+            continue
+        count, scored, score_total = totals.get(attempt.user_id, (0, 0, 0))
+        if attempt.score is not None:
+            scored += 1
+            score_total += attempt.score
+        totals[attempt.user_id] = (count + 1, scored, score_total)
+    return totals
+
+
+class ProgressService:
+    """The single write path for LessonProgress and UserSummary"""
+
+    @staticmethod
+    def record_attempt(attempt):
+        """
+        Apply a pronunciation attempt to the student's LessonProgress and
+        UserSummary and return the fresh progress values (None for an
+        attempt without a lesson).
+
+        The result is remembered on the attempt, so the post_save receiver
+        and the view that created the attempt share one update.
+        """
+        if hasattr(attempt, '_lesson_progress'):
+            return attempt._lesson_progress
+
+        if not attempt.user_id:
+            return None
+
+        with transaction.atomic():
+            progress = None
+            if attempt.lesson_id:
+                progress = ProgressService.apply(
+                    attempt.user_id,
+                    attempt.lesson_id,
+                    attempt.score,
+                )
+            ProgressService.update_summary(
+                attempt.user_id, *_attempt_totals([attempt])[attempt.user_id]
+            )
+
+        attempt._lesson_progress = progress
+        return progress
+
+    @staticmethod
+    def record_attempts(attempts):
+        """
+        Apply several attempts with one update per (user, lesson), returning
+        {(user_id, lesson_id): progress values}.
+        """
+        grouped = {}
+        for attempt in attempts:
+            if not attempt.user_id or not attempt.lesson_id:
+                continue
+            key = (attempt.user_id, attempt.lesson_id)
+            count, best = grouped.get(key, (0, None))
+            if attempt.score is not None and (best is None or attempt.score > best):
+                best = attempt.score
+            grouped[key] = (count + 1, best)
+
+        with transaction.atomic():
+            progress = {
+                (user_id, lesson_id): ProgressService.apply(
+                    user_id, lesson_id, best, attempts=count
+                )
+                for (user_id, lesson_id), (count, best) in grouped.items()
+            }
+            for user_id, totals in _attempt_totals(attempts).items():
+                ProgressService.update_summary(user_id, *totals)
+
+        return progress
+
+    @staticmethod
+    def apply(user_id, lesson_id, score, attempts=1, at=None):
+        """
+        Add ``attempts`` attempts with best score ``score`` to a lesson's
+        progress in one conditional UPDATE, creating the row when missing.
+        """
+        now = at or timezone.now()
+
+        values = {
+            'total_attempts': F('total_attempts') + attempts,
+            'first_attempt_at': Coalesce(F('first_attempt_at'), Value(now)),
+            'last_attempt_at': now,
+            'updated_at': now,
+        }
+        if score is not None:
+            values['best_score'] = Greatest(
+                Coalesce(F('best_score'), Value(score)),
+                Value(score),
+            )
+            if score >= COMPLETION_SCORE:
+                values['is_completed'] = True
+
+        rows = LessonProgress.objects.filter(user_id=user_id, lesson_id=lesson_id)
+
+        progress = ProgressService._update(rows, values)
+        if progress is not None:
+            return progress
+
+        try:
+            with transaction.atomic():
+                created = LessonProgress.objects.create(
+                    user_id=user_id,
+                    lesson_id=lesson_id,
+                    total_attempts=attempts,
+                    best_score=score,
+                    is_completed=score is not None and score >= COMPLETION_SCORE,
+                    first_attempt_at=now,
+                    last_attempt_at=now,
+                )
+        except IntegrityError:
+            # Another request created the row first; update it instead
+            return ProgressService._update(rows, values)
+
+        return {name: getattr(created, name) for name in PROGRESS_FIELDS}
+
+    @staticmethod
+    def update_summary(user_id, attempts, scored, score_total):
+        """
+        Add new attempts to the user's UserSummary in one UPDATE, which also
+        recomputes the LessonProgress totals from the just-updated rows.
+        Builds the row from scratch when the user has none yet.
+        """
+        now = timezone.now()
+        updated = UserSummary.objects.filter(user_id=user_id).update(
+            total_attempts=F('total_attempts') + attempts,
+            scored_attempts=F('scored_attempts') + scored,
+            score_total=F('score_total') + score_total,
+            last_activity_at=now,
+            updated_at=now,
+            **_progress_totals(user_id),
+        )
+        if not updated:
+            ProgressService.build_summary(user_id)
+
+    @staticmethod
+    def get_summary(user_id):
+        """The user's UserSummary, built on first use"""
+        summary = UserSummary.objects.filter(user_id=user_id).first()
+        if summary is None:
+            summary = ProgressService.build_summary(user_id)
+        return summary
+
+    @staticmethod
+    def build_summary(user_id):
+        """(Re)build a user's UserSummary from attempts and progress"""
+        attempts = PronunciationAttempt.objects.filter(
+            user_id=user_id
+        ).order_by().aggregate(
+            total_attempts=Count('id'),
+            scored_attempts=Count('score'),
+            score_total=Coalesce(Sum('score'), 0.0),
+            last_activity_at=Max('created_at'),
+        )
+        progress = LessonProgress.objects.filter(
+            user_id=user_id
+        ).order_by().aggregate(**SUMMARY_PROGRESS_TOTALS)
+        values = {
+            **attempts,
+            **{name: value or 0 for name, value in progress.items()},
+        }
+
+        try:
+            with transaction.atomic():
+                summary, _ = UserSummary.objects.update_or_create(
+                    user_id=user_id, defaults=values
+                )
+        except IntegrityError:
+            # Built concurrently by another request, from the same rows
+            summary = UserSummary.objects.get(user_id=user_id)
+        return summary
+
+    @staticmethod
+    def _update(rows, values):
+        """
+        Apply ``values`` to the progress row and return its PROGRESS_FIELDS
+        (None when there is no row yet). The read-back shares the update's
+        row lock, so it sees this update and no later one.
+        """
+        with transaction.atomic():
+            if not rows.update(**values):
+                return None
+            return rows.select_for_update().values(*PROGRESS_FIELDS).get()
@@ -1,6 +1,4 @@
 import re
-from difflib import SequenceMatcher
-from .phonetic_analysis import detect_phonetic_errors
 
 
 def normalize_text(text):
@@ -13,68 +11,17 @@ def normalize_text(text):
 def word_by_word_comparison(expected, spoken):
     """
     Compare expected text with spoken text word-by-word.
+    ``expected`` is either raw text or a precompiled lesson
+    (see services.lesson_cache).
     Returns list of word results and accuracy score.
-    """
-
-    expected_norm = normalize_text(expected)
-    spoken_norm = normalize_text(spoken)
-
-    expected_words = expected_norm.split()
-    spoken_words = spoken_norm.split()
-
-    problem_words = []
-    correct_count = 0
-    total_words = len(expected_words)
-
-    matcher = SequenceMatcher(None, expected_words, spoken_words)
-
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-
-        if tag == "equal":
-
-            correct_count += (i2 - i1)
-
-            for idx in range(i1, i2):
-                problem_words.append({
-                    "word": expected_words[idx],
-                    "heard": expected_words[idx],
-                    "position": idx,
-                    "status": "correct"
-                })
 
-        elif tag == "replace":
-
-            for idx in range(i1, i2):
-
-                heard_word = (
-                    spoken_words[j1 + (idx - i1)]
-                    if (j1 + (idx - i1)) < len(spoken_words)
-                    else "[missing]"
-                )
-
-                problem_words.append({
-                    "word": expected_words[idx],
-                    "heard": heard_word,
-                    "position": idx,
-                    "status": "mispronounced"
-                })
-
-        elif tag == "delete":
-
-            for idx in range(i1, i2):
-                problem_words.append({
-                    "word": expected_words[idx],
-                    "heard": "[missing]",
-                    "position": idx,
-                    "status": "missing"
-                })
-
-        elif tag == "insert":
-            pass
-
-    score = (correct_count / total_words) * 100 if total_words > 0 else 0
+    Kept for callers that want every word as a dict; scoring itself lives
+    in services.scoring.
+    """
+    from .scoring import ScoringService
 
-    return problem_words, round(score, 2)
+    result = ScoringService.score(expected, spoken)
+    return result.word_results(), result.score
 
 
 def generate_feedback(problem_words, score):
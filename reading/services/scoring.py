@@ -0,0 +1,283 @@
+# reading/services/scoring.py
+"""
+The single scoring path for pronunciation attempts.
+
+Every entry point (the JSON feedback API, batch replay and the recording
+view) scores through ScoringService.score(); streamed recordings report
+progress with ScoringService.score_partial() while they come in. The
+result keeps per-word outcomes in flat arrays that share the lesson's token
+list, and builds the JSON-facing dicts, phonetic counts and feedback text
+only when asked for.
+"""
+
+from array import array
+
+from .alignment import matching_blocks, opcodes_from_blocks
+from .lesson_cache import CompiledLesson, compile_expected
+from .phonetic_analysis import PHONETIC_MATCHER
+from .pronunciation_engine import generate_feedback, normalize_text
+
+
+CORRECT = 0
+MISPRONOUNCED = 1
+MISSING = 2
+
+STATUS_NAMES = ("correct", "mispronounced", "missing")
+
+# Heard index for expected words with no spoken counterpart
+NOT_HEARD = -1
+
+# Expected words aligned beyond the spoken length when scoring partially
+PARTIAL_WINDOW_SLACK = 16
+
+
+class ScoringResult:
+    """
+    Outcome of scoring one attempt.
+
+    ``statuses[i]`` and ``heard[i]`` describe expected token i: its status
+    code and the index of the spoken token it was matched with. ``offset``
+    is the lesson position of token 0 when only one sentence was scored.
+    """
+
+    __slots__ = (
+        'offset',
+        'tokens',
+        'spoken_tokens',
+        'statuses',
+        'heard',
+        'correct_count',
+        '_problem_words',
+        '_phonetic_errors',
+        '_feedback',
+    )
+
+    def __init__(self, tokens, spoken_tokens, offset=0):
+        self.offset = offset
+        self.tokens = tokens
+        self.spoken_tokens = spoken_tokens
+        self.statuses = array('B', bytes(len(tokens)))
+        self.heard = array('i', [NOT_HEARD]) * len(tokens)
+        self.correct_count = 0
+        self._problem_words = None
+        self._phonetic_errors = None
+        self._feedback = None
+
+    def prefix(self, length):
+        """The outcome for the first ``length`` expected words only."""
+        if length >= len(self.tokens):
+            return self
+        result = ScoringResult(
+            self.tokens[:length], self.spoken_tokens, self.offset
+        )
+        result.statuses = self.statuses[:length]
+        result.heard = self.heard[:length]
+        result.correct_count = result.statuses.count(CORRECT)
+        return result
+
+    @property
+    def word_count(self):
+        return len(self.tokens)
+
+    @property
+    def problem_count(self):
+        return self.word_count - self.correct_count
+
+    @property
+    def score(self):
+        if not self.tokens:
+            return 0
+        return round(self.correct_count / len(self.tokens) * 100, 2)
+
+    def heard_word(self, index):
+        j = self.heard[index]
+        return self.spoken_tokens[j] if j != NOT_HEARD else "[missing]"
+
+    def _entry(self, index):
+        return {
+            "word": self.tokens[index],
+            "heard": self.heard_word(index),
+            "position": self.offset + index,
+            "status": STATUS_NAMES[self.statuses[index]],
+        }
+
+    def _problem_indexes(self):
+        statuses = self.statuses
+        return (i for i in range(len(statuses)) if statuses[i] != CORRECT)
+
+    @property
+    def problem_words(self):
+        """Mispronounced and missing words as JSON-ready dicts."""
+        if self._problem_words is None:
+            self._problem_words = [
+                self._entry(i) for i in self._problem_indexes()
+            ]
+        return self._problem_words
+
+    def word_results(self):
+        """Every expected word, correct ones included, as dicts."""
+        return [self._entry(i) for i in range(len(self.tokens))]
+
+    @property
+    def phonetic_errors(self):
+        if self._phonetic_errors is None:
+            counts = {}
+            for i in self._problem_indexes():
+                j = self.heard[i]
+                if j != NOT_HEARD:
+                    PHONETIC_MATCHER.match(
+                        self.tokens[i], self.spoken_tokens[j], counts
+                    )
+            self._phonetic_errors = counts
+        return self._phonetic_errors
+
+    @property
+    def feedback(self):
+        if self._feedback is None:
+            self._feedback = generate_feedback(self.problem_words, self.score)
+        return self._feedback
+
+    def as_dict(self):
+        """The scoring fields of a feedback response."""
+        return {
+            "score": self.score,
+            "feedback": self.feedback,
+            "mispronounced": self.problem_words,
+            "phonetic_errors": self.phonetic_errors,
+            "word_count": self.word_count,
+            "problem_count": self.problem_count,
+        }
+
+
+class ScoringService:
+    """Score spoken text against expected text"""
+
+    @staticmethod
+    def score(expected, spoken, lesson=None):
+        """
+        Align ``spoken`` against ``expected`` and return a ScoringResult.
+
+        ``expected`` is raw text or a CompiledLesson. With ``lesson`` given,
+        raw text equal to the lesson's content uses its cached compiled form.
+        """
+        if not isinstance(expected, CompiledLesson):
+            expected = compile_expected(expected, lesson)
+
+        spoken_tokens = normalize_text(spoken).split()
+        return _score_tokens(
+            expected.tokens,
+            expected.ids,
+            spoken_tokens,
+            expected.encode(spoken_tokens),
+        )
+
+    @staticmethod
+    def score_partial(expected, spoken, lesson=None):
+        """
+        Score a reading that is still in progress.
+
+        Only the start of the text, a little longer than what has been
+        spoken, is aligned, so the cost follows the transcript rather than
+        the lesson. Words after the last one heard are not read yet rather
+        than missing: the returned result covers expected words up to and
+        including the last heard one.
+        """
+        if not isinstance(expected, CompiledLesson):
+            expected = compile_expected(expected, lesson)
+
+        spoken_tokens = normalize_text(spoken).split()
+        # Room for words the reader skipped
+        window = len(spoken_tokens) + max(
+            PARTIAL_WINDOW_SLACK, len(spoken_tokens) // 4
+        )
+
+        result = _score_tokens(
+            expected.tokens[:window],
+            expected.ids[:window],
+            spoken_tokens,
+            expected.encode(spoken_tokens),
+        )
+
+        heard = result.heard
+        position = len(heard)
+        while position and heard[position - 1] == NOT_HEARD:
+            position -= 1
+        return result.prefix(position)
+
+    @staticmethod
+    def score_sentence(expected, index, spoken):
+        """
+        Score ``spoken`` against sentence ``index`` of a CompiledLesson only.
+        Word positions in the result are still lesson positions.
+        """
+        start, end = expected.sentence_bounds[index]
+        spoken_tokens = normalize_text(spoken).split()
+        return _score_tokens(
+            expected.tokens[start:end],
+            expected.ids[start:end],
+            spoken_tokens,
+            expected.encode(spoken_tokens),
+            offset=start,
+        )
+
+    @staticmethod
+    def merge_sentences(expected, sentences):
+        """
+        Combine sentence-by-sentence readings into one result for the whole
+        lesson. ``sentences`` maps sentence index to what was spoken; words
+        of sentences that were never read count as missing.
+        """
+        spoken_tokens = []
+        result = ScoringResult(expected.tokens, spoken_tokens)
+
+        for index, (start, end) in enumerate(expected.sentence_bounds):
+            if index not in sentences:
+                result.statuses[start:end] = array('B', [MISSING]) * (end - start)
+                continue
+
+            part = ScoringService.score_sentence(
+                expected, index, sentences[index]
+            )
+            heard_offset = len(spoken_tokens)
+            spoken_tokens.extend(part.spoken_tokens)
+
+            result.statuses[start:end] = part.statuses
+            result.heard[start:end] = array('i', [
+                j + heard_offset if j != NOT_HEARD else NOT_HEARD
+                for j in part.heard
+            ])
+            result.correct_count += part.correct_count
+
+        return result
+
+
+def _score_tokens(tokens, ids, spoken_tokens, spoken_ids, offset=0):
+    result = ScoringResult(tokens, spoken_tokens, offset)
+
+    opcodes = opcodes_from_blocks(
+        matching_blocks(ids, spoken_ids),
+        len(tokens),
+        len(spoken_tokens),
+    )
+
+    statuses = result.statuses
+    heard = result.heard
+
+    for tag, i1, i2, j1, j2 in opcodes:
+
+        if tag == "equal":
+            result.correct_count += i2 - i1
+            for offset in range(i2 - i1):
+                heard[i1 + offset] = j1 + offset
+
+        elif tag == "replace":
+            for offset in range(i2 - i1):
+                statuses[i1 + offset] = MISPRONOUNCED
+                if j1 + offset < j2:
+                    heard[i1 + offset] = j1 + offset
+
+        elif tag == "delete":
+            for idx in range(i1, i2):
+                statuses[idx] = MISSING
+
+    return result
@@ -0,0 +1,228 @@
+# reading/services/transcription.py
+"""
+Speech-to-text for recorded readings.
+
+The engine is chosen with the TRANSCRIPTION_BACKEND setting (a dotted path
+to a TranscriptionBackend subclass) and instantiated once per process, so
+local models are loaded a single time. Calls run on a bounded thread pool:
+at most TRANSCRIPTION_WORKERS transcriptions run at once and at most
+TRANSCRIPTION_QUEUE_SIZE wait behind them. Beyond that, transcribe() fails
+fast with TranscriptionBusy. The pool caps concurrency; it does not make
+the call asynchronous. The calling request still waits for its own
+transcription, for up to TRANSCRIPTION_TIMEOUT seconds.
+
+Unless TRANSCRIPTION_PREPROCESS is off, the worker first trims silence and
+resamples the audio to the backend's sample_rate (see services.audio), and
+a recording with nothing but silence is rejected without calling the engine.
+
+Backends:
+- GoogleWebSpeechBackend: Google's free Web Speech API (needs network)
+- VoskBackend: offline recognition with a local Vosk model
+- StubBackend: returns TRANSCRIPTION_STUB_TEXT, for tests and development
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import speech_recognition as sr
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .audio import preprocess
+
+
+DEFAULT_BACKEND = "reading.services.transcription.GoogleWebSpeechBackend"
+
+
+class TranscriptionError(Exception):
+    """Base class for transcription failures."""
+
+
+class UnintelligibleAudio(TranscriptionError):
+    """The audio was processed but no speech could be recognized."""
+
+
+class TranscriptionUnavailable(TranscriptionError):
+    """The engine could not be reached or did not answer in time."""
+
+
+class TranscriptionBusy(TranscriptionError):
+    """Every worker and queue slot is taken; try again shortly."""
+
+
+class TranscriptionBackend:
+    """
+    Turns recorded audio into text.
+
+    ``audio`` is decoded PCM as speech_recognition AudioData
+    (see services.audio.load_audio). Implementations raise
+    UnintelligibleAudio or TranscriptionUnavailable instead of
+    engine-specific errors.
+
+    ``sample_rate`` is the rate audio is resampled to beforehand; None
+    keeps the recording's own rate.
+    """
+
+    sample_rate = 16000
+
+    def transcribe(self, audio):
+        raise NotImplementedError
+
+
+class GoogleWebSpeechBackend(TranscriptionBackend):
+    """Google's free Web Speech API via speech_recognition"""
+
+    def transcribe(self, audio):
+        try:
+            return sr.Recognizer().recognize_google(audio)
+        except sr.UnknownValueError:
+            raise UnintelligibleAudio()
+        except sr.RequestError as e:
+            raise TranscriptionUnavailable(str(e))
+
+
+class VoskBackend(TranscriptionBackend):
+    """
+    Offline recognition with Vosk. The model directory comes from the
+    TRANSCRIPTION_VOSK_MODEL setting and is loaded once per process.
+    """
+
+    def __init__(self):
+        try:
+            import vosk
+        except ImportError:
+            raise ImproperlyConfigured(
+                "VoskBackend requires the 'vosk' package."
+            )
+
+        model_path = getattr(settings, "TRANSCRIPTION_VOSK_MODEL", None)
+        if not model_path:
+            raise ImproperlyConfigured(
+                "Set TRANSCRIPTION_VOSK_MODEL to a Vosk model directory."
+            )
+
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(model_path)
+
+    def transcribe(self, audio):
+        # Vosk wants 16 kHz, 16-bit mono PCM; a no-op after preprocessing
+        pcm = audio.get_raw_data(
+            convert_rate=self.sample_rate,
+            convert_width=2,
+        )
+
+        # The model is shared; a recognizer is cheap and per call
+        recognizer = self.vosk.KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.AcceptWaveform(pcm)
+        text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+
+        if not text:
+            raise UnintelligibleAudio()
+        return text
+
+
+class StubBackend(TranscriptionBackend):
+    """
+    Deterministic backend: ignores the audio and returns
+    TRANSCRIPTION_STUB_TEXT, or reports unintelligible audio when it is empty.
+    """
+
+    def transcribe(self, audio):
+        text = getattr(settings, "TRANSCRIPTION_STUB_TEXT", "")
+        if not text:
+            raise UnintelligibleAudio()
+        return text
+
+
+class TranscriptionPool:
+    """Bounded thread pool that runs one backend's transcriptions"""
+
+    def __init__(self, backend, workers, queue_size, preprocess=True):
+        self.backend = backend
+        self.preprocess = preprocess
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="transcription",
+        )
+        # One slot per running or waiting job
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def transcribe(self, audio, timeout=None):
+        """
+        Run ``audio`` on the pool and wait for its text, raising
+        TranscriptionBusy at once when no slot is free.
+        """
+        if not self.slots.acquire(blocking=False):
+            raise TranscriptionBusy()
+
+        try:
+            future = self.executor.submit(self.run, audio)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            raise TranscriptionUnavailable("Transcription timed out.")
+
+    def run(self, audio):
+        if self.preprocess:
+            audio = preprocess(audio, self.backend.sample_rate)
+            if not audio.frame_data:
+                raise UnintelligibleAudio()
+        return self.backend.transcribe(audio)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_transcription_pool():
+    """The process-wide pool for the configured backend."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                backend_class = import_string(
+                    getattr(settings, "TRANSCRIPTION_BACKEND", DEFAULT_BACKEND)
+                )
+                _pool = TranscriptionPool(
+                    backend_class(),
+                    workers=getattr(settings, "TRANSCRIPTION_WORKERS", 2),
+                    queue_size=getattr(settings, "TRANSCRIPTION_QUEUE_SIZE", 4),
+                    preprocess=getattr(settings, "TRANSCRIPTION_PREPROCESS", True),
+                )
+    return _pool
+
+
+def transcribe(audio):
+    """
+    Transcribe ``audio`` on the shared pool. Blocks the caller for at most
+    TRANSCRIPTION_TIMEOUT seconds; raises TranscriptionBusy without waiting
+    when the pool and its queue are full.
+    """
+    return get_transcription_pool().transcribe(
+        audio,
+        timeout=getattr(settings, "TRANSCRIPTION_TIMEOUT", 30),
+    )
+
+
+@receiver(setting_changed)
+def reset_transcription_pool(setting, **kwargs):
+    """Rebuild the pool when tests override transcription settings."""
+    global _pool
+    if setting.startswith("TRANSCRIPTION_"):
+        with _pool_lock:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = None
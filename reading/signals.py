@@ -1,55 +1,103 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.utils import timezone
-from django.db import transaction
 
-from .models import PronunciationAttempt, LessonProgress
+from .models import LessonProgress, PronunciationAttempt, ReadingLesson, UserSummary
+from .services.analytics_cache import invalidate_user
+from .services.analytics_jobs import analytics_deferred
+from .services.analytics_service import AnalyticsService
+from .services.lesson_cache import lesson_cache
+from .services.progress_service import ProgressService
 
 
 @receiver(post_save, sender=PronunciationAttempt)
 def update_lesson_progress(sender, instance, created, **kwargs):
     """
     Automatically update LessonProgress whenever a PronunciationAttempt is created.
-    Uses database locking to avoid race conditions.
+    The update is a single atomic statement, so concurrent attempts cannot race.
     """
 
     if not created:
         return
 
-    user = instance.user
-    lesson = instance.lesson
+    ProgressService.record_attempt(instance)
 
-    if not user or not lesson:
+
+@receiver(post_save, sender=PronunciationAttempt)
+def update_mistake_counts(sender, instance, created, **kwargs):
+    """
+    Keep the per-user and global mistake counters in step with new attempts
+    so weak-word endpoints never have to scan attempt history. Queued
+    attempts are counted by their AnalyticsJob instead.
+    """
+
+    if not created or analytics_deferred(instance):
+        return
+
+    AnalyticsService.record_mistakes(instance)
+
+
+@receiver(post_save, sender=PronunciationAttempt)
+def index_word_occurrences(sender, instance, created, **kwargs):
+    """
+    Record where each expected word appears in a new attempt and whether it
+    was read correctly, for indexed word-detail lookups. Queued attempts are
+    indexed by their AnalyticsJob instead.
+    """
+
+    if not created or analytics_deferred(instance):
         return
 
-    with transaction.atomic():
+    AnalyticsService.record_word_occurrences(instance)
+
 
-        progress, created_progress = LessonProgress.objects.select_for_update().get_or_create(
-            user=user,
-            lesson=lesson,
-        )
+@receiver(post_save, sender=PronunciationAttempt)
+def invalidate_cached_analytics(sender, instance, **kwargs):
+    """
+    Cached dashboard figures of the attempt's user are stale once the save
+    commits (the bump waits for it); AnalyticsService.process_attempts()
+    drops them again after the word and daily analytics have caught up.
+    """
+
+    invalidate_user(instance.user_id)
+
+
+@receiver(post_delete, sender=PronunciationAttempt)
+@receiver(post_delete, sender=LessonProgress)
+def drop_user_summary(sender, instance, **kwargs):
+    """
+    ProgressService only adds to a UserSummary, so deleting attempts or
+    progress drops the user's row; it is rebuilt on next read.
+    """
 
-        # Update attempt count
-        progress.total_attempts += 1
+    if instance.user_id is None:
+        return
 
-        now = timezone.now()
+    UserSummary.objects.filter(user_id=instance.user_id).delete()
+    invalidate_user(instance.user_id)
 
-        # First attempt time
-        if not progress.first_attempt_at:
-            progress.first_attempt_at = now
 
-        # Last attempt time
-        progress.last_attempt_at = now
+def bulk_attempts_created(attempts):
+    """
+    bulk_create() does not send post_save, so callers that insert attempts in
+    bulk call this instead. It applies what the receivers above do, with one
+    aggregated write per table, and returns the progress per (user, lesson).
+    """
 
-        # Best score logic
-        if instance.score is not None:
-            if progress.best_score is None:
-                progress.best_score = instance.score
-            else:
-                progress.best_score = max(progress.best_score, instance.score)
+    progress = ProgressService.record_attempts(attempts)
+    immediate = [attempt for attempt in attempts if not analytics_deferred(attempt)]
+    AnalyticsService.record_mistakes_many(immediate)
+    AnalyticsService.record_word_occurrences_many(immediate)
+    for user_id in {attempt.user_id for attempt in attempts}:
+        invalidate_user(user_id)
+    return progress
 
-        # Completion rule
-        if progress.best_score is not None and progress.best_score >= 80:
-            progress.is_completed = True
 
-        progress.save()
\ No newline at end of file
+@receiver(post_save, sender=ReadingLesson)
+@receiver(post_delete, sender=ReadingLesson)
+def evict_compiled_lesson(sender, instance, **kwargs):
+    """
+    Drop this process's compiled copy of an edited lesson straight away;
+    other processes notice the new updated_at on their next lookup.
+    """
+
+    lesson_cache.evict(instance.pk)
@@ -1,3 +1,1839 @@
-from django.test import TestCase
+import io
+import json
+import os
+import random
+import tempfile
+import wave
+from datetime import timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+import numpy as np
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .api_views import MAX_BATCH_SIZE, DashboardStatsAPIView, _insert_attempts
+from .management.commands.benchmark_word_analytics import (
+    legacy_extract_word_analytics,
+)
+from .models import (
+    AnalyticsJob,
+    Book,
+    BookCategory,
+    GlobalWordMistakeCount,
+    LessonDifficulty,
+    LessonProgress,
+    PronunciationAttempt,
+    ReadingLesson,
+    ScoringSession,
+    Unit,
+    UserAnalytics,
+    UserSummary,
+    WordAnalytics,
+    WordMistakeCount,
+    WordOccurrence,
+)
+from .services import alignment
+from .services.alignment import align
+from .services.analytics_cache import cache_stats
+from .services.analytics_jobs import AnalyticsJobQueue
+from .services.analytics_service import AnalyticsService
+from .services.audio import load_audio, preprocess
+from .services.lesson_cache import LessonCache, compile_expected, lesson_cache
+from .services.phonetic_analysis import PHONETIC_MATCHER, detect_phonetic_errors
+from .services.progress_service import ProgressService
+from .services.scoring import ScoringService
+from .services.transcription import get_transcription_pool
+from .signals import bulk_attempts_created
+from .views import analyze_pronunciation
+
+
+def python_word_ranking(user, min_attempts, keep, descending):
+    """Reference ranking: load every row and sort in Python."""
+    words = WordAnalytics.objects.filter(
+        user=user,
+        total_attempts__gte=min_attempts,
+    ).order_by('-total_attempts', 'id')
+
+    ranked = [
+        {
+            'word': word.word,
+            'total_attempts': word.total_attempts,
+            'correct_attempts': word.correct_attempts,
+            'success_rate': word.success_rate(),
+            'last_attempt_at': word.last_attempt_at,
+        }
+        for word in words
+        if keep(word.success_rate())
+    ]
+    ranked.sort(key=lambda x: x['success_rate'], reverse=descending)
+    return ranked
+
+
+class WordAnalyticsExtractionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.bulk_user = User.objects.create(username="bulk")
+        cls.legacy_user = User.objects.create(username="legacy")
+        cls.lessons = [
+            ReadingLesson.objects.create(title=f"Lesson {i}", content="x")
+            for i in range(2)
+        ]
+
+    def attempts(self, user):
+        texts = [
+            ("The cat and the dog and the bird saw the sun.", ["the", "bird"]),
+            ("A cat is a cat, isn't it? The cat!", [{"word": "cat"}]),
+            ("The sun sat on the hill.", []),
+        ]
+        return [
+            PronunciationAttempt(
+                user=user, lesson=lesson, expected=text,
+                spoken="", mispronounced=mispronounced,
+            )
+            for lesson in (*self.lessons, None)
+            for text, mispronounced in texts
+        ]
+
+    def rows(self, user):
+        return sorted(
+            WordAnalytics.objects.filter(user=user).values_list(
+                "word", "lesson_id", "total_attempts", "correct_attempts"
+            ),
+            key=lambda row: (row[0], row[1] or 0),
+        )
+
+    def test_bulk_path_matches_per_word_path(self):
+        for attempt in self.attempts(self.legacy_user):
+            legacy_extract_word_analytics(attempt)
+        for attempt in self.attempts(self.bulk_user):
+            AnalyticsService.extract_word_analytics(attempt)
+        AnalyticsService.extract_word_analytics_many(self.attempts(self.bulk_user))
+        for attempt in self.attempts(self.legacy_user):
+            legacy_extract_word_analytics(attempt)
+
+        self.assertEqual(self.rows(self.bulk_user), self.rows(self.legacy_user))
+        self.assertIn(("the", None, 14, 6), self.rows(self.bulk_user))
+
+    def test_words_without_lesson_are_never_duplicated(self):
+        for _ in range(2):
+            WordAnalytics.objects.bulk_create(
+                [WordAnalytics(user=self.bulk_user, word="cat", lesson=None)],
+                ignore_conflicts=True,
+            )
+
+        self.assertEqual(
+            WordAnalytics.objects.filter(user=self.bulk_user, word="cat").count(), 1
+        )
+
+
+class WordRankingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create(username="reader")
+        other = User.objects.create(username="other")
+
+        rng = random.Random(7)
+        for i in range(300):
+            # Totals of 16 and 32 give .x5 ties (1/16 is 6.25%)
+            total = rng.randint(0, 40)
+            WordAnalytics.objects.create(
+                user=cls.user,
+                word=f"word{i}",
+                total_attempts=total,
+                correct_attempts=rng.randint(0, total),
+            )
+        WordAnalytics.objects.create(
+            user=other, word="word0", total_attempts=9, correct_attempts=0
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_weak_words_match_python_ranking(self):
+        expected = python_word_ranking(
+            self.user, 3, lambda rate: rate < 80, descending=False
+        )
+        for limit in (1, 10, 50, 1000):
+            self.assertEqual(
+                AnalyticsService.get_user_weak_words(self.user, limit=limit),
+                expected[:limit],
+            )
+
+    def test_strengths_match_python_ranking(self):
+        expected = python_word_ranking(
+            self.user, 2, lambda rate: rate >= 80, descending=True
+        )
+        for limit in (1, 10, 50, 1000):
+            self.assertEqual(
+                AnalyticsService.get_user_strengths(self.user, limit=limit),
+                expected[:limit],
+            )
+
+    def test_reported_rate_is_the_ranking_key(self):
+        word = WordAnalytics.objects.create(
+            user=self.user, word="tie", total_attempts=16, correct_attempts=1
+        )
+        word.refresh_from_db()
+
+        self.assertEqual(word.success_pct, 6.3)
+        self.assertEqual(word.success_rate(), 6.3)
+        self.assertIn(
+            {"word": "tie", "success_rate": 6.3},
+            [
+                {"word": w["word"], "success_rate": w["success_rate"]}
+                for w in AnalyticsService.get_user_weak_words(self.user, 1000)
+            ],
+        )
+
+    def test_success_rate_rounds_halves_up(self):
+        # round() rounded exact halves to even: 6.25 -> 6.2, 31.25 -> 31.2
+        for correct, total, rate in (
+            (1, 16, 6.3),
+            (5, 16, 31.3),
+            (3, 16, 18.8),
+            (1, 3, 33.3),
+            (2, 3, 66.7),
+            (0, 0, 0),
+        ):
+            word = WordAnalytics(total_attempts=total, correct_attempts=correct)
+            self.assertEqual(word.success_rate(), rate)
+
+    def test_practice_word_count_matches_python(self):
+        expected = sum(
+            1
+            for word in WordAnalytics.objects.filter(
+                user=self.user, total_attempts__gte=2
+            )
+            if word.success_rate() < 60
+        )
+        stats = AnalyticsService.get_user_overall_stats(self.user)
+        self.assertEqual(stats['words_to_practice'], expected)
+
+
+def wav_upload(samples, rate=16000, channels=1):
+    """A 16-bit WAV upload of interleaved ``samples``."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.asarray(samples, dtype=np.int16).tobytes())
+    return SimpleUploadedFile(
+        "recording.wav", buffer.getvalue(), content_type="audio/wav"
+    )
+
+
+def silent_wav(seconds=0.5, rate=16000):
+    """A short silent mono WAV upload."""
+    return wav_upload(np.zeros(int(seconds * rate)), rate)
+
+
+def tone_wav(seconds=0.5, rate=16000, lead=0.0, tail=0.0, channels=1):
+    """A tone standing in for speech, optionally between silences."""
+    t = np.arange(int(seconds * rate)) / rate
+    tone = 8000 * np.sin(2 * np.pi * 220 * t)
+    samples = np.concatenate([
+        np.zeros(int(lead * rate)), tone, np.zeros(int(tail * rate))
+    ])
+    return wav_upload(np.repeat(samples, channels), rate, channels)
+
+
+@override_settings(
+    TRANSCRIPTION_BACKEND="reading.services.transcription.StubBackend",
+    TRANSCRIPTION_STUB_TEXT="the cat sat on a mat",
+)
+class ProcessRecordingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+        cls.lesson = ReadingLesson.objects.create(
+            title="Cat", content="The cat sat on the mat."
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse("reading:process_recording", args=[self.lesson.pk])
+
+    def test_scores_stub_transcript(self):
+        response = self.client.post(self.url, {"audio": tone_wav()})
+
+        self.assertEqual(response.status_code, 200)
+        feedback = response.json()["feedback"]
+        self.assertEqual(feedback["score"], 83.33)
+        self.assertEqual(
+            [(w["word"], w["heard"]) for w in feedback["problem_words"]],
+            [("the", "a")],
+        )
+
+        attempt = PronunciationAttempt.objects.get()
+        self.assertEqual(attempt.spoken, "the cat sat on a mat")
+        self.assertEqual(attempt.score, 83.33)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_spooled_upload_is_decoded_in_place(self):
+        response = self.client.post(self.url, {"audio": tone_wav(seconds=1)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["feedback"]["score"], 83.33)
+
+    def test_rejects_undecodable_upload(self):
+        upload = SimpleUploadedFile("recording.wav", b"not audio at all")
+        response = self.client.post(self.url, {"audio": upload})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PronunciationAttempt.objects.exists())
+
+    @override_settings(TRANSCRIPTION_STUB_TEXT="")
+    def test_unintelligible_audio(self):
+        response = self.client.post(self.url, {"audio": tone_wav()})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PronunciationAttempt.objects.exists())
+
+    def test_silent_recording_never_reaches_backend(self):
+        response = self.client.post(self.url, {"audio": silent_wav()})
+
+        # The stub would have answered; preprocessing rejected it first
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PronunciationAttempt.objects.exists())
+
+    @override_settings(TRANSCRIPTION_WORKERS=1, TRANSCRIPTION_QUEUE_SIZE=0)
+    def test_busy_pool_rejects_request(self):
+        pool = get_transcription_pool()
+        self.assertTrue(pool.slots.acquire(blocking=False))
+        try:
+            response = self.client.post(self.url, {"audio": tone_wav()})
+        finally:
+            pool.slots.release()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "5")
+
+
+class AudioPreprocessingTests(TestCase):
+
+    def test_stereo_is_downmixed(self):
+        audio = load_audio(tone_wav(rate=44100, channels=2))
+
+        self.assertEqual(audio.sample_width, 2)
+        self.assertEqual(len(audio.frame_data), int(0.5 * 44100) * 2)
+
+    def test_silence_is_trimmed_and_rate_converted(self):
+        audio = load_audio(tone_wav(seconds=1, rate=48000, lead=2, tail=1.5))
+
+        processed = preprocess(audio, 16000)
+
+        self.assertEqual(processed.sample_rate, 16000)
+        seconds = len(processed.frame_data) / 2 / 16000
+        # One second of tone plus at most the padding either side
+        self.assertGreaterEqual(seconds, 1)
+        self.assertLessEqual(seconds, 1.45)
+
+    def test_silent_recording_becomes_empty(self):
+        processed = preprocess(load_audio(silent_wav()), 16000)
+
+        self.assertEqual(processed.frame_data, b"")
+
+
+@override_settings(
+    TRANSCRIPTION_BACKEND="reading.services.transcription.StubBackend",
+)
+class StreamedAudioFeedbackTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+        cls.lesson = ReadingLesson.objects.create(
+            title="Cat",
+            content="The cat sat on the mat. The dog ran to the park.",
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse("reading:reading_api:audio-feedback")
+
+    def send(self, heard, **data):
+        with self.settings(TRANSCRIPTION_STUB_TEXT=heard):
+            return self.client.post(self.url, {"audio": tone_wav(), **data})
+
+    def test_partial_feedback_then_final_score(self):
+        first = self.send("the cat sat on a mat", lesson_id=self.lesson.pk)
+
+        self.assertEqual(first.status_code, 200)
+        partial = first.json()
+        self.assertFalse(partial["final"])
+        self.assertEqual(partial["next_seq"], 1)
+        self.assertEqual(partial["position"], 6)
+        self.assertEqual(partial["total_words"], 12)
+        self.assertEqual(
+            [w["word"] for w in partial["mispronounced"]], ["the"]
+        )
+
+        second = self.send(
+            "the dog ran to the park", session=partial["session"], seq=1
+        )
+        self.assertEqual(second.json()["position"], 12)
+
+        final = self.client.post(
+            self.url, {"session": partial["session"], "final": "true"}
+        )
+
+        self.assertEqual(final.status_code, 200)
+        self.assertTrue(final.json()["final"])
+        self.assertEqual(final.json()["score"], 91.67)
+
+        attempt = PronunciationAttempt.objects.get()
+        self.assertEqual(final.json()["attempt_id"], attempt.id)
+        self.assertEqual(
+            attempt.spoken, "the cat sat on a mat the dog ran to the park"
+        )
+        self.assertEqual(ScoringSession.objects.get().attempt, attempt)
+
+    def test_repeated_chunk_is_not_transcribed_twice(self):
+        session = self.send("the cat", lesson_id=self.lesson.pk).json()["session"]
+
+        repeated = self.send("the cat", session=session, seq=0)
+        self.assertEqual(repeated.status_code, 200)
+        self.assertEqual(repeated.json()["transcript"], "the cat")
+
+        gap = self.send("the mat", session=session, seq=2)
+        self.assertEqual(gap.status_code, 409)
+        self.assertEqual(gap.json()["next_seq"], 1)
+
+    def test_finished_session_is_closed(self):
+        session = self.send("the cat", lesson_id=self.lesson.pk).json()["session"]
+        self.client.post(self.url, {"session": session, "final": "true"})
+
+        response = self.send("sat on", session=session, seq=1)
+        self.assertEqual(response.status_code, 409)
+
+    def test_other_users_cannot_post_to_session(self):
+        session = self.send("the cat", lesson_id=self.lesson.pk).json()["session"]
+
+        other = get_user_model().objects.create(username="other")
+        self.client.force_login(other)
+        response = self.send("sat on", session=session, seq=1)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_refused_first_chunk_opens_no_session(self):
+        upload = SimpleUploadedFile("chunk.wav", b"not audio at all")
+        bad_audio = self.client.post(
+            self.url, {"audio": upload, "lesson_id": self.lesson.pk}
+        )
+        no_audio = self.client.post(
+            self.url, {"lesson_id": self.lesson.pk, "final": "true"}
+        )
+        late_chunk = self.send("the cat", lesson_id=self.lesson.pk, seq=1)
+
+        self.assertEqual(bad_audio.status_code, 400)
+        self.assertEqual(no_audio.status_code, 400)
+        self.assertEqual(late_chunk.status_code, 409)
+        self.assertEqual(late_chunk.json()["next_seq"], 0)
+        self.assertFalse(ScoringSession.objects.exists())
+
+    def test_later_chunks_need_seq(self):
+        session = self.send("the cat", lesson_id=self.lesson.pk).json()["session"]
+
+        response = self.send("sat on", session=session)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["next_seq"], 1)
+        self.assertEqual(ScoringSession.objects.get().transcript, "the cat")
+
+
+class SentenceFeedbackTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+        cls.lesson = ReadingLesson.objects.create(
+            title="Cat",
+            content="The cat sat on the mat. The dog ran to the park. It rained.",
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse("reading:reading_api:feedback")
+
+    def post(self, **data):
+        return self.client.post(self.url, data, content_type="application/json")
+
+    def test_sentences_merge_into_one_attempt(self):
+        first = self.post(
+            lesson_id=self.lesson.pk, sentence_index=1, spoken="the dog run to the park"
+        ).json()
+
+        self.assertEqual(first["score"], 83.33)
+        self.assertEqual(
+            [(w["word"], w["heard"], w["position"]) for w in first["mispronounced"]],
+            [("ran", "run", 8)],
+        )
+        self.assertEqual(first["sentence_count"], 3)
+
+        second = self.post(
+            session=first["session"], sentence_index=0, spoken="the cat sat on the mat"
+        ).json()
+        self.assertEqual(second["sentences_read"], 2)
+        self.assertEqual(second["running_score"], 91.67)
+
+        final = self.post(session=first["session"], final=True)
+
+        self.assertEqual(final.status_code, 200)
+        merged = final.json()
+        self.assertEqual(merged["score"], 78.57)
+        self.assertEqual(
+            [(w["word"], w["status"]) for w in merged["mispronounced"]],
+            [("ran", "mispronounced"), ("it", "missing"), ("rained", "missing")],
+        )
+
+        attempt = PronunciationAttempt.objects.get()
+        self.assertEqual(merged["attempt_id"], attempt.id)
+        self.assertEqual(
+            attempt.spoken, "the cat sat on the mat the dog run to the park"
+        )
+
+    def test_merge_matches_whole_passage_scoring(self):
+        expected = compile_expected(self.lesson.content)
+        readings = {0: "the cat sat on a mat", 1: "the dog ran to park", 2: "it rained"}
+
+        merged = ScoringService.merge_sentences(expected, readings)
+        whole = ScoringService.score(expected, " ".join(readings.values()))
+
+        self.assertEqual(merged.as_dict(), whole.as_dict())
+
+    def test_rereading_a_sentence_replaces_it(self):
+        session = self.post(
+            lesson_id=self.lesson.pk, sentence_index=2, spoken="it rain"
+        ).json()["session"]
+        again = self.post(session=session, sentence_index=2, spoken="it rained")
+
+        self.assertEqual(again.json()["sentences_read"], 1)
+        self.assertEqual(again.json()["running_score"], 100)
+
+    def test_rejects_unknown_sentence(self):
+        response = self.post(
+            lesson_id=self.lesson.pk, sentence_index=3, spoken="hello"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ScoringSession.objects.exists())
+
+
+class LessonCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.lesson = ReadingLesson.objects.create(title="Cat", content="The cat sat.")
+
+    def setUp(self):
+        lesson_cache.clear()
+        self.addCleanup(lesson_cache.clear)
+
+    def test_lookups_share_one_compilation(self):
+        first = compile_expected(self.lesson.content, self.lesson)
+
+        self.assertIs(compile_expected(self.lesson.content, self.lesson), first)
+        self.assertEqual(first.tokens, ["the", "cat", "sat"])
+        self.assertIsNot(compile_expected("The dog sat.", self.lesson), first)
+
+    def test_newer_updated_at_recompiles(self):
+        stale = compile_expected(self.lesson.content, self.lesson)
+
+        # An edit from another process: no signal reaches this cache.
+        ReadingLesson.objects.filter(pk=self.lesson.pk).update(
+            content="The dog sat.",
+            updated_at=self.lesson.updated_at + timedelta(seconds=1),
+        )
+        edited = ReadingLesson.objects.get(pk=self.lesson.pk)
+        self.assertEqual(len(lesson_cache), 1)
+
+        fresh = compile_expected(edited.content, edited)
+
+        self.assertIsNot(fresh, stale)
+        self.assertEqual(fresh.tokens, ["the", "dog", "sat"])
+        self.assertEqual(fresh.updated_at, edited.updated_at)
+        self.assertIs(compile_expected(edited.content, edited), fresh)
+
+    def test_saving_a_lesson_evicts_it(self):
+        compile_expected(self.lesson.content, self.lesson)
+        self.assertEqual(len(lesson_cache), 1)
+
+        self.lesson.save()
+
+        self.assertEqual(len(lesson_cache), 0)
+
+    def test_least_recently_used_lesson_is_dropped(self):
+        cache = LessonCache(max_size=2)
+        lessons = [
+            ReadingLesson.objects.create(title=f"Lesson {i}", content=f"Word {i}.")
+            for i in range(3)
+        ]
+        first = cache.get(lessons[0])
+        cache.get(lessons[1])
+        cache.get(lessons[0])
+        cache.get(lessons[2])
+
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get(lessons[0]), first)
+
+
+class LessonListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = BookCategory.objects.create(name="Stories")
+        other_category = BookCategory.objects.create(name="Poems")
+        book = Book.objects.create(title="Book", category=cls.category)
+        cls.other_book = Book.objects.create(title="Poems", category=other_category)
+
+        units = [
+            Unit.objects.create(title="Second", book=book, order=2),
+            Unit.objects.create(title="First", book=book, order=1),
+            Unit.objects.create(title="Verse", book=cls.other_book, order=1),
+        ]
+        for unit in units:
+            for order in (3, 1, 2):
+                ReadingLesson.objects.create(
+                    title=f"{unit.title} {order}",
+                    content="Some text.",
+                    unit=unit,
+                    order=order,
+                )
+        # Lessons outside any unit may share an order
+        for _ in range(2):
+            ReadingLesson.objects.create(title="Loose", content="Loose text.")
+
+    def setUp(self):
+        self.url = reverse("reading:reading_api:lesson-list")
+
+    def walk(self, **params):
+        """Every page of the listing, following next cursors."""
+        results = []
+        cursor = None
+        while True:
+            query = dict(params, **({"cursor": cursor} if cursor else {}))
+            page = self.client.get(self.url, query).json()
+            results.extend(page["results"])
+            cursor = page["next"]
+            if cursor is None:
+                return results
+
+    def test_pages_cover_lessons_in_keyset_order(self):
+        lessons = self.walk(limit=2)
+
+        # Lessons without a unit first, then by unit, order and id
+        keys = [
+            (lesson["unit"] is not None, lesson["unit"] or 0,
+             lesson["order"], lesson["id"])
+            for lesson in lessons
+        ]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(lessons), ReadingLesson.objects.count())
+        self.assertEqual(len({lesson["id"] for lesson in lessons}), len(lessons))
+
+    def test_fields_selector_leaves_out_content(self):
+        page = self.client.get(self.url, {"fields": "id,title"}).json()
+
+        self.assertEqual(set(page["results"][0]), {"id", "title"})
+
+    def test_filters(self):
+        by_book = self.walk(book=self.other_book.pk, fields="title")
+        self.assertEqual(
+            [lesson["title"] for lesson in by_book],
+            ["Verse 1", "Verse 2", "Verse 3"],
+        )
+
+        by_category = self.walk(category=self.category.pk, limit=4)
+        self.assertEqual(len(by_category), 6)
+
+    def test_rejects_bad_parameters(self):
+        for params in (
+            {"cursor": "nonsense"}, {"fields": "id,secret"}, {"unit": "x"}
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+
+
+class ConditionalGetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+        category = BookCategory.objects.create(name="Stories")
+        cls.book = Book.objects.create(title="Book", category=category)
+        cls.unit = Unit.objects.create(title="Unit", book=cls.book)
+        cls.lesson = ReadingLesson.objects.create(
+            title="Cat", content="The cat sat.", unit=cls.unit
+        )
+
+    def revalidate(self, url):
+        """GET once, then again with the ETag; returns both responses."""
+        first = self.client.get(url)
+        again = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        return first, again
+
+    def test_unchanged_lesson_costs_one_query(self):
+        url = reverse("reading:reading_api:lesson-detail", args=[self.lesson.pk])
+        first = self.client.get(url)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("no-cache", first["Cache-Control"])
+
+        with self.assertNumQueries(1):
+            again = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+        self.lesson.content = "The cat sat down."
+        self.lesson.save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], first["ETag"])
+
+    def test_lesson_list_changes_with_new_lessons(self):
+        url = reverse("reading:reading_api:lesson-list")
+        first, again = self.revalidate(url)
+        self.assertEqual(again.status_code, 304)
+
+        ReadingLesson.objects.create(title="Dog", content="A dog.", order=1)
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+
+    def test_lesson_page_changes_with_new_attempt(self):
+        self.client.force_login(self.user)
+        url = reverse("reading:lesson_detail", args=[self.lesson.pk])
+        first, again = self.revalidate(url)
+
+        self.assertEqual(again.status_code, 304)
+        self.assertIn("private", again["Cache-Control"])
+
+        PronunciationAttempt.objects.create(
+            user=self.user, lesson=self.lesson,
+            expected="The cat sat.", spoken="the cat sat", score=100,
+        )
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+
+    def test_catalogue_pages_revalidate(self):
+        for url in (
+            reverse("reading:book_list"),
+            reverse("reading:unit_list", args=[self.book.pk]),
+            reverse("reading:lesson_list", args=[self.unit.pk]),
+        ):
+            first, again = self.revalidate(url)
+            self.assertEqual(first.status_code, 200, url)
+            self.assertEqual(again.status_code, 304, url)
+
+        url = reverse("reading:lesson_list", args=[self.unit.pk])
+        before = self.client.get(url)
+        self.unit.title = "Renamed"
+        self.unit.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=before["ETag"])
+        self.assertEqual(response.status_code, 200)
+
+    def test_missing_lesson_is_still_404(self):
+        url = reverse("reading:reading_api:lesson-detail", args=[999])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class AnalyticsCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create(username="reader")
+        cls.other = User.objects.create(username="other")
+        cls.lesson = ReadingLesson.objects.create(
+            title="Cat", content="The cat sat."
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def attempt(self, user):
+        return PronunciationAttempt.objects.create(
+            user=user, lesson=self.lesson,
+            expected="The cat sat.", spoken="the cat sat", score=100,
+        )
+
+    def test_repeat_reads_are_served_from_cache(self):
+        self.attempt(self.user)
+        first = AnalyticsService.get_user_overall_stats(self.user)
+
+        with self.assertNumQueries(0):
+            again = AnalyticsService.get_user_overall_stats(self.user)
+
+        self.assertEqual(again, first)
+        stats = cache_stats()["get_user_overall_stats"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_new_attempt_invalidates_only_its_user(self):
+        AnalyticsService.get_user_overall_stats(self.user)
+        AnalyticsService.get_user_overall_stats(self.other)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.attempt(self.user)
+
+        stats = AnalyticsService.get_user_overall_stats(self.user)
+        self.assertEqual(stats["total_attempts"], 1)
+        with self.assertNumQueries(0):
+            AnalyticsService.get_user_overall_stats(self.other)
+
+    def test_invalidation_waits_for_the_commit(self):
+        AnalyticsService.get_user_overall_stats(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.attempt(self.user)
+
+            # Before the commit a read still gets the cached figures, which
+            # the bump after the commit retires
+            with self.assertNumQueries(0):
+                stale = AnalyticsService.get_user_overall_stats(self.user)
+            self.assertEqual(stale["total_attempts"], 0)
+
+        self.assertTrue(callbacks)
+        stats = AnalyticsService.get_user_overall_stats(self.user)
+        self.assertEqual(stats["total_attempts"], 1)
+
+    def test_arguments_are_part_of_the_key(self):
+        WordAnalytics.objects.create(
+            user=self.user, word="cat", total_attempts=5, correct_attempts=1
+        )
+        WordAnalytics.objects.create(
+            user=self.user, word="sat", total_attempts=5, correct_attempts=2
+        )
+
+        self.assertEqual(len(AnalyticsService.get_user_weak_words(self.user, limit=1)), 1)
+        self.assertEqual(len(AnalyticsService.get_user_weak_words(self.user, limit=5)), 2)
+
+    @override_settings(ANALYTICS_CACHE_TTL=0)
+    def test_zero_ttl_disables_cache(self):
+        AnalyticsService.get_user_overall_stats(self.user)
+        AnalyticsService.get_user_overall_stats(self.user)
+
+        stats = cache_stats()["get_user_overall_stats"]
+        self.assertEqual((stats["hits"], stats["misses"]), (0, 0))
+
+    def test_stats_endpoint_is_staff_only(self):
+        url = reverse("reading:reading_api:analytics-cache-stats")
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        staff = get_user_model().objects.create(username="staff", is_staff=True)
+        self.client.force_login(staff)
+        AnalyticsService.get_user_strengths(self.user)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["misses"], 1)
+
+
+@override_settings(ANALYTICS_CACHE_TTL=0)
+class DashboardSnapshotTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+        cls.lessons = [
+            ReadingLesson.objects.create(title=f"Lesson {i}", content="The cat sat.")
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse("reading:reading_api:dashboard-stats")
+
+    def add_history(self, attempts):
+        # Best scores 50 and 70 leave two lessons difficult; 90 completes one
+        for i in range(attempts):
+            PronunciationAttempt.objects.create(
+                user=self.user, lesson=self.lessons[i % 3],
+                expected="The cat sat on the mat.", spoken="the cat",
+                score=(50, 70, 90)[i % 3] - i % 5,
+            )
+
+    def test_query_count_does_not_grow_with_history(self):
+        # Session and user, then the seven snapshot queries
+        self.add_history(3)
+        with self.assertNumQueries(9):
+            self.client.get(self.url)
+
+        self.add_history(40)
+        with self.assertNumQueries(9):
+            response = self.client.get(self.url)
+
+        data = response.json()
+        self.assertEqual(len(data["recent_attempts"]), 10)
+        self.assertEqual(len(data["difficult_lessons"]), 2)
+        self.assertLessEqual(len(data["weak_words"]), 5)
+
+    def test_snapshot_matches_individual_reports(self):
+        self.add_history(12)
+        snapshot = AnalyticsService.get_dashboard_snapshot(self.user, limit=5)
+
+        self.assertEqual(
+            snapshot["stats"], AnalyticsService.get_user_overall_stats(self.user)
+        )
+        self.assertEqual(
+            snapshot["weak_words"], AnalyticsService.get_user_weak_words(self.user, 5)
+        )
+        self.assertEqual(
+            snapshot["difficult_lessons"],
+            AnalyticsService.get_difficult_lessons(self.user, 5),
+        )
+        self.assertEqual(snapshot["stats"]["total_attempts"], 12)
+        self.assertEqual(snapshot["stats"]["completed_lessons"], 1)
+        self.assertEqual(snapshot["stats"]["total_lessons"], 3)
+
+    def test_trend_looks_past_unscored_attempts(self):
+        start = timezone.now() - timedelta(hours=1)
+        scores = [90, 80, 70, 60, 50] + [None] * 10
+        for minute, score in enumerate(scores):
+            attempt = PronunciationAttempt.objects.create(
+                user=self.user, expected="cat", spoken="cat", score=score
+            )
+            PronunciationAttempt.objects.filter(pk=attempt.pk).update(
+                created_at=start + timedelta(minutes=minute)
+            )
+
+        snapshot = AnalyticsService.get_dashboard_snapshot(self.user)
+
+        self.assertEqual(snapshot["trend"], "declining")
+
+
+class UserSummaryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+        cls.lessons = [
+            ReadingLesson.objects.create(title=f"Lesson {i}", content="The cat sat.")
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def attempt(self, lesson, score):
+        return PronunciationAttempt.objects.create(
+            user=self.user, lesson=lesson,
+            expected="The cat sat.", spoken="the cat", score=score,
+        )
+
+    def add_history(self):
+        self.attempt(self.lessons[0], 60)
+        self.attempt(self.lessons[0], 85)
+        self.attempt(self.lessons[1], 40)
+        self.attempt(self.lessons[1], None)
+        self.attempt(None, 70)
+
+    def summary_values(self):
+        return UserSummary.objects.filter(user=self.user).values(
+            "total_attempts", "scored_attempts", "score_total",
+            "lesson_attempts", "completed_lessons",
+            "best_scored_lessons", "best_score_total",
+        ).get()
+
+    def test_attempts_keep_summary_in_step(self):
+        self.add_history()
+        maintained = self.summary_values()
+
+        UserSummary.objects.all().delete()
+        ProgressService.build_summary(self.user.pk)
+
+        self.assertEqual(maintained, self.summary_values())
+        self.assertEqual(maintained["total_attempts"], 5)
+        self.assertEqual(maintained["lesson_attempts"], 4)
+        self.assertEqual(maintained["completed_lessons"], 1)
+        self.assertEqual(maintained["best_score_total"], 125)
+
+    def test_bulk_attempts_update_summary(self):
+        self.attempt(self.lessons[0], 50)
+        attempts = PronunciationAttempt.objects.bulk_create([
+            PronunciationAttempt(
+                user=self.user, lesson=self.lessons[1],
+                expected="The cat sat.", spoken="the cat sat", score=score,
+            )
+            for score in (90, 30)
+        ])
+
+        bulk_attempts_created(attempts)
+
+        summary = UserSummary.objects.get(user=self.user)
+        self.assertEqual(summary.total_attempts, 3)
+        self.assertEqual(summary.completed_lessons, 1)
+        self.assertAlmostEqual(summary.average_score(), 170 / 3)
+
+    def test_progress_endpoint_builds_missing_summary(self):
+        self.add_history()
+        UserSummary.objects.all().delete()
+        url = reverse("reading:reading_api:student-progress")
+
+        data = self.client.get(url).json()
+
+        self.assertEqual(data["total_attempts"], 4)
+        self.assertEqual(data["completed_lessons"], 1)
+        self.assertEqual(data["average_best_score"], 62.5)
+        self.assertTrue(UserSummary.objects.filter(user=self.user).exists())
+
+        # Session, user, the summary row and the lesson count
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+    def test_dashboard_views_agree(self):
+        self.add_history()
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, user=self.user)
+
+        stats = DashboardStatsAPIView.as_view()(request).data["stats"]
+        overall = AnalyticsService.get_user_overall_stats(self.user)
+
+        self.assertEqual(stats["total_attempts"], overall["total_attempts"])
+        self.assertEqual(stats["completed_lessons"], overall["completed_lessons"])
+        self.assertEqual(stats["average_score"], 62.5)
+        self.assertEqual(overall["average_score"], 63.8)
+
+    def test_deleting_an_attempt_drops_summary(self):
+        attempt = self.attempt(self.lessons[0], 90)
+
+        attempt.delete()
+
+        self.assertFalse(UserSummary.objects.filter(user=self.user).exists())
+        self.assertEqual(ProgressService.get_summary(self.user.pk).total_attempts, 0)
+
+
+class DailyAnalyticsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+        cls.lesson = ReadingLesson.objects.create(title="Cat", content="The cat sat.")
+
+    def process(self, score, spoken="the cat sat"):
+        attempt = PronunciationAttempt.objects.create(
+            user=self.user, lesson=self.lesson, expected="The cat sat.",
+            spoken=spoken, score=score, mispronounced=["sat"],
+        )
+        AnalyticsService.process_attempt(attempt)
+
+    def row(self):
+        return UserAnalytics.objects.filter(user=self.user).values(
+            "total_attempts", "scored_attempts", "avg_score",
+            "lessons_completed", "total_practice_time", "words_practiced",
+        ).get()
+
+    @override_settings(DAILY_ANALYTICS_INCREMENTAL=True)
+    def test_incremental_rollup_matches_rebuild(self):
+        for score in (None, 80, 65, None, 90):
+            self.process(score)
+        incremental = self.row()
+
+        AnalyticsService.rebuild_daily_analytics(self.user)
+
+        self.assertEqual(incremental, self.row())
+        self.assertEqual(incremental["scored_attempts"], 3)
+        self.assertAlmostEqual(incremental["avg_score"], 235 / 3)
+
+    @override_settings(DAILY_ANALYTICS_INCREMENTAL=True)
+    def test_unscored_attempt_does_not_dilute_average(self):
+        self.process(None)
+        self.process(80)
+
+        self.assertEqual(self.row()["avg_score"], 80.0)
+
+    def test_command_reconciles_drifted_rows(self):
+        self.process(70)
+        UserAnalytics.objects.filter(user=self.user).update(
+            total_attempts=9, scored_attempts=9, avg_score=10
+        )
+        idle = get_user_model().objects.create(username="idle")
+        UserAnalytics.objects.create(user=idle, total_attempts=4, avg_score=50)
+
+        out = io.StringIO()
+        call_command("rebuild_daily_analytics", stdout=out)
+
+        row = self.row()
+        self.assertEqual((row["total_attempts"], row["avg_score"]), (1, 70.0))
+        idle_row = UserAnalytics.objects.get(user=idle)
+        self.assertEqual((idle_row.total_attempts, idle_row.avg_score), (0, 0))
+        self.assertIn("Rebuilt 2 row(s)", out.getvalue())
+
+
+class GlobalWeakWordsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        users = [User.objects.create(username=f"reader{i}") for i in range(4)]
+        lessons = [
+            ReadingLesson.objects.create(title=f"Lesson {i}", content="x")
+            for i in range(3)
+        ]
+
+        rng = random.Random(11)
+        for user in users:
+            for lesson in (*lessons, None):
+                for i in rng.sample(range(30), 12):
+                    total = rng.randint(1, 6)
+                    WordAnalytics.objects.create(
+                        user=user, lesson=lesson, word=f"word{i}",
+                        total_attempts=total,
+                        correct_attempts=rng.randint(0, total),
+                    )
+
+    def setUp(self):
+        cache.clear()
+
+    def python_global_stats(self, min_attempts=5):
+        """Reference aggregation: one pass over every WordAnalytics row."""
+        grouped = {}
+        for row in WordAnalytics.objects.all():
+            stats = grouped.setdefault(row.word, [0, 0, set()])
+            stats[0] += row.total_attempts
+            stats[1] += row.correct_attempts
+            stats[2].add(row.user_id)
+
+        result = []
+        for word, (total, correct, users) in grouped.items():
+            if total < min_attempts:
+                continue
+            success_rate = round(correct / total * 100, 1)
+            result.append({
+                'word': word,
+                'total_attempts': total,
+                'correct_attempts': correct,
+                'success_rate': success_rate,
+                'failure_rate': round(100 - success_rate, 1),
+                'unique_users': len(users),
+            })
+        return result
+
+    def test_grouped_query_matches_per_row_aggregation(self):
+        by_word = lambda rows: sorted(rows, key=lambda row: row['word'])
+
+        self.assertEqual(
+            by_word(AnalyticsService.compute_global_word_stats()),
+            by_word(self.python_global_stats()),
+        )
+
+    def test_materialized_table_matches_live_fallback(self):
+        live = AnalyticsService.get_global_weak_words(limit=100)
+
+        AnalyticsService.refresh_global_word_stats()
+
+        self.assertEqual(AnalyticsService.get_global_weak_words(limit=100), live)
+        self.assertTrue(live)
+        self.assertTrue(any(row['unique_users'] > 1 for row in live))
+
+
+class MistakeCounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.users = [User.objects.create(username=f"reader{i}") for i in range(2)]
+
+    def counters(self):
+        return (
+            sorted(WordMistakeCount.objects.values_list("user_id", "word", "mistakes")),
+            sorted(GlobalWordMistakeCount.objects.values_list("word", "mistakes")),
+        )
+
+    def test_maintained_counters_match_rebuild(self):
+        mispronounced = [
+            ["cat", "sat"],
+            [{"word": "cat"}, {"word": "Cat"}, "mat"],
+            [],
+            ["sat", {"phoneme": "missing word"}, 7],
+        ]
+        for i, words in enumerate(mispronounced):
+            PronunciationAttempt.objects.create(
+                user=self.users[i % 2], expected="The cat sat on the mat.",
+                spoken="", mispronounced=words,
+            )
+        PronunciationAttempt.objects.create(
+            user=None, expected="cat", spoken="", mispronounced=["cat"]
+        )
+        bulk = PronunciationAttempt.objects.bulk_create([
+            PronunciationAttempt(
+                user=user, expected="cat", spoken="", mispronounced=["cat", "hat"]
+            )
+            for user in self.users
+        ])
+        bulk_attempts_created(bulk)
+        maintained = self.counters()
+
+        AnalyticsService.rebuild_mistake_counts()
+
+        self.assertEqual(maintained, self.counters())
+        self.assertIn(("cat", 5), maintained[1])
+        self.assertEqual(
+            AnalyticsService.get_mistake_counts(["cat", "Cat"], user=self.users[1]),
+            {"cat": 2, "Cat": 1},
+        )
+
+
+class LessonDifficultyTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create(username="reader")
+        lessons = [
+            ReadingLesson.objects.create(title=f"Lesson {i}", content="x")
+            for i in range(6)
+        ]
+        rng = random.Random(5)
+        for lesson in lessons:
+            for _ in range(rng.randint(1, 6)):
+                PronunciationAttempt.objects.create(
+                    user=user, lesson=lesson, expected="x", spoken="x",
+                    score=rng.choice([None, rng.uniform(0, 100)]),
+                )
+        PronunciationAttempt.objects.create(
+            user=user, lesson=None, expected="x", spoken="x", score=0
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_live_aggregate_matches_per_attempt_average(self):
+        scores = {}
+        for attempt in PronunciationAttempt.objects.filter(lesson__isnull=False):
+            # The previous loop counted unscored attempts as 0
+            scores.setdefault(attempt.lesson_id, []).append(attempt.score or 0)
+
+        live = {
+            row['lesson_id']: (row['average_score'], row['attempts'])
+            for row in AnalyticsService.compute_lesson_difficulty()
+        }
+
+        self.assertEqual(live.keys(), scores.keys())
+        for lesson_id, values in scores.items():
+            self.assertAlmostEqual(live[lesson_id][0], sum(values) / len(values))
+            self.assertEqual(live[lesson_id][1], len(values))
+
+    def test_refreshed_table_matches_live_fallback(self):
+        live = AnalyticsService.get_global_difficult_lessons(limit=10)
+
+        AnalyticsService.refresh_lesson_difficulty()
+
+        self.assertEqual(LessonDifficulty.objects.count(), 6)
+        self.assertEqual(AnalyticsService.get_global_difficult_lessons(limit=10), live)
+
+
+class WordOccurrenceTests(TestCase):
+
+    TEXT = "The cat and the dog and the bird saw the sun."
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+
+    def attempt(self, mispronounced, expected=TEXT, score=50):
+        return PronunciationAttempt.objects.create(
+            user=self.user, expected=expected, spoken="",
+            score=score, mispronounced=mispronounced,
+        )
+
+    def flags(self, attempt, word):
+        return list(
+            attempt.word_occurrences.filter(word=word)
+            .order_by("position").values_list("position", "was_correct")
+        )
+
+    def test_only_the_flagged_position_is_wrong(self):
+        attempt = self.attempt([{"word": "the", "position": 3, "status": "mispronounced"}])
+
+        self.assertEqual(
+            self.flags(attempt, "the"),
+            [(0, True), (3, False), (6, True), (9, True)],
+        )
+
+    def test_entries_without_position_flag_every_occurrence(self):
+        attempt = self.attempt(["The"])
+
+        self.assertEqual(
+            [correct for _, correct in self.flags(attempt, "the")], [False] * 4
+        )
+
+    def test_positions_follow_the_scoring_tokens(self):
+        expected = "Isn't it a cat? It isn't."
+        result = ScoringService.score(expected, "isnt it a hat it isnt")
+        attempt = self.attempt(result.problem_words, expected=expected)
+
+        wrong = attempt.word_occurrences.filter(was_correct=False)
+        self.assertEqual(list(wrong.values_list("word", "position")), [("cat", 3)])
+        self.assertEqual(
+            list(
+                attempt.word_occurrences.filter(word="isnt")
+                .order_by("position").values_list("position", flat=True)
+            ),
+            [0, 5],
+        )
+
+    def test_word_detail_lists_each_attempt_once(self):
+        first = self.attempt([{"word": "the", "position": 3}], score=40)
+        second = self.attempt([], score=90)
+        WordAnalytics.objects.create(
+            user=self.user, word="the", total_attempts=8, correct_attempts=7
+        )
+        self.client.force_login(self.user)
+
+        response = self.client.get(
+            reverse("reading:reading_api:word-detail", args=["The"])
+        )
+
+        recent = response.json()["recent_attempts"]
+        self.assertEqual(
+            [(a["score"], a["was_correct"], a["occurrences"], a["correct_occurrences"])
+             for a in recent],
+            [(90, True, 4, 4), (40, False, 4, 3)],
+        )
+        self.assertEqual(
+            [row["attempt_id"] for row in AnalyticsService.get_word_occurrences(self.user, "the")],
+            [second.pk, first.pk],
+        )
+
+
+class ProgressServiceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+        cls.lesson = ReadingLesson.objects.create(title="Cat", content="The cat sat.")
+
+    def progress(self):
+        return LessonProgress.objects.filter(user=self.user, lesson=self.lesson).values(
+            "total_attempts", "best_score", "is_completed"
+        ).get()
+
+    def test_feedback_post_counts_the_attempt_once(self):
+        self.client.force_login(self.user)
+
+        response = self.client.post(
+            reverse("reading:reading_api:feedback"),
+            {"lesson_id": self.lesson.pk, "expected": "The cat sat.", "spoken": "the cat sat"},
+            content_type="application/json",
+        ).json()
+
+        self.assertEqual(response["total_attempts"], 1)
+        self.assertEqual(
+            self.progress(),
+            {"total_attempts": 1, "best_score": 100.0, "is_completed": True},
+        )
+
+    def test_best_score_keeps_the_maximum(self):
+        steps = [
+            (None, None, False),
+            (40, 40, False),
+            (30, 40, False),
+            (None, 40, False),
+            (85, 85, True),
+            (60, 85, True),
+        ]
+        for attempts, (score, best, completed) in enumerate(steps, start=1):
+            returned = ProgressService.apply(self.user.pk, self.lesson.pk, score)
+
+            self.assertEqual(
+                (returned["total_attempts"], returned["best_score"], returned["is_completed"]),
+                (attempts, best, completed),
+            )
+            self.assertEqual(
+                self.progress(),
+                {"total_attempts": attempts, "best_score": best, "is_completed": completed},
+            )
+
+    def test_returned_values_are_the_stored_row(self):
+        for score in (50, None, 70, 20):
+            returned = ProgressService.apply(self.user.pk, self.lesson.pk, score)
+
+            self.assertEqual(
+                returned,
+                LessonProgress.objects.filter(
+                    user=self.user, lesson=self.lesson
+                ).values(*returned).get(),
+            )
+
+
+@override_settings(ASYNC_ANALYTICS=True)
+class AnalyticsJobQueueTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+        cls.lesson = ReadingLesson.objects.create(title="Cat", content="The cat sat.")
+
+    def post_feedback(self):
+        self.client.force_login(self.user)
+        return self.client.post(
+            reverse("reading:reading_api:feedback"),
+            {"lesson_id": self.lesson.pk, "expected": "The cat sat.", "spoken": "the cat mat"},
+            content_type="application/json",
+        ).json()
+
+    def test_feedback_enqueues_and_jobs_apply_once(self):
+        response = self.post_feedback()
+        attempt = PronunciationAttempt.objects.get(pk=response["attempt_id"])
+        AnalyticsJobQueue.enqueue(attempt)
+
+        self.assertEqual(AnalyticsJob.objects.filter(attempt=attempt).count(), 1)
+        self.assertFalse(WordAnalytics.objects.exists())
+
+        self.assertEqual(AnalyticsJobQueue.process_pending(), (1, 0))
+        self.assertEqual(AnalyticsJobQueue.process_pending(), (0, 0))
+
+        job = AnalyticsJob.objects.get(attempt=attempt)
+        self.assertEqual((job.status, job.tries), (AnalyticsJob.STATUS_DONE, 1))
+        self.assertEqual(
+            WordAnalytics.objects.get(user=self.user, word="cat").total_attempts, 1
+        )
+        self.assertEqual(UserAnalytics.objects.get(user=self.user).total_attempts, 1)
+
+    def test_per_word_writes_wait_for_the_job(self):
+        self.post_feedback()
+        self.client.post(
+            reverse("reading:reading_api:feedback-batch"),
+            {"attempts": [{
+                "lesson_id": self.lesson.pk,
+                "expected": "The cat sat.",
+                "spoken": "the cat mat",
+            }]},
+            content_type="application/json",
+        )
+
+        self.assertEqual(AnalyticsJob.objects.count(), 2)
+        self.assertFalse(WordOccurrence.objects.exists())
+        self.assertFalse(WordMistakeCount.objects.exists())
+        self.assertFalse(GlobalWordMistakeCount.objects.exists())
+        self.assertEqual(LessonProgress.objects.get().total_attempts, 2)
+
+        self.assertEqual(AnalyticsJobQueue.process_pending(), (2, 0))
+
+        self.assertEqual(WordOccurrence.objects.count(), 6)
+        self.assertEqual(
+            WordMistakeCount.objects.get(user=self.user, word="sat").mistakes, 2
+        )
+        self.assertEqual(GlobalWordMistakeCount.objects.get(word="sat").mistakes, 2)
+
+    def test_failing_job_is_rolled_back_and_retried(self):
+        self.post_feedback()
+
+        with patch(
+            "reading.services.analytics_service._apply_word_deltas",
+            side_effect=RuntimeError("database went away"),
+        ):
+            self.assertEqual(AnalyticsJobQueue.process_pending(max_tries=2), (0, 1))
+            job = AnalyticsJob.objects.get()
+            self.assertEqual((job.status, job.tries), (AnalyticsJob.STATUS_PENDING, 1))
+            self.assertEqual(job.last_error, "database went away")
+            self.assertFalse(UserAnalytics.objects.exists())
+            self.assertFalse(WordOccurrence.objects.exists())
+            self.assertFalse(WordMistakeCount.objects.exists())
+
+            self.assertEqual(AnalyticsJobQueue.process_pending(max_tries=2), (0, 1))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.tries), (AnalyticsJob.STATUS_FAILED, 2))
+        self.assertEqual(AnalyticsJobQueue.process_pending(max_tries=2), (0, 0))
+
+    @override_settings(DAILY_ANALYTICS_INCREMENTAL=False)
+    def test_rebuild_mode_updates_the_attempts_day(self):
+        self.post_feedback()
+        yesterday = timezone.now() - timedelta(days=1)
+        PronunciationAttempt.objects.update(created_at=yesterday)
+
+        AnalyticsJobQueue.process_pending()
+
+        self.assertEqual(
+            list(UserAnalytics.objects.values_list("date", "total_attempts")),
+            [(yesterday.date(), 1)],
+        )
+
+
+class FeedbackBatchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+        cls.lesson = ReadingLesson.objects.create(title="Cat", content="The cat sat.")
+
+    def setUp(self):
+        self.url = reverse("reading:reading_api:feedback-batch")
+
+    def post(self, attempts):
+        return self.client.post(
+            self.url, {"attempts": attempts}, content_type="application/json"
+        )
+
+    def item(self, spoken="the cat sat", client_id=None, expected="The cat sat."):
+        return {
+            "expected": expected, "spoken": spoken,
+            "lesson_id": self.lesson.pk, "client_id": client_id,
+        }
+
+    def test_per_item_errors_and_echo(self):
+        self.client.force_login(self.user)
+
+        results = self.post([
+            "not an attempt",
+            self.item(spoken="", client_id="a"),
+            self.item(expected="", client_id="b"),
+            self.item(client_id="x" * 101),
+            self.item(spoken="the cat mat", client_id=7),
+        ]).json()["results"]
+
+        self.assertEqual([r["index"] for r in results], [0, 1, 2, 3, 4])
+        self.assertEqual(
+            [r.get("error") for r in results],
+            [
+                "Invalid attempt.", "No speech text received.",
+                "No expected text available.", "Invalid client_id.", None,
+            ],
+        )
+        self.assertEqual([r.get("client_id") for r in results[1:]], ["a", "b", "x" * 101, 7])
+        self.assertEqual(results[4]["score"], 66.67)
+        self.assertEqual(PronunciationAttempt.objects.count(), 1)
+
+    def test_batch_size_is_capped(self):
+        response = self.post([self.item()] * (MAX_BATCH_SIZE + 1))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.post([]).status_code, 400)
+
+    def test_items_on_one_lesson_share_progress(self):
+        self.client.force_login(self.user)
+
+        data = self.post([
+            self.item(spoken="the cat"),
+            self.item(spoken="the cat sat"),
+            self.item(spoken="the"),
+        ]).json()
+
+        self.assertEqual(data["saved"], 3)
+        self.assertEqual(
+            {(r["total_attempts"], r["best_score"], r["is_completed"]) for r in data["results"]},
+            {(3, 100.0, True)},
+        )
+        self.assertEqual(
+            LessonProgress.objects.get(user=self.user, lesson=self.lesson).total_attempts, 3
+        )
+
+    def test_anonymous_users_get_scores_only(self):
+        data = self.post([self.item(), self.item(spoken="the cat")]).json()
+
+        self.assertEqual(data["saved"], 0)
+        self.assertEqual([r["score"] for r in data["results"]], [100.0, 66.67])
+        self.assertEqual({r["attempt_id"] for r in data["results"]}, {None})
+        self.assertFalse(PronunciationAttempt.objects.exists())
+
+    def test_replayed_client_ids_are_saved_once(self):
+        self.client.force_login(self.user)
+        batch = [
+            self.item(client_id="a"),
+            self.item(spoken="the cat", client_id="b"),
+            self.item(spoken="the", client_id="a"),
+            self.item(spoken="the cat"),
+        ]
+
+        first = self.post(batch).json()
+        replay = self.post(batch).json()
+
+        self.assertEqual((first["saved"], replay["saved"]), (3, 1))
+        ids = [r["attempt_id"] for r in first["results"]]
+        self.assertEqual(ids[2], ids[0])
+        self.assertEqual([r.get("duplicate", False) for r in first["results"]],
+                         [False, False, True, False])
+        self.assertEqual([r["attempt_id"] for r in replay["results"]][:3], ids[:3])
+        self.assertEqual(PronunciationAttempt.objects.count(), 4)
+        self.assertEqual(replay["results"][0]["total_attempts"], 4)
+
+    def test_failed_save_keeps_nothing_and_asks_for_a_retry(self):
+        self.client.force_login(self.user)
+
+        with patch(
+            "reading.api_views.bulk_attempts_created",
+            side_effect=DatabaseError("database is locked"),
+        ):
+            response = self.post([self.item(client_id="a"), self.item()])
+
+        self.assertEqual(response.status_code, 503)
+        self.assertNotIn("results", response.json())
+        self.assertFalse(PronunciationAttempt.objects.exists())
+
+        retried = self.post([self.item(client_id="a"), self.item()]).json()
+        self.assertEqual(retried["saved"], 2)
+
+    def test_insert_skips_client_ids_saved_concurrently(self):
+        # Saved by a racing delivery after this one looked for duplicates
+        existing = PronunciationAttempt.objects.create(
+            user=self.user, lesson=self.lesson, expected="x", spoken="x", client_id="a"
+        )
+        attempts = [
+            PronunciationAttempt(
+                user=self.user, lesson=self.lesson, expected="x", spoken="x",
+                client_id=client_id,
+            )
+            for client_id in ("a", "b", None)
+        ]
+
+        _insert_attempts(self.user, attempts)
+
+        self.assertEqual(attempts[0].pk, existing.pk)
+        self.assertEqual(attempts[1].pk, PronunciationAttempt.objects.get(client_id="b").pk)
+        self.assertEqual(
+            attempts[2].pk, PronunciationAttempt.objects.get(client_id=None).pk
+        )
+        self.assertEqual(PronunciationAttempt.objects.count(), 3)
+
+
+def lcs_length(a, b):
+    """Exact longest common subsequence length, by dynamic programming."""
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+class AlignmentTests(TestCase):
+
+    def assertValidOpcodes(self, opcodes, a, b):
+        """Opcodes tile both sequences in order and equal blocks match."""
+        i = j = 0
+        for tag, i1, i2, j1, j2 in opcodes:
+            self.assertEqual((i1, j1), (i, j))
+            if tag == "equal":
+                self.assertEqual(i2 - i1, j2 - j1)
+                self.assertEqual(a[i1:i2], b[j1:j2])
+            elif tag == "replace":
+                self.assertTrue(i1 < i2 and j1 < j2)
+            elif tag == "delete":
+                self.assertTrue(i1 < i2 and j1 == j2)
+            else:
+                self.assertEqual(tag, "insert")
+                self.assertTrue(i1 == i2 and j1 < j2)
+            i, j = i2, j2
+        self.assertEqual((i, j), (len(a), len(b)))
+
+    def matched(self, opcodes):
+        return sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == "equal")
+
+    def test_matches_are_optimal_on_random_readings(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            a = [rng.choice("abcde") for _ in range(rng.randint(0, 40))]
+            b = [rng.choice("abcde") for _ in range(rng.randint(0, 40))]
+
+            opcodes = align(a, b)
+
+            self.assertValidOpcodes(opcodes, a, b)
+            self.assertEqual(self.matched(opcodes), lcs_length(a, b))
+
+    def test_frequent_words_in_long_passages_still_match(self):
+        # difflib's autojunk ignores tokens filling over 1% of inputs
+        # longer than 200, so every "the" here would go unmatched
+        rng = random.Random(9)
+        a = [
+            word
+            for _ in range(150)
+            for word in ("the", rng.choice(["cat", "dog", "sun", "hill"]))
+        ]
+        b = list(a)
+        for index in rng.sample(range(len(b)), 10):
+            b[index] = "um"
+
+        opcodes = align(a, b)
+
+        self.assertValidOpcodes(opcodes, a, b)
+        self.assertEqual(self.matched(opcodes), len(a) - 10)
+
+    def test_edit_distance_cap_falls_back_to_anchors_and_windows(self):
+        rng = random.Random(4)
+        vocabulary = [f"w{i}" for i in range(400)]
+        a = rng.sample(vocabulary, 300)
+        b = [word if rng.random() < 0.6 else rng.choice(["um", "uh", "er"]) for word in a]
+        repetitive_a = list("ab" * 60)
+        repetitive_b = list("ba" * 20 + "aab" * 20)
+
+        for x, y, fallback in (
+            (a, b, "_align_on_anchors"),
+            (repetitive_a, repetitive_b, "_align_in_windows"),
+        ):
+            with patch(
+                f"reading.services.alignment.{fallback}",
+                wraps=getattr(alignment, fallback),
+            ) as used:
+                opcodes = align(x, y, max_edit_distance=4)
+
+            self.assertTrue(used.called)
+            self.assertValidOpcodes(opcodes, x, y)
+            self.assertLessEqual(self.matched(opcodes), lcs_length(x, y))
+
+        # Unique words anchor every unchanged one
+        self.assertEqual(
+            self.matched(align(a, b, max_edit_distance=4)),
+            sum(x == y for x, y in zip(a, b)),
+        )
+
+
+class PhoneticAnalysisTests(TestCase):
+
+    def detect(self, *pairs, status="mispronounced"):
+        return detect_phonetic_errors(
+            [{"word": word, "heard": heard, "status": status} for word, heard in pairs]
+        )
+
+    def test_substitutions(self):
+        self.assertEqual(self.detect(("three", "tree")), {"TH sound": 1})
+        self.assertEqual(self.detect(("that", "dat")), {"TH sound": 2})
+        self.assertEqual(self.detect(("red", "led")), {"R/L confusion": 1})
+        self.assertEqual(
+            self.detect(("very", "wery"), ("van", "wan")), {"V/W confusion": 2}
+        )
+
+    def test_heard_expected_sound_is_not_a_substitution(self):
+        self.assertEqual(self.detect(("thirty", "thirdy")), {})
+
+    def test_correct_and_missing_words_are_skipped(self):
+        self.assertEqual(self.detect(("the", "the"), status="correct"), {})
+        self.assertEqual(self.detect(("three", "tree"), status="correct"), {})
+        self.assertEqual(self.detect(("three", "[missing]"), status="missing"), {})
+
+    def test_positional_rules_need_the_rest_of_the_word(self):
+        self.assertEqual(self.detect(("cat", "ca")), {"Final consonant drop": 1})
+        self.assertEqual(self.detect(("walked", "walk")), {"Final -ed drop": 1})
+        self.assertEqual(self.detect(("hat", "at")), {"Initial H drop": 1})
+
+        self.assertEqual(self.detect(("cat", "ka"), ("hat", "ax")), {})
+
+    def test_features_list_rules_in_definition_order(self):
+        self.assertEqual(
+            PHONETIC_MATCHER.features("that"), ("TH sound", "Final consonant drop")
+        )
+        self.assertEqual(
+            PHONETIC_MATCHER.features("hats"),
+            ("Final consonant drop", "Initial H drop"),
+        )
+
+
+class ScoringParityTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+        cls.lesson = ReadingLesson.objects.create(
+            title="Cat", content="The three cats sat on the mat."
+        )
+
+    def test_page_and_api_score_alike(self):
+        url = reverse("reading:reading_api:feedback")
+        self.client.force_login(self.user)
+        readings = (
+            "the three cats sat on the mat",
+            "the tree cat sat on a mat",
+            "da cats sat",
+            "the the three cats sat on on the mat mat",
+        )
+
+        for spoken in readings:
+            for lesson in (self.lesson, None):
+                with self.subTest(spoken=spoken, lesson=lesson):
+                    data = {"expected": self.lesson.content, "spoken": spoken}
+                    if lesson:
+                        data["lesson_id"] = lesson.pk
+                    api = self.client.post(
+                        url, data, content_type="application/json"
+                    ).json()
+                    page = analyze_pronunciation(self.lesson.content, spoken, lesson)
+
+                    self.assertEqual(api["score"], page["score"])
+                    self.assertEqual(api["mispronounced"], page["problem_words"])
+                    self.assertEqual(api["feedback"], page["summary"])
+
+
+class RescoreAttemptsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reader")
+        lesson = ReadingLesson.objects.create(title="Cat", content="The cat sat.")
+        result = ScoringService.score(compile_expected(lesson.content), "the cat")
+        cls.current = PronunciationAttempt.objects.create(
+            user=cls.user, lesson=lesson, expected=lesson.content,
+            spoken="the cat", score=result.score,
+            mispronounced=result.problem_words, feedback=result.feedback,
+        )
+        cls.stale = PronunciationAttempt.objects.create(
+            user=cls.user, lesson=lesson, expected=lesson.content,
+            spoken="the cat sat", score=10, mispronounced=[], feedback="",
+        )
+
+    def setUp(self):
+        UserSummary.objects.get_or_create(user=self.user)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.checkpoint = os.path.join(tmp.name, "checkpoint.json")
+
+    def rescore(self, *args):
+        out = io.StringIO()
+        call_command(
+            "rescore_attempts", "--workers", "0", "--checkpoint", self.checkpoint,
+            *args, stdout=out,
+        )
+        return out.getvalue()
+
+    def test_rewrites_changed_attempts(self):
+        output = self.rescore()
+
+        self.assertIn("Rescored 2 attempt(s), changed 1", output)
+        self.stale.refresh_from_db()
+        self.assertEqual(self.stale.score, 100)
+        self.assertFalse(UserSummary.objects.exists())
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_dry_run_writes_nothing(self):
+        output = self.rescore("--dry-run")
+
+        self.assertIn("Rescored 2 attempt(s), would change 1", output)
+        self.stale.refresh_from_db()
+        self.assertEqual(self.stale.score, 10)
+        self.assertTrue(UserSummary.objects.exists())
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resume_keeps_totals_from_checkpoint(self):
+        # Interrupted after both attempts were written back
+        PronunciationAttempt.objects.filter(pk=self.stale.pk).update(score=100)
+        with open(self.checkpoint, "w") as f:
+            json.dump({"last_id": self.stale.pk, "scored": 2, "updated": 1}, f)
+
+        with patch(
+            "reading.management.commands.rescore_attempts.invalidate_all"
+        ) as invalidate_all:
+            output = self.rescore("--resume")
+
+        self.assertIn(f"Resuming after attempt {self.stale.pk}", output)
+        self.assertIn("Rescored 2 attempt(s), changed 1", output)
+        invalidate_all.assert_called_once_with()
+        self.assertFalse(UserSummary.objects.exists())
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resume_needs_a_checkpoint(self):
+        with self.assertRaises(CommandError):
+            self.rescore("--resume")
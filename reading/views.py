@@ -4,17 +4,34 @@ from django.shortcuts import render, get_object_or_404
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from rest_framework import generics
 from .models import ReadingLesson, PronunciationAttempt
+from .api_views import ReadingLessonListAPIView
+from .etags import (
+    book_list_etag,
+    lesson_list_etag,
+    lesson_page_etag,
+    unit_list_etag,
+)
 from .serializers import ReadingLessonSerializer
-import speech_recognition as sr
-import os
+from .services.audio import InvalidAudio, load_audio
+from .services.scoring import ScoringService
+from .services.transcription import (
+    TranscriptionBusy,
+    TranscriptionUnavailable,
+    UnintelligibleAudio,
+    transcribe,
+)
 import json
 
 
 from django.shortcuts import render
 from .models import Book
 
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=book_list_etag)
 def book_list(request):
     books = Book.objects.all()
     return render(request, "reading/book_list.html", {"books": books})
@@ -22,6 +39,8 @@ def book_list(request):
 # reading/views.py
 from .models import Book, Unit
 
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=unit_list_etag)
 def unit_list(request, book_id):
     book = get_object_or_404(Book, pk=book_id)
     units = book.units.all()
@@ -30,6 +49,8 @@ def unit_list(request, book_id):
 # reading/views.py
 from .models import Unit
 
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=lesson_list_etag)
 def lesson_list(request, unit_id):
     unit = get_object_or_404(Unit, pk=unit_id)
     lessons = unit.lessons.all()
@@ -37,12 +58,8 @@ def lesson_list(request, unit_id):
 
 
 # --- API views (unchanged) ---
-class ReadingLessonListView(generics.ListAPIView):
-    """
-    API endpoint: return a list of all reading lessons.
-    """
-    queryset = ReadingLesson.objects.all()
-    serializer_class = ReadingLessonSerializer
+# Same endpoint as the API's lesson list: cursor pages, fields=, filters
+ReadingLessonListView = ReadingLessonListAPIView
 
 
 class ReadingLessonDetailView(generics.RetrieveAPIView):
@@ -55,10 +72,13 @@ class ReadingLessonDetailView(generics.RetrieveAPIView):
 
 
 # --- Template views ---
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=lesson_page_etag)
 def lesson_detail(request, pk):
     """
     Render a single lesson detail page.
     Now also fetches previous attempts for this user and lesson.
+    Revalidation is answered with 304 while neither changed.
     """
     lesson = get_object_or_404(ReadingLesson, pk=pk)
     
@@ -92,8 +112,8 @@ def analytics_dashboard(request):
 @csrf_exempt
 def process_recording(request, lesson_id):
     """
-    Handle audio upload, transcribe using Google's free Web Speech API,
-    analyze pronunciation, and save attempt to database.
+    Handle audio upload, transcribe it with the configured speech-to-text
+    backend, analyze pronunciation, and save attempt to database.
     """
     if request.method != 'POST':
         return JsonResponse({'error': 'Method not allowed'}, status=405)
@@ -106,30 +126,21 @@ def process_recording(request, lesson_id):
     if not audio_file:
         return JsonResponse({'error': 'No audio file provided'}, status=400)
     
-    # Create temp directory if it doesn't exist
-    temp_dir = '/tmp/reading_app'
-    os.makedirs(temp_dir, exist_ok=True)
-    
-    # Save audio temporarily
-    temp_path = f'{temp_dir}/recording_{request.user.id}_{lesson_id}.wav'
-    with open(temp_path, 'wb+') as destination:
-        for chunk in audio_file.chunks():
-            destination.write(chunk)
-    
-    # Transcribe using speech_recognition (free)
-    recognizer = sr.Recognizer()
-    
     try:
-        with sr.AudioFile(temp_path) as source:
-            # Adjust for ambient noise (helps accuracy)
-            recognizer.adjust_for_ambient_noise(source, duration=0.5)
-            audio = recognizer.record(source)
-        
-        # Use Google's free Web Speech API
-        spoken_text = recognizer.recognize_google(audio)
+        # Decoded from the upload buffer; nothing is copied to disk
+        audio = load_audio(audio_file)
+    except InvalidAudio:
+        return JsonResponse({
+            'error': 'Unsupported audio format. Please upload a WAV, AIFF or FLAC recording.'
+        }, status=400)
+
+    try:
+        # Waits for the bounded transcription pool, or fails fast when it is
+        # full (see services.transcription)
+        spoken_text = transcribe(audio)
         
         # Calculate feedback
-        feedback = analyze_pronunciation(lesson.content, spoken_text)
+        feedback = analyze_pronunciation(lesson.content, spoken_text, lesson)
         
         # Save attempt to database
         attempt = PronunciationAttempt.objects.create(
@@ -142,100 +153,47 @@ def process_recording(request, lesson_id):
             feedback=feedback['summary']
         )
         
-        # Clean up temp file
-        os.remove(temp_path)
-        
         return JsonResponse({
             'success': True,
             'attempt_id': attempt.id,
             'feedback': feedback
         })
         
-    except sr.UnknownValueError:
-        # Clean up temp file even on error
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+    except TranscriptionBusy:
+        response = JsonResponse({
+            'error': 'Speech recognition is busy. Please try again in a moment.'
+        }, status=503)
+        response['Retry-After'] = '5'
+        return response
+
+    except UnintelligibleAudio:
         return JsonResponse({
             'error': 'Could not understand audio. Please speak clearly and try again.'
         }, status=400)
         
-    except sr.RequestError as e:
-        # Clean up temp file even on error
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+    except TranscriptionUnavailable:
         return JsonResponse({
             'error': f'Speech service error. Please check your internet connection.'
         }, status=500)
         
     except Exception as e:
-        # Clean up temp file even on error
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
         return JsonResponse({
             'error': f'An unexpected error occurred: {str(e)}'
         }, status=500)
 
 
-def analyze_pronunciation(expected, spoken):
+def analyze_pronunciation(expected, spoken, lesson=None):
     """
     Compare expected vs spoken text and generate feedback.
     Returns score, problem words, and human-readable summary.
+    Scoring goes through the same service as the feedback API.
     """
-    # Convert to lowercase and split into words
-    expected_words = expected.lower().split()
-    spoken_words = spoken.lower().split()
-    
-    problem_words = []
-    correct_count = 0
-    
-    # Compare word by word
-    for i, expected_word in enumerate(expected_words):
-        if i < len(spoken_words):
-            if expected_word == spoken_words[i]:
-                correct_count += 1
-            else:
-                problem_words.append({
-                    'word': expected_word,
-                    'heard': spoken_words[i],
-                    'position': i
-                })
-        else:
-            # Missing words at the end
-            problem_words.append({
-                'word': expected_word,
-                'heard': '[missing]',
-                'position': i
-            })
-    
-    # Calculate score (percentage of correctly spoken words)
-    score = (correct_count / len(expected_words)) * 100 if expected_words else 0
-    
-    # Generate human-readable summary based on score
-    if score >= 90:
-        summary = "🌟 Excellent! Your reading was very accurate. Keep up the great work!"
-    elif score >= 75:
-        summary = "👍 Good job! A few words need practice. Focus on the problem words below."
-    elif score >= 50:
-        summary = "📝 Keep practicing! You're making progress. Pay special attention to these words:"
-    else:
-        summary = "🎯 Let's try again. Listen to the text and practice these words slowly:"
-    
-    # Add specific word tips if there are problem words
-    if problem_words:
-        problem_word_list = [p['word'] for p in problem_words[:5]]
-        if len(problem_words) > 5:
-            summary += f" Focus on: {', '.join(problem_word_list)} and {len(problem_words)-5} more."
-        else:
-            summary += f" Practice: {', '.join(problem_word_list)}"
-    
-    # For perfect score, give extra encouragement
-    if score == 100:
-        summary = "🏆 PERFECT! You read every word correctly. You're a star reader!"
-    
+    result = ScoringService.score(expected, spoken, lesson)
+
     return {
-        'score': round(score, 2),
-        'problem_words': problem_words,
-        'summary': summary
+        'score': result.score,
+        'problem_words': result.problem_words,
+        'summary': result.feedback
     }
 
 
@@ -104,6 +104,35 @@ else:
         }
     }
 
+# --------------------------------------------------
+# CACHE
+# (local memory by default; file or Redis via CACHE_URL)
+# --------------------------------------------------
+
+# locmem://, file:///var/tmp/reading_cache or redis://host:6379/0
+CACHE_URL = os.getenv("CACHE_URL", "locmem://")
+
+if CACHE_URL.startswith(("redis://", "rediss://")):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+elif CACHE_URL.startswith("file://"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_URL[len("file://"):],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # --------------------------------------------------
 # PASSWORD VALIDATION
 # --------------------------------------------------
@@ -145,6 +174,83 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# --------------------------------------------------
+# ANALYTICS
+# --------------------------------------------------
+
+# Apply each attempt to the day's UserAnalytics row as a delta instead of
+# recomputing the whole day ("manage.py rebuild_daily_analytics" reconciles)
+DAILY_ANALYTICS_INCREMENTAL = os.getenv("DAILY_ANALYTICS_INCREMENTAL", "True") == "True"
+
+# Defer word and daily analytics to a database job queue so feedback
+# responses return right after the attempt is saved. Requires a worker
+# running "manage.py process_analytics_jobs --loop".
+ASYNC_ANALYTICS = os.getenv("ASYNC_ANALYTICS", "False") == "True"
+
+# Seconds the dashboard analytics (overall stats, weekly progress, weak
+# words, strengths, difficult lessons) stay cached. Per-user entries are
+# also dropped whenever the user's attempts or analytics change; 0 disables
+# the cache.
+#
+# Dropping entries bumps a version kept in the cache, which reaches every
+# worker only through a shared backend (file or Redis). The local-memory
+# cache is per process: behind several workers, one that did not save the
+# attempt keeps serving its copy until the TTL runs out. So the default is
+# a few seconds with locmem and five minutes with a shared backend.
+ANALYTICS_CACHE_TTL = int(
+    os.getenv(
+        "ANALYTICS_CACHE_TTL",
+        "5" if CACHES["default"]["BACKEND"].endswith("LocMemCache") else "300",
+    )
+)
+
+# --------------------------------------------------
+# SCORING
+# --------------------------------------------------
+
+# Compiled lessons (tokens, ids, sentence bounds) kept per process so the
+# feedback path only tokenizes the spoken text
+LESSON_CACHE_SIZE = int(os.getenv("LESSON_CACHE_SIZE", "256"))
+
+# --------------------------------------------------
+# CONDITIONAL GET
+# --------------------------------------------------
+
+# Mixed into lesson and catalogue ETags; change it on releases that alter
+# templates or API output so clients refetch instead of getting a 304
+ETAG_SALT = os.getenv("ETAG_SALT", "")
+
+# --------------------------------------------------
+# TRANSCRIPTION
+# --------------------------------------------------
+
+# Speech-to-text engine for recorded readings. Options:
+#   reading.services.transcription.GoogleWebSpeechBackend (network)
+#   reading.services.transcription.VoskBackend (offline, needs TRANSCRIPTION_VOSK_MODEL)
+#   reading.services.transcription.StubBackend (returns TRANSCRIPTION_STUB_TEXT)
+TRANSCRIPTION_BACKEND = os.getenv(
+    "TRANSCRIPTION_BACKEND",
+    "reading.services.transcription.GoogleWebSpeechBackend",
+)
+TRANSCRIPTION_VOSK_MODEL = os.getenv("TRANSCRIPTION_VOSK_MODEL", "")
+TRANSCRIPTION_STUB_TEXT = os.getenv("TRANSCRIPTION_STUB_TEXT", "")
+
+# Concurrent transcriptions per process, how many may wait behind them
+# (further requests get 503) and how long a request waits for its result
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "2"))
+TRANSCRIPTION_QUEUE_SIZE = int(os.getenv("TRANSCRIPTION_QUEUE_SIZE", "4"))
+TRANSCRIPTION_TIMEOUT = float(os.getenv("TRANSCRIPTION_TIMEOUT", "30"))
+
+# Trim leading/trailing silence and resample to the backend's native rate
+# before transcription; silent recordings never reach the engine
+TRANSCRIPTION_PREPROCESS = os.getenv("TRANSCRIPTION_PREPROCESS", "True") == "True"
+
+# Recordings up to this size are decoded straight from memory; larger
+# uploads are spooled by Django to a uniquely named temporary file
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(
+    os.getenv("FILE_UPLOAD_MAX_MEMORY_SIZE", str(10 * 1024 * 1024))
+)
+
 # --------------------------------------------------
 # AUTHENTICATION & LOGIN
 # --------------------------------------------------
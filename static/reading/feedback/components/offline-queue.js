@@ -1,7 +1,7 @@
 // static/reading/feedback/components/offline-queue.js
 // PURPOSE: Queue feedback requests when offline with retry and priority
 
-import { generateRequestId, isOnline, getRetryDelay } from '../utils/feedback-utils.js';
+import { generateRequestId, isOnline, getRetryDelay, getCSRFToken } from '../utils/feedback-utils.js';
 
 // Queue storage
 let offlineQueue = [];
@@ -10,6 +10,10 @@ let maxQueueSize = 100;
 let maxRetries = 3;
 let online = navigator.onLine;
 
+// Batch replay: flush queued attempts in as few requests as possible
+let batchEndpoint = '/api/feedback/batch/';
+let batchSize = 50;
+
 // Queue statistics
 let stats = {
     processed: 0,
@@ -32,6 +36,8 @@ export function initOfflineQueue(options = {}) {
     if (options.maxQueueSize) maxQueueSize = options.maxQueueSize;
     if (options.maxRetries) maxRetries = options.maxRetries;
     if (options.callbacks) callbacks = { ...callbacks, ...options.callbacks };
+    if (options.batchEndpoint !== undefined) batchEndpoint = options.batchEndpoint;
+    if (options.batchSize) batchSize = options.batchSize;
     
     // Set up online/offline listeners
     window.addEventListener('online', handleOnline);
@@ -158,7 +164,14 @@ export async function processQueue() {
     // Process items in order (already sorted by priority)
     const processedIds = [];
     
+    // Replay as batches first; anything left falls back to one-by-one
+    if (batchEndpoint) {
+        processedIds.push(...await processBatches(offlineQueue));
+    }
+    
     for (const item of offlineQueue) {
+        if (processedIds.includes(item.id)) continue;
+        
         if (!online) {
             console.log('📋 Device went offline, stopping queue processing');
             break;
@@ -234,6 +247,76 @@ export async function processQueue() {
     }
 }
 
+/**
+ * Send queued items to the batch endpoint in chunks of batchSize.
+ * Stops at the first chunk that fails so the remaining items can be
+ * processed individually.
+ * @param {Array} items - Queue items
+ * @returns {Promise<Array>} IDs of items the server answered
+ */
+async function processBatches(items) {
+    const handledIds = [];
+    
+    for (let start = 0; start < items.length; start += batchSize) {
+        if (!online) break;
+        
+        const chunk = items.slice(start, start + batchSize);
+        let data;
+        
+        try {
+            const response = await fetch(batchEndpoint, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCSRFToken()
+                },
+                credentials: 'same-origin',
+                body: JSON.stringify({
+                    attempts: chunk.map(item => ({
+                        client_id: item.id,
+                        expected: item.data.expectedText,
+                        spoken: item.data.studentText,
+                        lesson_id: item.data.lessonId
+                    }))
+                })
+            });
+            
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            data = await response.json();
+        } catch (error) {
+            console.warn('📋 Batch replay failed, falling back to single requests:', error);
+            break;
+        }
+        
+        for (const result of data.results || []) {
+            const item = chunk[result.index];
+            if (!item) continue;
+            
+            handledIds.push(item.id);
+            
+            if (result.error) {
+                // Rejected by the server; retrying the same input won't help
+                stats.failed++;
+                if (callbacks.onQueueError) {
+                    callbacks.onQueueError({ id: item.id, error: result.error });
+                }
+                dispatchEvent('item-failed', { id: item.id, error: result.error });
+                continue;
+            }
+            
+            stats.processed++;
+            if (callbacks.onItemProcessed) {
+                callbacks.onItemProcessed(item, result);
+            }
+            dispatchEvent('item-processed', { id: item.id, result });
+        }
+    }
+    
+    return handledIds;
+}
+
 /**
  * Process a single queue item
  * @param {Object} item - Queue item
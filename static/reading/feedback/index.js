@@ -168,9 +168,24 @@ function setupQueueListeners() {
 /**
  * Handle queued item processed
  */
-function handleQueuedItemProcessed(item) {
+function handleQueuedItemProcessed(item, result) {
     console.log('✅ Queued item processed:', item.id);
-    triggerCallback('onQueuedProcessed', { item });
+    
+    // Items replayed through the batch endpoint arrive with their result
+    if (result) {
+        if (item.data.cacheKey) {
+            setCached(item.data.cacheKey, result);
+        }
+        document.dispatchEvent(new CustomEvent('display-feedback', {
+            detail: { 
+                analysis: result,
+                containerId: elementIds.problemWords,
+                transcript: item.data.studentText
+            }
+        }));
+    }
+    
+    triggerCallback('onQueuedProcessed', { item, result });
 }
 
 /**